@@ -14,7 +14,8 @@ async def analyze_briefing(briefing_data: BriefingInput, current_user: Usuario =
     Analisa o texto do briefing do usuário e extrai informações chave.
     """
     print(f"Analisando o briefing para o usuário: {current_user.email}")
-    llm = settings.LLM
+    from config.llm_router import llm_para # Importado sob demanda (langchain)
+    llm = llm_para("extracao")
 
     try:
         brief_data = {}
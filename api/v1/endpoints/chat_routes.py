@@ -1,15 +1,17 @@
 # api/v1/endpoints/chat_routes.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Iterator, Optional
 from uuid import uuid4
 import os
 import json
 from config import settings
-from api.v1.schemas.chat import ChatRequest, ChatResponse, ChatMessage
+from config.llm_router import llm_para
+from api.v1.schemas.chat import ChatRequest, ChatResponse, ChatMessage, ChatDeltaResponse
 from src.chatbot.briefing_chat import ChatbotHandler, BriefingState # Importe o handler do chatbot
 from src.analysis import engine # Para operações de dados e relatórios
-from src.reporting import generator_report_concorrentes, generator_report_estrategia, generator_report_publicacoes
+from src.observability.orcamento import OrcamentoExcedido, iniciar_orcamento
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 
 router = APIRouter(tags=["Chatbot Briefing"])
@@ -26,7 +28,7 @@ async def chat_with_bot(request: ChatRequest):
     """
     session_id = request.session_id
     if session_id not in chat_sessions:
-        chat_sessions[session_id] = ChatbotHandler(llm=settings.LLM, session_id=session_id)
+        chat_sessions[session_id] = ChatbotHandler(llm=llm_para("chat"), session_id=session_id)
         # Se for a primeira mensagem, o bot pode dar uma saudação inicial
         if not request.chat_history:
             initial_response = chat_sessions[session_id].get_initial_greeting()
@@ -49,6 +51,73 @@ async def chat_with_bot(request: ChatRequest):
         extracted_briefing=result["extracted_briefing"]
     )
 
+def _evento_sse(evento: str, dados: Dict, event_id: Optional[int] = None) -> str:
+    """Formata um evento Server-Sent Events. O `id` permite ao cliente retomar a partir da última mensagem recebida."""
+    linhas = [f"id: {event_id}"] if event_id is not None else []
+    linhas.append(f"event: {evento}")
+    linhas.append(f"data: {json.dumps(dados, ensure_ascii=False)}")
+    return "\n".join(linhas) + "\n\n"
+
+def _stream_chat(chatbot_handler: ChatbotHandler, message: str, nova_sessao: bool) -> Iterator[str]:
+    # Gerador síncrono: o StreamingResponse o consome em uma thread, sem bloquear o event loop
+    if nova_sessao and not chatbot_handler.chat_history:
+        # Primeira mensagem de uma sessão nova: apenas a saudação inicial, como no POST /chat
+        initial_response = chatbot_handler.get_initial_greeting()
+        chatbot_handler.chat_history.append(AIMessage(content=initial_response))
+        yield _evento_sse("token", {"delta": initial_response})
+        for msg in chatbot_handler.mensagens_desde(len(chatbot_handler.chat_history) - 2):
+            yield _evento_sse("message", msg, event_id=msg["id"])
+        yield _evento_sse("done", {"briefing_complete": False, "extracted_briefing": {}})
+        return
+
+    for evento in chatbot_handler.stream_message(message):
+        if evento["evento"] == "token":
+            yield _evento_sse("token", {"delta": evento["conteudo"]})
+        else:
+            for msg in evento["mensagens"]:
+                yield _evento_sse("message", msg, event_id=msg["id"])
+            yield _evento_sse("done", {
+                "briefing_complete": evento["briefing_complete"],
+                "extracted_briefing": evento["extracted_briefing"],
+            })
+
+@router.post("/chat/stream")
+async def chat_with_bot_stream(request: ChatRequest):
+    """
+    Versão em streaming do POST /chat (Server-Sent Events).
+    Emite `token` com cada trecho da resposta assim que é gerado, depois um `message` para cada
+    mensagem nova do turno (com seu id) e um `done` final. O histórico completo não é reenviado:
+    para recuperar mensagens perdidas use GET /chat/{session_id}/messages?after_id=<último id recebido>.
+    """
+    session_id = request.session_id
+    nova_sessao = session_id not in chat_sessions
+    if nova_sessao:
+        chat_sessions[session_id] = ChatbotHandler(llm=llm_para("chat"), session_id=session_id)
+
+    return StreamingResponse(
+        _stream_chat(chat_sessions[session_id], request.message, nova_sessao),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/chat/{session_id}/messages", response_model=ChatDeltaResponse)
+async def get_chat_messages(session_id: str, after_id: Optional[int] = None, last_event_id: Optional[int] = Header(None)):
+    """
+    Retorna apenas as mensagens da sessão posteriores a `after_id` (ou ao cabeçalho Last-Event-ID),
+    permitindo que o cliente retome uma conversa após uma queda de conexão sem baixar o histórico inteiro.
+    """
+    if session_id not in chat_sessions:
+        raise HTTPException(status_code=404, detail="Sessão não encontrada.")
+
+    chatbot_handler = chat_sessions[session_id]
+    if after_id is None:
+        after_id = last_event_id if last_event_id is not None else -1
+
+    return ChatDeltaResponse(
+        messages=chatbot_handler.mensagens_desde(after_id),
+        briefing_complete=chatbot_handler.briefing_state.is_briefing_complete()
+    )
+
 @router.post("/briefing/complete-and-generate-reports")
 async def complete_and_generate_reports(session_id: str):
     """
@@ -66,6 +135,9 @@ async def complete_and_generate_reports(session_id: str):
     reports_status = {"estrategia": "pendente", "publicacoes": "pendente", "concorrentes": "pendente"}
 
     try:
+        # Geradores importados sob demanda (matplotlib, python-docx...), fora da inicialização da API
+        from src.reporting import generator_report_concorrentes, generator_report_estrategia, generator_report_publicacoes
+
         # 1. Compilar o briefing completo a partir do estado do chatbot
         brief_data = chatbot_handler.compile_full_briefing()
         if "error" in brief_data:
@@ -107,15 +179,20 @@ async def complete_and_generate_reports(session_id: str):
 
         # 3. Gerar Relatório de Publicações
         try:
-            llm = settings.LLM
-            generator_report_publicacoes.preencher_publicacoes(
-                llm=llm,
-                pilares=brief_data['pilares'],
-                objetivos=brief_data['objetivos'],
-                publico=brief_data['publico'],
-                posicionamento=brief_data['posicionamento']
-            )
+            llm = llm_para("relatorio")
+            # Mesmo orçamento e contabilização por cliente de /reports/publicacoes
+            with iniciar_orcamento("relatorio_publicacoes", cliente=brief_data['objetivos']['client_name']):
+                generator_report_publicacoes.preencher_publicacoes(
+                    llm=llm,
+                    pilares=brief_data['pilares'],
+                    objetivos=brief_data['objetivos'],
+                    publico=brief_data['publico'],
+                    posicionamento=brief_data['posicionamento']
+                )
             reports_status["publicacoes"] = "sucesso"
+        except OrcamentoExcedido as e:
+            reports_status["publicacoes"] = f"falha: orçamento de LLM excedido. {e}"
+            print(f"Relatório de publicações interrompido pelo orçamento de LLM: {e}")
         except Exception as e:
             reports_status["publicacoes"] = f"falha: {e}"
             print(f"Erro ao gerar relatório de publicações: {e}")
@@ -151,15 +228,21 @@ async def complete_and_generate_reports(session_id: str):
                     'dados_pivot_periodos': list_dfs_pivot_periodo[0],
                     'dados_pivot_dias': list_dfs_pivot_periodo[1]
                 }
-                llm = settings.LLM
-                generator_report_concorrentes.generate_full_report(
-                    llm,
-                    dataframes,
-                    client_name=brief_data['objetivos']['client_name'],
-                    output_path=settings.CONCORRENTES_PATH,
-                    template_path=settings.TEMPLATE_PATH,
-                )
+                llm = llm_para("relatorio")
+                # Mesmo orçamento e contabilização por cliente de /reports/concorrentes
+                with iniciar_orcamento("relatorio_concorrentes", cliente=brief_data['objetivos']['client_name']):
+                    generator_report_concorrentes.generate_full_report(
+                        llm,
+                        dataframes,
+                        client_name=brief_data['objetivos']['client_name'],
+                        output_path=settings.CONCORRENTES_PATH,
+                        template_path=settings.TEMPLATE_PATH,
+                        llm_conclusao=llm_para("conclusao"),
+                    )
                 reports_status["concorrentes"] = "sucesso"
+        except OrcamentoExcedido as e:
+            reports_status["concorrentes"] = f"falha: orçamento de LLM excedido. {e}"
+            print(f"Relatório de concorrentes interrompido pelo orçamento de LLM: {e}")
         except FileNotFoundError as e:
             reports_status["concorrentes"] = f"falha: Arquivos de dados para concorrentes não encontrados: {e}"
             print(f"Erro de FileNotFoundError ao gerar relatório de concorrentes: {e}")
@@ -181,6 +264,9 @@ async def reset_chat(session_id: str):
     if session_id in chat_sessions:
         # Remover arquivos de histórico e estado
         handler = chat_sessions[session_id]
+        handler.journal.fechar()
+        if os.path.exists(handler.journal_file_path):
+            os.remove(handler.journal_file_path)
         if os.path.exists(handler.briefing_file_path):
             os.remove(handler.briefing_file_path)
         if os.path.exists(handler.chat_history_file_path):
@@ -1,10 +1,9 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
+from typing import List, Optional
 import os
 import json
 import pandas as pd
 from config import settings
-from src.data_ingestion.extractInstagram import extrairDadosGoogleSerpAPI, extrairDadosApifyInstagram, extract_username_from_url, get_apify_client 
 from src.analysis import engine
 from auth.dependencies import get_current_active_user
 from models import Usuario
@@ -18,6 +17,8 @@ async def extract_google_serp_data(keywords: List[str] = Query(...), localizacao
     """
     # Você pode querer usar o current_user.id para nomear o arquivo de saída
     try:
+        from src.data_ingestion.extractInstagram import extrairDadosGoogleSerpAPI # Importado sob demanda (apify/serpapi)
+
         extrairDadosGoogleSerpAPI(keywords, localizacao, settings.SEARCH_PATH)
         
         return {"message": f"Dados do Google SERP extraídos e salvos em {settings.SEARCH_PATH}"}
@@ -31,7 +32,8 @@ async def extract_instagram_data(current_user: Usuario = Depends(get_current_act
     Requer que o briefing já tenha sido analisado e os dados do Google SERP coletados.
     """
     try:
-        
+        from src.data_ingestion.extractInstagram import extrairDadosApifyInstagram # Importado sob demanda (apify/serpapi)
+
         # Carrega os dados de busca para obter as URLs dos perfis
         search_df = engine.load_search_to_df(settings.SEARCH_PATH)
         all_profiles_to_scan = list(search_df['url'].unique())
@@ -46,8 +48,59 @@ async def extract_instagram_data(current_user: Usuario = Depends(get_current_act
             settings.MAX_POSTS_PER_PROFILE
         )
 
-        return {"message": "Dados do Instagram extraídos e salvos com sucesso."}
+        # Só as publicações novas entram no índice de hashtags (coocorrência e tendências) e no motor de KPIs
+        posts_df = engine.load_posts_to_df(settings.POST_PATH)
+        try:
+            posts_indexados = engine.update_hashtag_index(posts_df)
+        except Exception as e:
+            print(f"Falha ao atualizar o índice de hashtags: {e}")
+            posts_indexados = 0
+        try:
+            engine.update_kpis(posts_df, engine.load_profiles_to_df(settings.PROFILE_PATH))
+        except Exception as e:
+            print(f"Falha ao atualizar os KPIs: {e}")
+
+        return {"message": "Dados do Instagram extraídos e salvos com sucesso.", "posts_indexados": posts_indexados}
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Arquivos de briefing ({settings.BRIEFING_JSON_PATH}) ou busca ({settings.SEARCH_PATH}) não encontrados. Certifique-se de que as etapas anteriores foram executadas.")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro ao extrair dados do Instagram: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erro ao extrair dados do Instagram: {str(e)}")
+
+@router.get("/data/hashtags")
+async def get_hashtag_insights(hashtag: Optional[str] = None, top: int = 10, periodos: int = 4, current_user: Usuario = Depends(get_current_active_user)): # Protegido
+    """
+    Consulta o índice de hashtags das publicações extraídas: pares com maior engajamento médio, hashtags em alta
+    nos últimos `periodos` períodos e, se `hashtag` for informada, as hashtags que mais aparecem junto com ela.
+    """
+    try:
+        resposta = {
+            "pares": engine.get_top_hashtag_pairs(top).to_dict(orient="records"),
+            "tendencias": engine.get_rising_hashtags(periodos, top).to_dict(orient="records"),
+        }
+        if hashtag:
+            resposta["coocorrentes"] = engine.get_hashtag_cooccurrences(hashtag, top).to_dict(orient="records")
+        return resposta
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao consultar o índice de hashtags: {str(e)}")
+
+@router.get("/data/kpis")
+async def get_kpis(username: Optional[str] = None, janela: int = 30, ate: Optional[str] = None, current_user: Usuario = Depends(get_current_active_user)): # Protegido
+    """
+    KPIs dos perfis extraídos nas janelas de 7, 30 e 90 dias (ou só `username` na `janela` informada), até a data
+    `ate` (padrão e limite: dia da publicação mais recente), e o engajamento por tipo de publicação.
+    """
+    try:
+        if username:
+            kpis = engine.get_profile_kpis(username, janela, ate)
+            return {"username": username, "janela": janela, "kpis": {k: None if pd.isna(v) else v for k, v in kpis.items()}}
+        kpis_df = engine.get_rolling_kpis(until=ate).reset_index()
+        return { # Janelas sem publicações dão NaN, que não vai para JSON
+            "kpis": kpis_df.astype(object).where(kpis_df.notna(), None).to_dict(orient="records"),
+            "por_tipo": engine.get_kpis_by_type().to_dict(orient="records"),
+        }
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao consultar os KPIs: {str(e)}")
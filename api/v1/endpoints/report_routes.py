@@ -4,7 +4,6 @@ import os
 import pandas as pd # Adicionado import de pandas
 from config import settings
 from src.analysis import engine
-from src.reporting import generator_report_concorrentes, generator_report_estrategia, generator_report_publicacoes
 from auth.dependencies import get_current_active_user
 from models import Usuario
 
@@ -13,18 +12,22 @@ router = APIRouter(tags=["Report Generation"])
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel # <-- IMPORTAÇÃO NOVA
+from typing import Optional
 import json
 import os
 import pandas as pd
 from config import settings
 from src.analysis import engine
-from src.reporting import generator_report_concorrentes, generator_report_estrategia, generator_report_publicacoes
 from auth.dependencies import get_current_active_user
 from models import Usuario
-from src.data_ingestion.gdrive_uploader import upload_reports_to_drive
+from src.observability.orcamento import OrcamentoExcedido, iniciar_orcamento
+from src.observability.tracing import iniciar_rastreamento
 
 router = APIRouter(tags=["Report Generation"])
 
+# Os geradores de relatório (matplotlib, python-docx, LLM...) e o cliente do Google Drive são
+# importados dentro das rotas, para não pesar na inicialização da API.
+
 # NOVO MODELO PARA A REQUISIÇÃO DE UPLOAD
 class UploadRequest(BaseModel):
     client_name: str
@@ -39,6 +42,8 @@ async def upload_generated_reports(
     Pega os relatórios já gerados do disco e faz o upload para o Google Drive.
     """
     try:
+        from src.data_ingestion.gdrive_uploader import upload_reports_to_drive
+
         client_name = request_data.client_name
         print(f"Iniciando processo de upload para o cliente: {client_name}")
 
@@ -71,6 +76,8 @@ async def generate_strategy_report(current_user: Usuario = Depends(get_current_a
     Requer que o briefing já tenha sido analisado.
     """
     try:
+        from src.reporting import generator_report_estrategia
+
         with open(settings.BRIEFING_JSON_PATH, 'r', encoding='utf-8') as f:
             brief_data = json.load(f)
 
@@ -111,75 +118,150 @@ async def generate_publications_report(current_user: Usuario = Depends(get_curre
     Requer que o briefing já tenha sido analisado.
     """
     try:
+        from src.reporting import generator_report_publicacoes
+
         with open(settings.BRIEFING_JSON_PATH, 'r', encoding='utf-8') as f:
             brief_data = json.load(f)
 
         if not brief_data:
             raise HTTPException(status_code=400, detail="Briefing não analisado. Analise o briefing primeiro.")
 
-        llm = settings.LLM
-        generator_report_publicacoes.preencher_publicacoes(
-            llm=llm,
-            pilares=brief_data['pilares'],
-            objetivos=brief_data['objetivos'],
-            publico=brief_data['publico'],
-            posicionamento=brief_data['posicionamento']
-        )
-        return {"message": "Relatório de publicações gerado com sucesso."}
+        from config.llm_router import llm_para
+        llm = llm_para("relatorio")
+        with iniciar_orcamento("relatorio_publicacoes", cliente=brief_data['objetivos']['client_name']) as orcamento:
+            generator_report_publicacoes.preencher_publicacoes(
+                llm=llm,
+                pilares=brief_data['pilares'],
+                objetivos=brief_data['objetivos'],
+                publico=brief_data['publico'],
+                posicionamento=brief_data['posicionamento']
+            )
+        return {"message": "Relatório de publicações gerado com sucesso.", "custos": orcamento.resumo()}
+    except OrcamentoExcedido as e:
+        raise HTTPException(status_code=402, detail=f"Relatório de publicações interrompido: orçamento de LLM excedido. {e}")
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Arquivo de briefing ({settings.BRIEFING_JSON_PATH}) não encontrado. Analise um briefing primeiro.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao gerar relatório de publicações: {str(e)}")
 
+def _dataframes_concorrentes() -> dict:
+    """Dataframes usados pelas figuras do relatório de concorrentes."""
+    # Carrega os dataframes necessários
+    posts_df = engine.load_posts_to_df(settings.POST_PATH)
+    profile_df = engine.load_profiles_to_df(settings.PROFILE_PATH)
+
+    if posts_df.empty or profile_df.empty:
+        raise HTTPException(status_code=400, detail="Dados de posts ou perfis do Instagram não encontrados. Execute a extração do Google SERP e Instagram primeiro.")
+
+    profiles_posts_df = engine.load_join_profiles_posts(posts_df, profile_df)
+    list_dfs_pivot = engine.load_top_3_profiles(posts_df, profile_df)
+    list_dfs_periodo = engine.load_periodo_dias(posts_df, profile_df)
+    list_dfs_pivot_periodo = engine.load_pivot_periodo_dias(posts_df, profile_df)
+    return {
+        'df_profiles_posts': profiles_posts_df,
+        'posts_df': posts_df,
+        'dados_pivot_count': list_dfs_pivot[0],
+        'dados_pivot_total': list_dfs_pivot[1],
+        'dados_pivot_likes':  list_dfs_pivot[2],
+        'dados_pivot_comments': list_dfs_pivot[3],
+        'periodo_df': list_dfs_periodo[0],
+        'dias_df': list_dfs_periodo[1],
+        'dados_pivot_periodos': list_dfs_pivot_periodo[0],
+        'dados_pivot_dias': list_dfs_pivot_periodo[1]
+    }
+
 @router.post("/reports/concorrentes")
-async def generate_competitor_report(current_user: Usuario = Depends(get_current_active_user)): # Protegido
+async def generate_competitor_report(execucao: Optional[str] = None, current_user: Usuario = Depends(get_current_active_user)): # Protegido
     """
     Gera o relatório de análise de concorrentes.
     Requer que os dados do Instagram tenham sido extraídos.
+    Se a geração falhar, repetir a chamada com a `execucao` devolvida no erro retoma das seções já concluídas.
     """
 
+    from src.reporting.documento import nova_execucao, validar_execucao
+    try:
+        execucao = validar_execucao(execucao) if execucao else nova_execucao()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     try:
-        
-        # Carrega os dataframes necessários
-        posts_df = engine.load_posts_to_df(settings.POST_PATH)
-        profile_df = engine.load_profiles_to_df(settings.PROFILE_PATH)
-
-        if posts_df.empty or profile_df.empty:
-            raise HTTPException(status_code=400, detail="Dados de posts ou perfis do Instagram não encontrados. Execute a extração do Google SERP e Instagram primeiro.")
-
-        profiles_posts_df = engine.load_join_profiles_posts(posts_df, profile_df)
-        list_dfs_pivot = engine.load_top_3_profiles(posts_df, profile_df)
-        list_dfs_periodo = engine.load_periodo_dias(posts_df, profile_df)
-        list_dfs_pivot_periodo = engine.load_pivot_periodo_dias(posts_df, profile_df)
-        dataframes = {
-            'df_profiles_posts': profiles_posts_df,
-            'posts_df': posts_df,
-            'dados_pivot_count': list_dfs_pivot[0],
-            'dados_pivot_total': list_dfs_pivot[1],
-            'dados_pivot_likes':  list_dfs_pivot[2],
-            'dados_pivot_comments': list_dfs_pivot[3],
-            'periodo_df': list_dfs_periodo[0],
-            'dias_df': list_dfs_periodo[1],
-            'dados_pivot_periodos': list_dfs_pivot_periodo[0],
-            'dados_pivot_dias': list_dfs_pivot_periodo[1]
+        from src.reporting import generator_report_concorrentes
+
+        # Cada etapa (carga, figuras, análises, chamadas ao LLM, gravação) vira um span; o resumo vai na resposta
+        with iniciar_rastreamento("relatorio_concorrentes") as rastreio:
+            dataframes = _dataframes_concorrentes()
+
+            with open(settings.BRIEFING_JSON_PATH, 'r', encoding='utf-8') as f:
+                brief_data = json.load(f)
+
+            if not brief_data or 'objetivos' not in brief_data:
+                raise HTTPException(status_code=400, detail="Briefing não analisado ou incompleto. Analise o briefing primeiro.")
+
+            from config.llm_router import llm_para
+            llm = llm_para("relatorio")
+            # Tokens e custo contabilizados por relatório/cliente; passar do orçamento interrompe antes de gastar
+            with iniciar_orcamento("relatorio_concorrentes", cliente=brief_data['objetivos']['client_name']) as orcamento:
+                generator_report_concorrentes.generate_full_report(
+                    llm,
+                    dataframes,
+                    client_name=brief_data['objetivos']['client_name'],
+                    output_path=settings.CONCORRENTES_PATH,
+                    template_path=settings.TEMPLATE_PATH,
+                    llm_conclusao=llm_para("conclusao"),
+                    execucao=execucao,
+                )
+        return {
+            "message": f"Relatório de concorrentes gerado em {settings.CONCORRENTES_PATH}",
+            "execucao": execucao,
+            "tempos": rastreio.resumo(),
+            "custos": orcamento.resumo(),
         }
+    except OrcamentoExcedido as e:
+        raise HTTPException(status_code=402, detail=f"Relatório de concorrentes interrompido: orçamento de LLM excedido (execucao={execucao}). {e}")
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=f"Arquivos de dados ou briefing não encontrados para o relatório de concorrentes: {e}. Certifique-se de que as etapas anteriores (análise do briefing, extração de SERP e Instagram) foram executadas para o usuário logado.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao gerar relatório de concorrentes (execucao={execucao}, repita com ?execucao={execucao} para retomar): {str(e)}")
+
+@router.post("/reports/concorrentes/secoes/{secao}")
+async def regenerate_competitor_report_section(secao: str, current_user: Usuario = Depends(get_current_active_user)): # Protegido
+    """
+    Refaz uma seção ("figura_1", "figura_3" a "figura_9" ou "conclusao") do último relatório de concorrentes
+    gerado para o cliente do briefing, sem chamar o LLM para as demais seções, e renderiza o documento de novo.
+    """
+    try:
+        from src.reporting import generator_report_concorrentes
+        from src.reporting.documento import carregar_modelo, ultimo_modelo
+
+        if secao != "conclusao" and secao not in generator_report_concorrentes.ANALISES_FIGURAS:
+            raise HTTPException(status_code=400, detail=f"Seção '{secao}' não pode ser regenerada.")
 
         with open(settings.BRIEFING_JSON_PATH, 'r', encoding='utf-8') as f:
             brief_data = json.load(f)
+        client_name = brief_data['objetivos']['client_name']
 
-        if not brief_data or 'objetivos' not in brief_data:
-            raise HTTPException(status_code=400, detail="Briefing não analisado ou incompleto. Analise o briefing primeiro.")
+        caminho_modelo = ultimo_modelo(client_name, "concorrentes")
+        if caminho_modelo is None:
+            raise HTTPException(status_code=404, detail="Nenhum relatório de concorrentes gerado para este cliente. Gere o relatório primeiro.")
 
-        llm = settings.LLM
-        generator_report_concorrentes.generate_full_report(
-            llm,
-            dataframes,
-            client_name=brief_data['objetivos']['client_name'],
-            output_path=settings.CONCORRENTES_PATH,
-            template_path=settings.TEMPLATE_PATH,
-        )
-        return {"message": f"Relatório de concorrentes gerado em {settings.CONCORRENTES_PATH}"}
+        with iniciar_rastreamento("relatorio_concorrentes_secao") as rastreio:
+            relatorio = carregar_modelo(caminho_modelo)
+            dataframes = _dataframes_concorrentes() if secao != "conclusao" else None
+
+            from config.llm_router import llm_para
+            llm = llm_para("conclusao" if secao == "conclusao" else "relatorio")
+            with iniciar_orcamento("relatorio_concorrentes", cliente=client_name) as orcamento:
+                generator_report_concorrentes.regenerar_secao(
+                    relatorio, secao, llm, dataframes, output_path=settings.CONCORRENTES_PATH)
+        return {
+            "message": f"Seção '{secao}' do relatório de concorrentes regenerada em {settings.CONCORRENTES_PATH}",
+            "tempos": rastreio.resumo(),
+            "custos": orcamento.resumo(),
+        }
+    except HTTPException:
+        raise
+    except OrcamentoExcedido as e:
+        raise HTTPException(status_code=402, detail=f"Regeneração interrompida: orçamento de LLM excedido. {e}")
     except FileNotFoundError as e:
-        raise HTTPException(status_code=404, detail=f"Arquivos de dados ou briefing não encontrados para o relatório de concorrentes: {e}. Certifique-se de que as etapas anteriores (análise do briefing, extração de SERP e Instagram) foram executadas para o usuário logado.")
+        raise HTTPException(status_code=404, detail=f"Arquivos de dados ou briefing não encontrados: {e}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erro ao gerar relatório de concorrentes: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erro ao regenerar seção do relatório de concorrentes: {str(e)}")
@@ -7,11 +7,20 @@ class ChatMessage(BaseModel):
 
 class ChatRequest(BaseModel):
     message: str
-    chat_history: List[ChatMessage] # Para manter o histórico da conversa
+    chat_history: List[ChatMessage] = [] # Opcional: o histórico fica no servidor, por sessão
     session_id: str # Para identificar a sessão do usuário (pode ser gerado no frontend)
 
 class ChatResponse(BaseModel):
     response: str
     chat_history: List[ChatMessage]
     briefing_complete: bool = False # Indica se o briefing foi concluído
-    extracted_briefing: Dict = None # O briefing extraído, se estiver completo
\ No newline at end of file
+    extracted_briefing: Dict = None # O briefing extraído, se estiver completo
+
+class ChatDeltaMessage(BaseModel):
+    id: int # Posição da mensagem no histórico da sessão (usado para retomar com after_id)
+    role: str # 'human' ou 'ai'
+    content: str
+
+class ChatDeltaResponse(BaseModel):
+    messages: List[ChatDeltaMessage] # Apenas as mensagens posteriores ao after_id informado
+    briefing_complete: bool = False
\ No newline at end of file
@@ -0,0 +1,119 @@
+# auth/auth_cache.py
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import Usuario
+from config import settings
+
+
+@dataclass(frozen=True)
+class UsuarioAutenticado:
+    """Dados do usuário necessários nas rotas protegidas, desacoplados da sessão do banco."""
+    id: int
+    nome: str
+    email: str
+    ativo: bool
+    admin: bool
+
+    @classmethod
+    def from_usuario(cls, usuario: Usuario) -> "UsuarioAutenticado":
+        return cls(id=usuario.id, nome=usuario.nome, email=usuario.email, ativo=usuario.ativo, admin=usuario.admin)
+
+
+class CacheAutenticacao:
+    """
+    Cache LRU com TTL dos usuários autenticados, indexado pelo `sub` (email) do token.
+    Evita uma consulta ao banco a cada requisição protegida; as entradas expiram após
+    `ttl_segundos` e são invalidadas quando o usuário é alterado ou removido.
+    """
+
+    def __init__(self, max_itens: int = 1024, ttl_segundos: float = 60):
+        self.max_itens = max(1, max_itens)
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str) -> Optional[UsuarioAutenticado]:
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+            expira_em, usuario = item
+            if expira_em < time.monotonic():
+                del self._itens[chave]
+                return None
+            self._itens.move_to_end(chave)
+            return usuario
+
+    def guardar(self, chave: str, usuario: UsuarioAutenticado):
+        with self._lock:
+            self._itens[chave] = (time.monotonic() + self.ttl_segundos, usuario)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidar(self, chave: str):
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+
+cache_usuarios = CacheAutenticacao(
+    max_itens=settings.AUTH_CACHE_MAX_ITENS,
+    ttl_segundos=settings.AUTH_CACHE_TTL_SEGUNDOS,
+)
+
+
+# --- Invalidação automática ---
+# Qualquer alteração em um Usuario pelo ORM (ativo, admin, email...) remove a entrada do cache,
+# inclusive o email antigo quando ele é trocado. Os emails são anotados no flush e só removidos
+# depois do commit: antes dele, quem não acha o usuário no cache ainda lê a linha antiga do banco
+# e a guardaria de novo por todo o TTL.
+
+_EMAILS_ALTERADOS = "auth_cache_emails_alterados"
+_LIMPAR_TUDO = "auth_cache_limpar_tudo"
+
+def _anotar_usuario(mapper, connection, target: Usuario):
+    estado = inspect(target)
+    if estado.session is None:
+        return
+    historico = estado.attrs.email.history
+    estado.session.info.setdefault(_EMAILS_ALTERADOS, set()).update(
+        email for email in {target.email, *historico.deleted} if email
+    )
+
+event.listen(Usuario, "after_update", _anotar_usuario)
+event.listen(Usuario, "after_delete", _anotar_usuario)
+
+# UPDATE/DELETE em massa (query.update/delete) não disparam os eventos do mapper: limpa tudo após o commit
+def _anotar_em_massa(update_context):
+    if update_context.mapper.class_ is Usuario:
+        update_context.session.info[_LIMPAR_TUDO] = True
+
+event.listen(Session, "after_bulk_update", _anotar_em_massa)
+event.listen(Session, "after_bulk_delete", _anotar_em_massa)
+
+def _invalidar_apos_commit(session: Session):
+    if session.info.pop(_LIMPAR_TUDO, False):
+        cache_usuarios.limpar()
+    for email in session.info.pop(_EMAILS_ALTERADOS, ()):
+        cache_usuarios.invalidar(email)
+
+def _descartar_anotacoes(session: Session, transacao_anterior):
+    # Rollback da transação principal: o banco não mudou, não há o que invalidar
+    # (o de um savepoint mantém as anotações dos flushes anteriores a ele)
+    if transacao_anterior.parent is None:
+        session.info.pop(_LIMPAR_TUDO, None)
+        session.info.pop(_EMAILS_ALTERADOS, None)
+
+event.listen(Session, "after_commit", _invalidar_apos_commit)
+event.listen(Session, "after_soft_rollback", _descartar_anotacoes)
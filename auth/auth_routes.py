@@ -1,11 +1,15 @@
 # auth/auth_routes.py (novo router de autenticação)
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from models import get_db, Usuario
-from auth.auth_schemas import UsuarioCreate, UsuarioLogin, Token
-from auth.auth_utils import get_password_hash, verify_password, create_access_token
+from models import get_db, get_async_db, Usuario
+from auth.auth_schemas import UsuarioCreate, UsuarioLogin, Token, UsuarioUpdate
+from auth.auth_utils import get_password_hash, create_access_token
+from auth.password_service import get_password_hash_async, verify_and_update_async
 from auth.dependencies import get_current_active_user
+from auth.auth_cache import UsuarioAutenticado, cache_usuarios
 from config import settings
 from api.v1.schemas.user import UserCreate, UserResponse
 
@@ -25,14 +29,20 @@ def register_user(user_data: UsuarioCreate, db: Session = Depends(get_db)):
     return new_user
 
 @auth_router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: UsuarioLogin, db: Session = Depends(get_db)):
-    user = db.query(Usuario).filter(Usuario.email == form_data.email).first()
-    if not user or not verify_password(form_data.senha, user.senha):
+async def login_for_access_token(form_data: UsuarioLogin, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(Usuario).where(Usuario.email == form_data.email))).scalars().first()
+    # O bcrypt roda no pool do password_service, sem travar o event loop
+    senha_ok, novo_hash = await verify_and_update_async(form_data.senha, user.senha) if user else (False, None)
+    if not senha_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if novo_hash:
+        # O custo do bcrypt mudou (BCRYPT_ROUNDS): regrava o hash com o custo atual
+        user.senha = novo_hash
+        await db.commit()
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
@@ -42,8 +52,8 @@ async def login_for_access_token(form_data: UsuarioLogin, db: Session = Depends(
 @auth_router.post("/master-register-user", response_model=UserResponse)
 async def master_register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_current_active_user)
 ):
     """
     Permite que um usuário mestre (admin=True) registre novos usuários.
@@ -54,11 +64,11 @@ async def master_register_user(
             detail="Apenas usuários administradores podem registrar novos usuários."
         )
 
-    db_user = db.query(Usuario).filter(Usuario.email == user_data.email).first()
+    db_user = (await db.execute(select(Usuario).where(Usuario.email == user_data.email))).scalars().first()
     if db_user:
         raise HTTPException(status_code=400, detail="Email já registrado.")
 
-    hashed_password = get_password_hash(user_data.senha)
+    hashed_password = await get_password_hash_async(user_data.senha)
     new_user = Usuario(
         nome=user_data.nome,
         email=user_data.email,
@@ -66,6 +76,36 @@ async def master_register_user(
         admin=user_data.admin # Permite que o master defina se o novo usuário é admin
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
\ No newline at end of file
+    await db.commit()
+    await db.refresh(new_user)
+    return new_user
+
+@auth_router.patch("/users/{user_id}", response_model=UserResponse)
+async def update_user_status(
+    user_id: int,
+    user_data: UsuarioUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UsuarioAutenticado = Depends(get_current_active_user)
+):
+    """
+    Permite que um usuário mestre (admin=True) ative/desative um usuário ou altere seu perfil de admin.
+    A entrada do usuário no cache de autenticação é invalidada, então a mudança vale já na próxima requisição.
+    """
+    if not current_user.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Apenas usuários administradores podem alterar usuários."
+        )
+
+    db_user = await db.get(Usuario, user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado.")
+
+    if user_data.ativo is not None:
+        db_user.ativo = user_data.ativo
+    if user_data.admin is not None:
+        db_user.admin = user_data.admin
+    await db.commit()
+    await db.refresh(db_user)
+    cache_usuarios.invalidar(db_user.email)
+    return db_user
\ No newline at end of file
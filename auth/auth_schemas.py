@@ -15,5 +15,9 @@ class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
+class UsuarioUpdate(BaseModel):
+    ativo: Optional[bool] = None
+    admin: Optional[bool] = None
+
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -3,11 +3,12 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
-from passlib.context import CryptContext # Importar para hash de senhas
 from datetime import datetime, timedelta # Importar para expiração do token
 from typing import Optional # Importar para tipo opcional
 
-from models import Usuario, get_db # Importe Usuario e get_db do seu models.py
+from models import Usuario, get_db, SessionLocal # Importe Usuario e get_db do seu models.py
+from auth.auth_cache import UsuarioAutenticado, cache_usuarios
+from auth.password_service import verify_password, get_password_hash # Serviço único de hash de senhas
 from config import settings # Importe suas configurações para acessar SECRET_KEY e ALGORITHM
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
@@ -17,19 +18,8 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-# Contexto para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # --- Funções Auxiliares de Autenticação (anteriormente em auth_handler.py) ---
 
-def verify_password(plain_password: str, hashed_password: str):
-    """Verifica se uma senha em texto simples corresponde a um hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str):
-    """Gera o hash de uma senha."""
-    return pwd_context.hash(password)
-
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Cria um token de acesso JWT."""
     to_encode = data.copy()
@@ -49,12 +39,11 @@ def get_user(db: Session, email: str):
 
 # --- Função de Dependência do FastAPI ---
 
-async def get_current_active_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
+async def get_current_active_user(token: str = Depends(oauth2_scheme)) -> UsuarioAutenticado:
     """
     Verifica o token JWT e retorna o usuário ativo associado.
-    Usado como dependência nas rotas protegidas.
+    Usado como dependência nas rotas protegidas. O usuário resolvido fica em cache
+    (auth/auth_cache.py), então o banco só é consultado quando o cache não tem a entrada.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -68,9 +57,18 @@ async def get_current_active_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=email) # Agora get_user está definida no mesmo arquivo
+    user = cache_usuarios.obter(email)
     if user is None:
-        raise credentials_exception
+        # Sessão aberta apenas quando o usuário não está em cache
+        db = SessionLocal()
+        try:
+            db_user = get_user(db, email=email) # Agora get_user está definida no mesmo arquivo
+            if db_user is None:
+                raise credentials_exception
+            user = UsuarioAutenticado.from_usuario(db_user)
+        finally:
+            db.close()
+        cache_usuarios.guardar(email, user)
     if not user.ativo:
         raise HTTPException(status_code=400, detail="Usuário inativo")
     return user
\ No newline at end of file
@@ -0,0 +1,63 @@
+# auth/password_service.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from config import settings
+
+# Contexto único de hash de senhas. Com min_rounds = max_rounds = BCRYPT_ROUNDS, qualquer hash
+# gerado com outro custo é marcado como desatualizado e refeito no próximo login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _obter_executor() -> ThreadPoolExecutor:
+    """Pool dedicado ao bcrypt: limita quantos hashes rodam ao mesmo tempo sem ocupar o event loop."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _executor
+
+# --- Versões síncronas (scripts, rotas `def`) ---
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifica se uma senha em texto simples corresponde a um hash."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+def get_password_hash(password: str) -> str:
+    """Gera o hash de uma senha com o custo configurado."""
+    return pwd_context.hash(password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash estiver com um custo diferente do configurado,
+    retorna também o novo hash a ser gravado (ou None se não houver o que atualizar).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# --- Versões assíncronas (rotas `async def`): o bcrypt roda no pool dedicado ---
+
+async def _no_pool(funcao, *args):
+    return await asyncio.get_running_loop().run_in_executor(_obter_executor(), funcao, *args)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _no_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _no_pool(get_password_hash, password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await _no_pool(verify_and_update, plain_password, hashed_password)
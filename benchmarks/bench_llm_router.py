@@ -0,0 +1,80 @@
+# benchmarks/bench_llm_router.py
+"""
+Benchmark offline do roteador de LLMs (config/llm_router.py) com modelos falsos.
+
+Dois provedores falsos atendem a mesma tarefa: "primario" e "reserva". No cenário degradado,
+o primário fica lento e falha em parte das chamadas; o roteador deve registrar os erros,
+colocar o primário em quarentena e manter a vazão usando a reserva.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_llm_router --chamadas 200 --threads 8
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from config.llm_router import RoteadorLLM
+
+
+class FakeInstavel(FakeListChatModel):
+    """FakeListChatModel com latência fixa e uma probabilidade de falha por chamada."""
+    latencia: float = 0.0
+    taxa_falha: float = 0.0
+
+    def _call(self, *args, **kwargs):
+        time.sleep(self.latencia)
+        if random.random() < self.taxa_falha:
+            raise TimeoutError("provedor falso indisponível")
+        return super()._call(*args, **kwargs)
+
+
+def _rodar(nome: str, clientes: dict, chamadas: int, threads: int) -> dict:
+    roteador = RoteadorLLM(
+        {"padrao": ["primario", "reserva"]},
+        obter_cliente=clientes.__getitem__,
+        latencia_max_segundos=0.2,
+        quarentena_segundos=5,
+    )
+    llm = roteador.para("chat")
+    falhas = 0
+
+    def chamar(_):
+        try:
+            return llm.invoke("olá").content
+        except RuntimeError:
+            return None
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        respostas = list(executor.map(chamar, range(chamadas)))
+    duracao = time.perf_counter() - inicio
+    falhas = sum(1 for r in respostas if r is None)
+    return {
+        "cenario": nome,
+        "chamadas_por_segundo": round(chamadas / duracao, 1),
+        "falhas_finais": falhas,
+        "atendidas_pela_reserva": sum(1 for r in respostas if r == "reserva"),
+        "provedores": roteador.resumo(),
+    }
+
+
+def main(chamadas: int, threads: int):
+    reserva = FakeInstavel(responses=["reserva"], latencia=0.02)
+    cenarios = {
+        "saudavel": {"primario": FakeInstavel(responses=["primario"], latencia=0.01), "reserva": reserva},
+        "primario degradado": {"primario": FakeInstavel(responses=["primario"], latencia=0.3, taxa_falha=0.5), "reserva": reserva},
+        "primario fora do ar": {"primario": FakeInstavel(responses=["primario"], latencia=0.05, taxa_falha=1.0), "reserva": reserva},
+    }
+    for nome, clientes in cenarios.items():
+        print(_rodar(nome, clientes, chamadas, threads))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamadas", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+    main(args.chamadas, args.threads)
@@ -0,0 +1,89 @@
+# benchmarks/bench_login.py
+"""
+Benchmark de vazão de login (verificação de senha com bcrypt).
+
+Compara a verificação feita direto no event loop (comportamento antigo de
+`login_for_access_token`) com a feita pelo pool dedicado do `auth.password_service`,
+medindo logins/s e o maior atraso observado no event loop durante a rajada.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_login --logins 32 --rounds 12 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+async def _monitorar_event_loop(parar: asyncio.Event, intervalo: float = 0.01) -> float:
+    """Retorna o maior atraso (s) do event loop em relação ao `intervalo` esperado."""
+    maior_atraso = 0.0
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(intervalo)
+        maior_atraso = max(maior_atraso, time.perf_counter() - inicio - intervalo)
+    return maior_atraso
+
+
+async def _rodar_cenario(nome: str, login, total: int) -> dict:
+    parar = asyncio.Event()
+    monitor = asyncio.create_task(_monitorar_event_loop(parar))
+    await asyncio.sleep(0) # Deixa o monitor começar antes da rajada
+
+    inicio = time.perf_counter()
+    resultados = await asyncio.gather(*(login() for _ in range(total)))
+    duracao = time.perf_counter() - inicio
+
+    parar.set()
+    maior_atraso = await monitor
+    assert all(resultados), "Alguma verificação de senha falhou"
+    return {
+        "cenario": nome,
+        "logins": total,
+        "segundos": round(duracao, 3),
+        "logins_por_segundo": round(total / duracao, 2),
+        "maior_atraso_event_loop_ms": round(maior_atraso * 1000, 1),
+    }
+
+
+async def main(total: int):
+    from auth import password_service
+
+    senha = "senha-de-benchmark"
+    hash_senha = password_service.get_password_hash(senha)
+
+    async def login_no_event_loop():
+        return password_service.verify_password(senha, hash_senha)
+
+    async def login_no_pool():
+        return await password_service.verify_password_async(senha, hash_senha)
+
+    for resultado in (
+        await _rodar_cenario("event loop (antigo)", login_no_event_loop, total),
+        await _rodar_cenario("pool dedicado", login_no_pool, total),
+    ):
+        print(resultado)
+
+    # Rehash transparente: um hash com custo diferente do configurado é refeito no login
+    from passlib.hash import bcrypt
+    custo_antigo = max(4, password_service.settings.BCRYPT_ROUNDS - 2)
+    hash_antigo = bcrypt.using(rounds=custo_antigo).hash(senha)
+    ok, novo_hash = await password_service.verify_and_update_async(senha, hash_antigo)
+    print({"rehash": ok and novo_hash is not None, "custo_antigo": custo_antigo,
+           "custo_atual": password_service.settings.BCRYPT_ROUNDS})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="Logins simultâneos na rajada")
+    parser.add_argument("--rounds", type=int, help="Custo do bcrypt (sobrescreve BCRYPT_ROUNDS)")
+    parser.add_argument("--workers", type=int, help="Tamanho do pool (sobrescreve PASSWORD_HASH_WORKERS)")
+    args = parser.parse_args()
+
+    # As configurações são lidas na importação de config.settings, então precisam vir antes
+    if args.rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    if args.workers:
+        os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+
+    asyncio.run(main(args.logins))
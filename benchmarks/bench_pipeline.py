@@ -0,0 +1,227 @@
+# benchmarks/bench_pipeline.py
+"""
+Benchmark de ponta a ponta do pipeline de relatórios, sem chaves de API.
+
+Para cada tamanho (quantidade de concorrentes), gera perfis/posts sintéticos (benchmarks/dados_sinteticos.py)
+e executa as mesmas etapas de run_pipeline.main com o LLM falso (benchmarks/fake_llm.py):
+
+    carga             engine.load_profiles_to_df / load_posts_to_df
+    features          join perfis x posts, pivots top 3, períodos/dias, KPIs
+    graficos          figuras do relatório de concorrentes (matplotlib + wordcloud)
+    clusterizacao     Secao_2_1_Figura2 (AutoClusterHPO + PCA)
+    llm_briefing      engine.parse_* com saída estruturada
+    relatorio_docx    generator_report_concorrentes.generate_full_report (.docx)
+    regenerar_secao   generator_report_concorrentes.regenerar_secao de uma figura, sobre o modelo salvo (.docx)
+    retomada          generate_full_report com a `execucao` já concluída: só copia os checkpoints e monta o .docx
+    publicacoes_xlsx  generator_report_publicacoes.preencher_publicacoes (.xlsx)
+
+Cada etapa registra tempo (s), pico de memória alocada (tracemalloc, MB) e chamadas ao LLM;
+"spans_relatorio" traz o detalhamento do relatório por span (src/observability/tracing.py) e
+"custos_relatorio" os tokens e o custo estimado (src/observability/orcamento.py).
+O tracemalloc deixa as etapas mais lentas: para comparar só tempos, rode com --sem-memoria.
+Uma etapa que falhar (ex.: dependência ausente) fica com "erro" no resultado e as demais continuam.
+Com --figuras-por-lote N, o relatório pede as análises de N figuras por chamada (LoteAnalises);
+com --latencia > 0 dá para comparar o tempo do relatório com e sem lote. --perfil-graficos escolhe o perfil
+de renderização das figuras (src/reporting/renderizacao.py); o tamanho do .docx sai em "tamanho_docx_kb".
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_pipeline --concorrentes 10 100 1000 --saida bench_pipeline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+
+from benchmarks.dados_sinteticos import gravar_concorrentes
+from benchmarks.fake_llm import FakeLLMEstruturado
+from config import settings
+from config.llm_router import RoteadorLLM
+from src.observability.orcamento import iniciar_orcamento
+from src.observability.tracing import iniciar_rastreamento
+
+
+def _medir(resultados: dict, etapa: str, llm: FakeLLMEstruturado, funcao, *args, **kwargs):
+    chamadas_antes = llm.chamadas
+    medir_memoria = tracemalloc.is_tracing()
+    if medir_memoria:
+        tracemalloc.reset_peak()
+        memoria_antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    retorno = None
+    try:
+        retorno = funcao(*args, **kwargs)
+        erro = None
+    except Exception as e:
+        erro = f"{type(e).__name__}: {e}"
+    duracao = time.perf_counter() - inicio
+    pico_mb = round((tracemalloc.get_traced_memory()[1] - memoria_antes) / 2**20, 2) if medir_memoria else None
+    resultados[etapa] = {
+        "segundos": round(duracao, 4),
+        "pico_memoria_mb": pico_mb,
+        "chamadas_llm": llm.chamadas - chamadas_antes,
+    }
+    if erro:
+        resultados[etapa]["erro"] = erro
+    print(f"  {etapa:<18} {duracao:8.3f}s  {pico_mb if pico_mb is not None else '-':>8} MB" + (f"  ERRO: {erro}" if erro else ""))
+    return retorno
+
+
+def _features(engine, posts_df, profile_df) -> dict:
+    list_dfs_pivot = engine.load_top_3_profiles(posts_df, profile_df)
+    list_dfs_periodo = engine.load_periodo_dias(posts_df, profile_df)
+    list_dfs_pivot_periodo = engine.load_pivot_periodo_dias(posts_df, profile_df)
+    engine.calculate_kpis(profile_df, posts_df)
+    return {
+        'df_profiles_posts': engine.load_join_profiles_posts(posts_df, profile_df),
+        'posts_df': posts_df,
+        'dados_pivot_count': list_dfs_pivot[0],
+        'dados_pivot_total': list_dfs_pivot[1],
+        'dados_pivot_likes': list_dfs_pivot[2],
+        'dados_pivot_comments': list_dfs_pivot[3],
+        'periodo_df': list_dfs_periodo[0],
+        'dias_df': list_dfs_periodo[1],
+        'dados_pivot_periodos': list_dfs_pivot_periodo[0],
+        'dados_pivot_dias': list_dfs_pivot_periodo[1],
+    }
+
+
+def _graficos(concorrentes, client_name: str, dataframes: dict):
+    concorrentes.Secao_2_1_Figura1(client_name, dataframes['df_profiles_posts'])
+    concorrentes.Secao_2_1_Figura3(dataframes['posts_df'])
+    concorrentes.Secao_2_2_Figura4(client_name, dataframes['posts_df'], dataframes['df_profiles_posts'])
+    concorrentes.Secao_2_2_Figura5(dataframes['dados_pivot_count'], dataframes['dados_pivot_total'])
+    concorrentes.Secao_2_2_Figura6(dataframes['dados_pivot_likes'], dataframes['dados_pivot_comments'])
+    concorrentes.Secao_2_3_Figura7(client_name, dataframes['periodo_df'], dataframes['dias_df'])
+    concorrentes.Secao_2_3_Figura8(dataframes['dados_pivot_periodos'], dataframes['dados_pivot_dias'])
+    concorrentes.Secao_2_3_Figura9(dataframes['dados_pivot_periodos'], dataframes['dados_pivot_dias'])
+
+
+def _briefing(engine, llm) -> dict:
+    texto = "Somos uma loja de moda feminina em Recife e queremos vender mais pelo Instagram."
+    brief_data = {
+        'objetivos': engine.parse_objetivos(texto, llm).model_dump(),
+        'publico': engine.parse_publicos(texto, llm).model_dump(),
+        'infoempresa': engine.parse_info_empresa(texto, llm).model_dump(),
+    }
+    brief_data['pilares'] = engine.parse_pilares(texto, llm, brief_data['objetivos'], brief_data['publico']).model_dump()["pilares"]
+    brief_data['posicionamento'] = engine.parse_posicionamento(
+        objetivos=brief_data['objetivos'], publico=brief_data['publico'], llm=llm).model_dump()
+    engine.parse_calendario_editorial(
+        pilares=brief_data['pilares'], objetivos=brief_data['objetivos'], publico=brief_data['publico'], llm=llm)
+    return brief_data
+
+
+def _publicacoes(llm, brief_data: dict):
+    from src.reporting import generator_report_publicacoes
+    generator_report_publicacoes.preencher_publicacoes(
+        llm=llm,
+        pilares=brief_data['pilares'],
+        objetivos=brief_data['objetivos'],
+        publico=brief_data['publico'],
+        posicionamento=brief_data['posicionamento'],
+    )
+
+
+def rodar_tamanho(quantidade: int, posts_por_perfil: int, latencia: float, clusterizar: bool, diretorio: str,
+                  figuras_por_lote: int = 1) -> dict:
+    from src.analysis import engine
+    from src.reporting import generator_report_concorrentes as concorrentes
+
+    caminho_perfis, caminho_posts = gravar_concorrentes(os.path.join(diretorio, "raw"), quantidade, posts_por_perfil)
+    # Listas da saída estruturada com um item por figura do lote
+    llm = FakeLLMEstruturado(latencia=latencia, itens_por_lista=max(2, figuras_por_lote))
+    etapas = {}
+    print(f"\n{quantidade} concorrentes ({quantidade * posts_por_perfil} posts)")
+
+    profile_df, posts_df = _medir(etapas, "carga", llm, lambda: (
+        engine.load_profiles_to_df(caminho_perfis), engine.load_posts_to_df(caminho_posts)))
+    dataframes = _medir(etapas, "features", llm, _features, engine, posts_df, profile_df)
+    client_name = profile_df.nlargest(1, 'followersCount')['username'].iloc[0]
+    _medir(etapas, "graficos", llm, _graficos, concorrentes, client_name, dataframes)
+    if clusterizar:
+        _medir(etapas, "clusterizacao", llm, concorrentes.Secao_2_1_Figura2, dataframes['df_profiles_posts'].copy())
+    brief_data = _medir(etapas, "llm_briefing", llm, _briefing, engine, llm)
+    # Passando pelo roteador, como na API, cada chamada ao LLM também vira um span com tokens.
+    # O falso é registrado como "gemini" para que o custo use a tabela de preços desse provedor.
+    llm_relatorio = RoteadorLLM({"padrao": ["gemini"]}, obter_cliente=lambda _: llm).para("relatorio")
+    caminho_docx = os.path.join(diretorio, f"concorrentes_{quantidade}.docx")
+    with iniciar_rastreamento("relatorio_concorrentes") as rastreio, \
+            iniciar_orcamento("relatorio_concorrentes", cliente=client_name, max_tokens=0) as orcamento:
+        relatorio = _medir(etapas, "relatorio_docx", llm, concorrentes.generate_full_report,
+                           llm_relatorio, dataframes, client_name=client_name, output_path=caminho_docx,
+                           template_path=settings.TEMPLATE_PATH, figuras_por_lote=figuras_por_lote)
+    if os.path.exists(caminho_docx):
+        etapas["relatorio_docx"]["tamanho_docx_kb"] = round(os.path.getsize(caminho_docx) / 1024, 1)
+    if relatorio is not None:
+        _medir(etapas, "regenerar_secao", llm, concorrentes.regenerar_secao,
+               relatorio, "figura_7", llm, dataframes, output_path=caminho_docx)
+        _medir(etapas, "retomada", llm, concorrentes.generate_full_report,
+               llm_relatorio, dataframes, client_name=client_name, output_path=caminho_docx,
+               template_path=settings.TEMPLATE_PATH, figuras_por_lote=figuras_por_lote, execucao=relatorio.execucao)
+    if brief_data:
+        _medir(etapas, "publicacoes_xlsx", llm, _publicacoes, llm, brief_data)
+
+    return {
+        "concorrentes": quantidade,
+        "posts": quantidade * posts_por_perfil,
+        "total_segundos": round(sum(e["segundos"] for e in etapas.values()), 4),
+        "etapas": etapas,
+        "spans_relatorio": rastreio.resumo(),
+        "custos_relatorio": orcamento.resumo(),
+    }
+
+
+def main(tamanhos, posts_por_perfil: int, latencia: float, clusterizar: bool, medir_memoria: bool, saida: str,
+         figuras_por_lote: int = 1, perfil_graficos: str = None):
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Sem a pausa de rate limit do relatório e sem escrever em reports/ ou data/processed/
+        settings.RELATORIO_PAUSA_SEGUNDOS = 0
+        settings.PUBLICACOES_PATH = os.path.join(diretorio, "publicacoes.xlsx")
+        settings.LLM_CUSTOS_PATH = os.path.join(diretorio, "custos_llm.json")
+        settings.RELATORIOS_MODELOS_PATH = os.path.join(diretorio, "relatorios")
+        settings.RELATORIO_PERFIL_GRAFICOS = perfil_graficos or settings.RELATORIO_PERFIL_GRAFICOS
+        if medir_memoria:
+            tracemalloc.start()
+        try:
+            resultados = [rodar_tamanho(n, posts_por_perfil, latencia, clusterizar, diretorio, figuras_por_lote)
+                          for n in tamanhos]
+        finally:
+            tracemalloc.stop()
+
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "posts_por_perfil": posts_por_perfil,
+        "latencia_llm_segundos": latencia,
+        "figuras_por_lote": figuras_por_lote,
+        "perfil_graficos": settings.RELATORIO_PERFIL_GRAFICOS,
+        "tracemalloc": medir_memoria,
+        "resultados": resultados,
+    }
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados gravados em {saida}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concorrentes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--posts-por-perfil", type=int, default=20)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Latência simulada por chamada ao LLM (s)")
+    parser.add_argument("--sem-clusterizacao", action="store_true", help="Pula a etapa de AutoClusterHPO (lenta)")
+    parser.add_argument("--sem-memoria", action="store_true", help="Desliga o tracemalloc (que deixa as etapas mais lentas)")
+    parser.add_argument("--figuras-por-lote", type=int, default=1, help="Figuras analisadas por chamada ao LLM no relatório")
+    parser.add_argument("--perfil-graficos", choices=["print", "screen", "draft"], help="Perfil de renderização das figuras")
+    parser.add_argument("--saida", default="bench_pipeline.json")
+    args = parser.parse_args()
+    main(args.concorrentes, args.posts_por_perfil, args.latencia, not args.sem_clusterizacao, not args.sem_memoria, args.saida,
+         args.figuras_por_lote, args.perfil_graficos)
@@ -0,0 +1,69 @@
+# benchmarks/dados_sinteticos.py
+"""
+Perfis e publicações sintéticos no mesmo formato JSON exportado pelo Apify (profile_data.json /
+post_data.json), para exercitar `engine.load_*` e os geradores de relatório sem extrair dados reais.
+
+A geração é determinística para uma mesma `semente`: duas execuções produzem os mesmos arquivos.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+TIPOS_POST = ["Image", "Video", "Sidecar"]
+HASHTAGS = [f"hashtag{i}" for i in range(300)]
+
+
+def gerar_concorrentes(quantidade: int, posts_por_perfil: int = 20, semente: int = 42) -> Tuple[List[Dict], List[Dict]]:
+    """Retorna (perfis, posts). Seguidores e curtidas seguem uma distribuição de cauda longa, como no Instagram."""
+    rnd = random.Random(semente)
+    inicio = datetime(2025, 1, 1)
+    perfis, posts = [], []
+    for i in range(quantidade):
+        perfil_id = str(10_000_000 + i)
+        username = f"concorrente_{i:04d}"
+        seguidores = int(rnd.lognormvariate(8, 1.6))
+        perfis.append({
+            "id": perfil_id,
+            "username": username,
+            "fullName": f"Concorrente {i}",
+            "biography": f"Loja {i} | Moda e acessórios 🛍️ | Entregamos em todo o Brasil",
+            "externalUrl": f"https://concorrente{i}.com.br",
+            "followersCount": seguidores,
+            "followsCount": rnd.randint(50, 3000),
+            "postsCount": rnd.randint(posts_por_perfil, 5000),
+            "verified": rnd.random() < 0.05,
+        })
+        for j in range(posts_por_perfil):
+            hashtags = rnd.sample(HASHTAGS[:30], 2) + rnd.sample(HASHTAGS, rnd.randint(0, 6))
+            curtidas = int(seguidores * rnd.uniform(0.002, 0.08))
+            posts.append({
+                "id": f"{perfil_id}{j:04d}",
+                "shortCode": f"C{i:04d}{j:04d}",
+                "ownerId": perfil_id,
+                "ownerUsername": username,
+                "timestamp": (inicio + timedelta(minutes=rnd.randint(0, 60 * 24 * 180))).isoformat() + "Z",
+                "likesCount": curtidas,
+                "commentsCount": int(curtidas * rnd.uniform(0.005, 0.1)),
+                "type": rnd.choices(TIPOS_POST, weights=[5, 3, 2])[0],
+                "hashtags": hashtags,
+                "caption": f"Novidade da semana na loja {i}! " + " ".join(f"#{h}" for h in hashtags),
+                "mentions": [f"concorrente_{rnd.randrange(quantidade):04d}"] if rnd.random() < 0.2 else [],
+                "firstComment": "Amei! 😍",
+                "latestComments": [{"text": "Qual o preço?", "ownerUsername": "cliente_1"}],
+            })
+    return perfis, posts
+
+
+def gravar_concorrentes(diretorio: str, quantidade: int, posts_por_perfil: int = 20, semente: int = 42) -> Tuple[str, str]:
+    """Grava os arquivos de perfis e posts em `diretorio` e retorna seus caminhos."""
+    perfis, posts = gerar_concorrentes(quantidade, posts_por_perfil, semente)
+    os.makedirs(diretorio, exist_ok=True)
+    caminho_perfis = os.path.join(diretorio, f"profile_data_{quantidade}.json")
+    caminho_posts = os.path.join(diretorio, f"post_data_{quantidade}.json")
+    with open(caminho_perfis, "w", encoding="utf-8") as f:
+        json.dump(perfis, f, ensure_ascii=False)
+    with open(caminho_posts, "w", encoding="utf-8") as f:
+        json.dump(posts, f, ensure_ascii=False)
+    return caminho_perfis, caminho_posts
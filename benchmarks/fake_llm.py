@@ -0,0 +1,124 @@
+# benchmarks/fake_llm.py
+"""
+LLM falso e determinístico para rodar o pipeline sem chaves de API.
+
+- Texto livre: devolve um parágrafo estável (mesmo prompt -> mesma resposta). Se o prompt pedir
+  'Inicie o texto dizendo "..."', a resposta começa com essa frase, como o modelo real faria.
+- `with_structured_output(Schema)`: devolve uma instância válida do schema, montada a partir do
+  JSON Schema (defaults, enums, listas com `itens_por_lista` itens).
+- Prompts com instruções do PydanticOutputParser (JSON Schema entre ```): devolve um JSON válido.
+
+`latencia` (segundos) é aplicada em toda chamada, para simular o tempo de resposta do provedor.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+_PALAVRAS = ("engajamento concorrentes publicações alcance seguidores conteúdo estratégia marca público "
+             "frequência formato tendência desempenho interação crescimento posicionamento").split()
+_RE_SCHEMA = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+_RE_INICIO = re.compile(r'Inicie o texto dizendo\s+"([^"\n]*)')
+_contador_lock = threading.Lock()
+
+
+def _json_schema(schema) -> Dict:
+    if isinstance(schema, dict):
+        return schema
+    if hasattr(schema, "model_json_schema"):
+        return schema.model_json_schema()
+    return schema.schema() # pydantic v1
+
+
+def exemplo_do_schema(schema: Dict, itens_por_lista: int = 2) -> Any:
+    """Gera um valor mínimo e válido para um JSON Schema (resolve $ref, anyOf, enums e listas)."""
+    definicoes = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+
+    def gerar(no: Dict, campo: str, indice: int) -> Any:
+        if "$ref" in no:
+            return gerar(definicoes[no["$ref"].split("/")[-1]], campo, indice)
+        for chave in ("anyOf", "oneOf", "allOf"):
+            if chave in no:
+                opcoes = [o for o in no[chave] if o.get("type") != "null"] or no[chave]
+                return gerar(opcoes[0], campo, indice)
+        if "enum" in no:
+            return no["enum"][0]
+        if no.get("default") is not None:
+            return no["default"]
+        tipo = no.get("type")
+        if isinstance(tipo, list):
+            tipo = next((t for t in tipo if t != "null"), None)
+        if tipo == "object" or "properties" in no:
+            return {nome: gerar(sub, nome, indice) for nome, sub in no.get("properties", {}).items()}
+        if tipo == "array":
+            quantidade = max(no.get("minItems", 0), itens_por_lista)
+            return [gerar(no.get("items", {}), campo, i) for i in range(quantidade)]
+        if tipo == "integer":
+            return indice + 1
+        if tipo == "number":
+            return float(indice + 1)
+        if tipo == "boolean":
+            return True
+        if no.get("format") == "date":
+            return "2025-01-01"
+        return f"{campo} {indice + 1}"
+
+    return gerar(schema, "valor", 0)
+
+
+class FakeLLMEstruturado(BaseChatModel):
+    """BaseChatModel falso: respostas determinísticas, saída estruturada válida e latência configurável."""
+    latencia: float = 0.0 # Segundos por chamada
+    palavras_resposta: int = 120 # Tamanho das respostas de texto livre
+    itens_por_lista: int = 2 # Itens gerados em cada lista da saída estruturada
+    chamadas: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-estruturado"
+
+    def _contar(self):
+        with _contador_lock:
+            self.chamadas += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def _texto(self, prompt: str) -> str:
+        encontrado = _RE_SCHEMA.search(prompt)
+        if encontrado:
+            try:
+                return json.dumps(exemplo_do_schema(json.loads(encontrado.group(1)), self.itens_por_lista), ensure_ascii=False)
+            except json.JSONDecodeError:
+                pass
+        semente = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest(), 16)
+        palavras = [_PALAVRAS[(semente >> (i % 128)) % len(_PALAVRAS)] for i in range(self.palavras_resposta)]
+        inicio = _RE_INICIO.search(prompt)
+        prefixo = inicio.group(1).rstrip(". ") + ", " if inicio else ""
+        return prefixo + " ".join(palavras) + "."
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        self._contar()
+        prompt = "\n".join(str(m.content) for m in messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._texto(prompt)))])
+
+    def with_structured_output(self, schema, **kwargs):
+        json_schema = _json_schema(schema)
+
+        def responder(_entrada):
+            self._contar()
+            dados = exemplo_do_schema(json_schema, self.itens_por_lista)
+            if isinstance(schema, dict):
+                return dados
+            if hasattr(schema, "model_validate"):
+                return schema.model_validate(dados)
+            return schema.parse_obj(dados)
+
+        return RunnableLambda(responder)
+
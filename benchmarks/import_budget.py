@@ -0,0 +1,87 @@
+# benchmarks/import_budget.py
+"""
+Orçamento de tempo de importação.
+
+Importa cada módulo em um processo novo com `python -X importtime`, mede o tempo acumulado
+(melhor de N execuções) e verifica que os pacotes pesados (SDKs de LLM, matplotlib, sklearn...)
+não foram carregados. Sai com código 1 se algum orçamento for estourado, para ser usado como
+checagem em CI.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --fator 2   # máquinas mais lentas
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SDKS_LLM = ["langchain_google_genai", "google.generativeai", "langchain_openai", "langchain_groq", "langchain_ollama"]
+PLOTAGEM = ["matplotlib", "seaborn", "sklearn", "wordcloud"]
+
+
+class Orcamento(NamedTuple):
+    modulo: str
+    segundos: float
+    proibidos: List[str]
+
+
+ORCAMENTOS = [
+    Orcamento("config.settings", 0.3, SDKS_LLM + ["langchain_core"]),
+    Orcamento("src.analysis.engine", 1.5, SDKS_LLM + PLOTAGEM),
+    Orcamento("main", 3.0, SDKS_LLM + PLOTAGEM + ["docx", "apify_client", "googleapiclient"]),
+]
+
+# `exec("import ...")` em vez de importlib.import_module: só o comando import é medido pelo -X importtime
+_SCRIPT = (
+    "import json, sys; exec('import ' + sys.argv[1]); "
+    "print(json.dumps(sorted(m for m in sys.argv[2:] if m in sys.modules)))"
+)
+
+
+def medir(orcamento: Orcamento) -> Tuple[float, List[str]]:
+    """Retorna (segundos acumulados do módulo, módulos proibidos que foram carregados)."""
+    ambiente = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SCRIPT, orcamento.modulo, *orcamento.proibidos],
+        cwd=RAIZ, env=ambiente, capture_output=True, text=True,
+    )
+    if resultado.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {orcamento.modulo}:\n{resultado.stderr[-2000:]}")
+
+    microssegundos = 0
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time: self [us] | cumulative | imported package"
+        partes = linha.split("|")
+        if len(partes) == 3 and partes[2].strip() == orcamento.modulo:
+            microssegundos = int(partes[1])
+    carregados = json.loads(resultado.stdout.strip().splitlines()[-1])
+    return microssegundos / 1e6, carregados
+
+
+def main(fator: float, repeticoes: int) -> int:
+    falhas = 0
+    for orcamento in ORCAMENTOS:
+        medicoes = [medir(orcamento) for _ in range(repeticoes)]
+        segundos = min(m[0] for m in medicoes)
+        carregados = medicoes[-1][1]
+        limite = orcamento.segundos * fator
+        ok = segundos <= limite and not carregados
+        falhas += not ok
+        status = "OK   " if ok else "FALHA"
+        print(f"{status} {orcamento.modulo:<22} {segundos:6.3f}s (orçamento {limite:.2f}s)"
+              + (f" | carregou: {', '.join(carregados)}" if carregados else ""))
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fator", type=float, default=1.0, help="Multiplica todos os orçamentos")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções por módulo (vale a melhor)")
+    args = parser.parse_args()
+    sys.exit(main(args.fator, args.repeticoes))
@@ -0,0 +1,95 @@
+# benchmarks/stress_db.py
+"""
+Teste de estresse de concorrência do banco.
+
+Várias threads fazem, ao mesmo tempo, leituras (como a autenticação das rotas) e escritas
+(como cadastro e login com rehash) em um banco SQLite temporário. Compara o engine padrão
+(`create_engine(url)` sem ajustes, como era em models.py) com o engine de `database.criar_engine`
+(WAL, busy_timeout e pool), reportando operações/s e erros "database is locked".
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.stress_db --threads 16 --operacoes 200
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+
+def _rodar(nome: str, engine, threads: int, operacoes: int, proporcao_escrita: float) -> dict:
+    from models import Base, Usuario
+
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    erros_lock, erros_outros, concluidas = [0], [0], [0]
+    lock = threading.Lock()
+    a_cada = max(1, round(1 / proporcao_escrita)) if proporcao_escrita > 0 else None
+
+    def trabalhador(indice: int):
+        for i in range(operacoes):
+            session = Session()
+            try:
+                if a_cada and i % a_cada == 0:
+                    session.add(Usuario(nome=f"u{indice}-{i}", email=f"{nome}-{indice}-{i}@stress.local", senha="x"))
+                    session.commit()
+                else:
+                    session.query(Usuario).filter(Usuario.email == f"{nome}-{indice}-0@stress.local").first()
+                with lock:
+                    concluidas[0] += 1
+            except OperationalError as e:
+                session.rollback()
+                with lock:
+                    if "locked" in str(e):
+                        erros_lock[0] += 1
+                    else:
+                        erros_outros[0] += 1
+            finally:
+                session.close()
+
+    inicio = time.perf_counter()
+    workers = [threading.Thread(target=trabalhador, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    duracao = time.perf_counter() - inicio
+    engine.dispose()
+    return {
+        "engine": nome,
+        "operacoes": threads * operacoes,
+        "concluidas": concluidas[0],
+        "erros_database_locked": erros_lock[0],
+        "outros_erros": erros_outros[0],
+        "segundos": round(duracao, 3),
+        "operacoes_por_segundo": round(concluidas[0] / duracao, 1),
+    }
+
+
+def main(threads: int, operacoes: int, proporcao_escrita: float, timeout_padrao: float):
+    from database import criar_engine
+
+    with tempfile.TemporaryDirectory() as pasta:
+        url_padrao = f"sqlite:///{os.path.join(pasta, 'padrao.db')}"
+        url_ajustada = f"sqlite:///{os.path.join(pasta, 'ajustado.db')}"
+        cenarios = [
+            ("padrão", create_engine(url_padrao, connect_args={"check_same_thread": False, "timeout": timeout_padrao})),
+            ("database.criar_engine", criar_engine(url_ajustada)),
+        ]
+        for nome, engine in cenarios:
+            print(_rodar(nome, engine, threads, operacoes, proporcao_escrita))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16, help="Threads simultâneas")
+    parser.add_argument("--operacoes", type=int, default=200, help="Operações por thread")
+    parser.add_argument("--escrita", type=float, default=0.2, help="Proporção de escritas (0 a 1)")
+    parser.add_argument("--timeout-padrao", type=float, default=0.1,
+                        help="Busy timeout (s) do engine padrão; o driver usa 5s, valores baixos evidenciam os locks")
+    args = parser.parse_args()
+    main(args.threads, args.operacoes, args.escrita, args.timeout_padrao)
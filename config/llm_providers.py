@@ -0,0 +1,89 @@
+# config/llm_providers.py
+"""
+Registro de provedores de LLM.
+
+Cada provedor é uma fábrica registrada pelo nome; o cliente só é construído (e o pacote do
+provedor só é importado) no primeiro uso, e depois reaproveitado. Assim, importar `config.settings`
+ou subir um worker da API não paga o custo de carregar os SDKs dos modelos.
+"""
+import threading
+from typing import Callable, Dict, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+_FABRICAS: Dict[str, Callable[[], BaseChatModel]] = {}
+_INSTANCIAS: Dict[str, BaseChatModel] = {}
+_lock = threading.Lock()
+
+
+def registrar_provedor(nome: str, fabrica: Callable[[], BaseChatModel]):
+    """Registra (ou substitui) a fábrica de um provedor. Descarta a instância já criada, se houver."""
+    with _lock:
+        _FABRICAS[nome] = fabrica
+        _INSTANCIAS.pop(nome, None)
+
+
+def provedores_registrados():
+    return list(_FABRICAS)
+
+
+def obter_llm(nome: Optional[str] = None) -> BaseChatModel:
+    """Retorna o cliente do provedor `nome` (padrão: settings.LLM_PROVIDER), criando-o no primeiro uso."""
+    from config import settings
+
+    nome = nome or settings.LLM_PROVIDER
+    instancia = _INSTANCIAS.get(nome)
+    if instancia is not None:
+        return instancia
+    with _lock:
+        if nome not in _INSTANCIAS:
+            if nome not in _FABRICAS:
+                raise ValueError(f"Provedor de LLM desconhecido: '{nome}'. Registrados: {list(_FABRICAS)}")
+            _INSTANCIAS[nome] = _FABRICAS[nome]()
+        return _INSTANCIAS[nome]
+
+
+# --- Provedores padrão (imports dentro das fábricas) ---
+
+def _gemini() -> BaseChatModel:
+    from config import settings
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    import google.generativeai as genai
+
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    return ChatGoogleGenerativeAI(model=settings.GEMINI_MODEL, google_api_key=settings.GEMINI_API_KEY)
+
+
+def _gemini_pro() -> BaseChatModel:
+    from config import settings
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=settings.GEMINI_MODEL_FORTE, google_api_key=settings.GEMINI_API_KEY)
+
+
+def _groq() -> BaseChatModel:
+    from config import settings
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(model=settings.GROQ_MODEL, temperature=0.4)
+
+
+def _openai() -> BaseChatModel:
+    from config import settings
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model=settings.OPENAI_MODEL)
+
+
+def _ollama() -> BaseChatModel:
+    from config import settings
+    from langchain_ollama import ChatOllama
+
+    return ChatOllama(model=settings.OLLAMA_MODEL)
+
+
+registrar_provedor("gemini", _gemini)
+registrar_provedor("gemini_pro", _gemini_pro)
+registrar_provedor("groq", _groq)
+registrar_provedor("openai", _openai)
+registrar_provedor("ollama", _ollama)
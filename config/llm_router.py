@@ -0,0 +1,308 @@
+# config/llm_router.py
+"""
+Roteador de LLMs por tarefa, com failover e preferência por latência.
+
+Cada tarefa ("chat", "extracao", "relatorio", "conclusao") tem uma lista ordenada de provedores
+(nomes do registro em config/llm_providers.py). O roteador mede, por provedor, a latência (p50/p95)
+e a taxa de erro numa janela móvel; provedores com erros seguidos ficam em quarentena por alguns
+segundos e provedores lentos vão para o fim da fila. Se uma chamada falhar, a próxima opção da lista
+é tentada automaticamente.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.runnables import Runnable
+
+from config import settings
+from config.llm_providers import obter_llm
+from src.observability.orcamento import estimar_tokens, orcamento_atual
+from src.observability.tracing import Span, registrar_span, span
+
+
+class EstatisticasProvedor:
+    """
+    Latência e erros das últimas `janela` chamadas de um provedor. Amostras com mais de
+    `validade_segundos` são descartadas, para que um provedor degradado volte a ser preferido
+    depois de um tempo sem ser usado.
+    """
+
+    def __init__(self, janela: int = 50, validade_segundos: float = 300.0):
+        self._chamadas: Deque[Tuple[float, float, bool]] = deque(maxlen=janela) # (instante, segundos, sucesso)
+        self.validade_segundos = validade_segundos
+        self._lock = threading.Lock()
+        self.falhas_seguidas = 0
+        self.quarentena_ate = 0.0
+
+    def _descartar_antigas(self):
+        limite = time.monotonic() - self.validade_segundos
+        while self._chamadas and self._chamadas[0][0] < limite:
+            self._chamadas.popleft()
+
+    def registrar(self, segundos: float, sucesso: bool, falhas_para_quarentena: int, quarentena_segundos: float):
+        with self._lock:
+            self._chamadas.append((time.monotonic(), segundos, sucesso))
+            self.falhas_seguidas = 0 if sucesso else self.falhas_seguidas + 1
+            if self.falhas_seguidas >= falhas_para_quarentena:
+                self.quarentena_ate = time.monotonic() + quarentena_segundos
+                self.falhas_seguidas = 0
+
+    def _percentil(self, p: float) -> Optional[float]:
+        self._descartar_antigas()
+        latencias = sorted(segundos for _, segundos, sucesso in self._chamadas if sucesso)
+        if not latencias:
+            return None
+        return latencias[min(len(latencias) - 1, int(p * len(latencias)))]
+
+    @property
+    def p50(self) -> Optional[float]:
+        with self._lock:
+            return self._percentil(0.50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        with self._lock:
+            return self._percentil(0.95)
+
+    @property
+    def taxa_erro(self) -> float:
+        with self._lock:
+            self._descartar_antigas()
+            if not self._chamadas:
+                return 0.0
+            return sum(1 for _, _, sucesso in self._chamadas if not sucesso) / len(self._chamadas)
+
+    @property
+    def em_quarentena(self) -> bool:
+        with self._lock:
+            if self.quarentena_ate and time.monotonic() >= self.quarentena_ate:
+                # Fim da quarentena: o histórico de erros é esquecido e o provedor recebe nova chance
+                self.quarentena_ate = 0.0
+                self._chamadas.clear()
+            return bool(self.quarentena_ate)
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            self._descartar_antigas()
+            chamadas = len(self._chamadas)
+        return {
+            "chamadas_na_janela": chamadas,
+            "p50_s": self.p50,
+            "p95_s": self.p95,
+            "taxa_erro": round(self.taxa_erro, 3),
+            "em_quarentena": self.em_quarentena,
+        }
+
+
+class RoteadorLLM:
+
+    def __init__(
+        self,
+        rotas: Dict[str, List[str]],
+        obter_cliente: Callable[[str], Any] = obter_llm,
+        janela: int = 50,
+        validade_segundos: float = 300.0,
+        latencia_max_segundos: float = 20.0,
+        taxa_erro_max: float = 0.5,
+        falhas_para_quarentena: int = 3,
+        quarentena_segundos: float = 30.0,
+    ):
+        self.rotas = rotas
+        self.obter_cliente = obter_cliente
+        self.janela = janela
+        self.validade_segundos = validade_segundos
+        self.latencia_max_segundos = latencia_max_segundos
+        self.taxa_erro_max = taxa_erro_max
+        self.falhas_para_quarentena = falhas_para_quarentena
+        self.quarentena_segundos = quarentena_segundos
+        self._estatisticas: Dict[str, EstatisticasProvedor] = {}
+        self._lock = threading.Lock()
+
+    def estatisticas(self, provedor: str) -> EstatisticasProvedor:
+        with self._lock:
+            if provedor not in self._estatisticas:
+                self._estatisticas[provedor] = EstatisticasProvedor(self.janela, self.validade_segundos)
+            return self._estatisticas[provedor]
+
+    def _degradado(self, provedor: str) -> bool:
+        estatisticas = self.estatisticas(provedor)
+        p95 = estatisticas.p95
+        return estatisticas.taxa_erro > self.taxa_erro_max or (p95 is not None and p95 > self.latencia_max_segundos)
+
+    def ordem(self, tarefa: str) -> List[str]:
+        """
+        Provedores da tarefa na ordem em que serão tentados: saudáveis primeiro (na ordem configurada),
+        depois os degradados (lentos ou com muitos erros) e, por último, os em quarentena.
+        """
+        provedores = self.rotas.get(tarefa) or self.rotas["padrao"]
+
+        def prioridade(item):
+            posicao, provedor = item
+            return (self.estatisticas(provedor).em_quarentena, self._degradado(provedor), posicao)
+
+        return [provedor for _, provedor in sorted(enumerate(provedores), key=prioridade)]
+
+    def registrar(self, provedor: str, segundos: float, sucesso: bool):
+        self.estatisticas(provedor).registrar(
+            segundos, sucesso, self.falhas_para_quarentena, self.quarentena_segundos
+        )
+
+    def para(self, tarefa: str) -> "LLMComFailover":
+        """Cliente (Runnable) que encaminha as chamadas da tarefa com failover."""
+        return LLMComFailover(self, tarefa)
+
+    def resumo(self) -> Dict[str, Dict]:
+        with self._lock:
+            provedores = list(self._estatisticas)
+        return {provedor: self.estatisticas(provedor).resumo() for provedor in provedores}
+
+
+def _texto(valor) -> str:
+    """Texto de uma entrada/saída do LLM (str, PromptValue, mensagens, dict de variáveis ou objeto estruturado)."""
+    if isinstance(valor, str):
+        return valor
+    if hasattr(valor, "to_string"):
+        return valor.to_string()
+    if hasattr(valor, "content"):
+        return str(valor.content)
+    if isinstance(valor, (list, tuple)):
+        return "\n".join(_texto(v) for v in valor)
+    if isinstance(valor, dict):
+        return "\n".join(_texto(v) for v in valor.values())
+    if hasattr(valor, "model_dump_json"):
+        return valor.model_dump_json()
+    return str(valor)
+
+
+def _contar_tokens(registro: Span, tokens_prompt: int, resposta_texto: str, uso: Optional[Dict] = None):
+    # Usa a contagem do provedor quando ela vem na resposta; senão, a estimativa por caracteres
+    if uso:
+        registro.atributos["tokens_prompt"] = uso.get("input_tokens", 0)
+        registro.atributos["tokens_resposta"] = uso.get("output_tokens", 0)
+    else:
+        registro.atributos["tokens_prompt"] = tokens_prompt
+        registro.atributos["tokens_resposta"] = estimar_tokens(resposta_texto)
+    orcamento = orcamento_atual()
+    if orcamento is not None:
+        orcamento.registrar(registro.atributos.get("provedor"), registro.atributos["tokens_prompt"], registro.atributos["tokens_resposta"])
+
+
+class LLMComFailover(Runnable):
+    """
+    Se comporta como um chat model (invoke/stream/with_structured_output e composição com `|`),
+    mas cada chamada percorre os provedores da tarefa até uma delas dar certo.
+    """
+
+    def __init__(self, roteador: RoteadorLLM, tarefa: str, adaptar: Optional[Callable[[Any], Any]] = None):
+        self.roteador = roteador
+        self.tarefa = tarefa
+        # Transforma o cliente do provedor antes da chamada (ex.: with_structured_output)
+        self.adaptar = adaptar or (lambda cliente: cliente)
+
+    def _tentar(self, chamada: Callable[[Any], Any], registro: Span):
+        ultimo_erro = None
+        for provedor in self.roteador.ordem(self.tarefa):
+            inicio = time.perf_counter()
+            try:
+                resultado = chamada(self.adaptar(self.roteador.obter_cliente(provedor)))
+            except Exception as e:
+                self.roteador.registrar(provedor, time.perf_counter() - inicio, sucesso=False)
+                print(f"LLM '{provedor}' falhou na tarefa '{self.tarefa}' ({e}). Tentando o próximo provedor...")
+                ultimo_erro = e
+                continue
+            self.roteador.registrar(provedor, time.perf_counter() - inicio, sucesso=True)
+            registro.atributos["provedor"] = provedor
+            return resultado
+        raise RuntimeError(f"Todos os provedores falharam na tarefa '{self.tarefa}'.") from ultimo_erro
+
+    def provedor_preferido(self) -> Optional[str]:
+        """Provedor que receberá a próxima chamada, se nenhum falhar (o primeiro da ordem atual da tarefa)."""
+        ordem = self.roteador.ordem(self.tarefa)
+        return ordem[0] if ordem else None
+
+    def _verificar_orcamento(self, input) -> int:
+        """Estima os tokens do prompt e, se houver um orçamento aberto, recusa a chamada antes de enviá-la."""
+        tokens_prompt = estimar_tokens(_texto(input))
+        orcamento = orcamento_atual()
+        if orcamento is not None:
+            orcamento.verificar(tokens_prompt, self.provedor_preferido())
+        return tokens_prompt
+
+    def invoke(self, input, config=None, **kwargs):
+        # Cada chamada vira um span "llm.<tarefa>" com provedor e tokens de prompt/resposta
+        with span(f"llm.{self.tarefa}", tarefa=self.tarefa) as registro:
+            tokens_prompt = self._verificar_orcamento(input)
+            resultado = self._tentar(lambda cliente: cliente.invoke(input, config, **kwargs), registro)
+            _contar_tokens(registro, tokens_prompt, _texto(resultado), getattr(resultado, "usage_metadata", None))
+            return resultado
+
+    def stream(self, input, config=None, **kwargs) -> Iterator:
+        """O failover só acontece antes do primeiro trecho; depois disso um erro é repassado ao chamador."""
+        # O span é registrado ao fim do stream, não como bloco `with`: o gerador pode ser consumido em outra thread
+        registro = Span(f"llm.{self.tarefa}", {"tarefa": self.tarefa, "modo": "stream"})
+        tokens_prompt = self._verificar_orcamento(input)
+        inicio = time.perf_counter()
+        partes = []
+        try:
+            for trecho in self._stream(input, config, registro, **kwargs):
+                partes.append(_texto(trecho))
+                yield trecho
+        except Exception as e:
+            registro.erro = type(e).__name__
+            raise
+        finally:
+            registro.segundos = time.perf_counter() - inicio
+            _contar_tokens(registro, tokens_prompt, "".join(partes))
+            registrar_span(registro)
+
+    def _stream(self, input, config, registro: Span, **kwargs) -> Iterator:
+        ultimo_erro = None
+        for provedor in self.roteador.ordem(self.tarefa):
+            inicio = time.perf_counter()
+            iterador = None
+            try:
+                iterador = iter(self.adaptar(self.roteador.obter_cliente(provedor)).stream(input, config, **kwargs))
+                primeiro = next(iterador)
+            except StopIteration:
+                self.roteador.registrar(provedor, time.perf_counter() - inicio, sucesso=True)
+                return
+            except Exception as e:
+                self.roteador.registrar(provedor, time.perf_counter() - inicio, sucesso=False)
+                print(f"LLM '{provedor}' falhou na tarefa '{self.tarefa}' ({e}). Tentando o próximo provedor...")
+                ultimo_erro = e
+                continue
+            # A latência registrada é o tempo até o primeiro trecho
+            self.roteador.registrar(provedor, time.perf_counter() - inicio, sucesso=True)
+            registro.atributos["provedor"] = provedor
+            yield primeiro
+            yield from iterador
+            return
+        raise RuntimeError(f"Todos os provedores falharam na tarefa '{self.tarefa}'.") from ultimo_erro
+
+    def with_structured_output(self, schema, **kwargs) -> "LLMComFailover":
+        adaptar = self.adaptar
+        return LLMComFailover(
+            self.roteador, self.tarefa,
+            adaptar=lambda cliente: adaptar(cliente).with_structured_output(schema, **kwargs),
+        )
+
+
+def _rotas_configuradas() -> Dict[str, List[str]]:
+    return {tarefa: [p.strip() for p in provedores.split(",") if p.strip()] for tarefa, provedores in settings.LLM_ROTAS.items()}
+
+
+roteador = RoteadorLLM(
+    _rotas_configuradas(),
+    janela=settings.LLM_ROUTER_JANELA,
+    validade_segundos=settings.LLM_ROUTER_VALIDADE_S,
+    latencia_max_segundos=settings.LLM_ROUTER_LATENCIA_MAX_S,
+    taxa_erro_max=settings.LLM_ROUTER_TAXA_ERRO_MAX,
+    falhas_para_quarentena=settings.LLM_ROUTER_FALHAS_QUARENTENA,
+    quarentena_segundos=settings.LLM_ROUTER_QUARENTENA_S,
+)
+
+
+def llm_para(tarefa: str) -> LLMComFailover:
+    """Atalho para `roteador.para(tarefa)` usando as rotas de settings.LLM_ROTAS."""
+    return roteador.para(tarefa)
@@ -0,0 +1,113 @@
+# database.py
+from typing import AsyncIterator, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config import settings
+
+
+def _eh_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _eh_sqlite_em_memoria(url: str) -> bool:
+    url = make_url(url)
+    return _eh_sqlite(url) and (url.database in (None, "", ":memory:") or url.query.get("mode") == "memory")
+
+
+def _opcoes_engine(url: str) -> Dict:
+    """Opções de conexão e de pool de acordo com o banco configurado."""
+    if _eh_sqlite_em_memoria(url):
+        # Banco em memória: uma única conexão compartilhada (cada conexão nova seria um banco vazio),
+        # sem os parâmetros de tamanho de pool, que o SingletonThreadPool/StaticPool não aceitam
+        return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+    opcoes = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    if _eh_sqlite(url):
+        # A mesma conexão pode ser usada por threads diferentes do pool do FastAPI;
+        # `timeout` é o busy timeout do driver (em segundos)
+        opcoes["connect_args"] = {"check_same_thread": False, "timeout": settings.DB_BUSY_TIMEOUT_MS / 1000}
+    else:
+        opcoes["pool_pre_ping"] = True # Descarta conexões derrubadas pelo servidor
+        opcoes["pool_recycle"] = 1800
+    return opcoes
+
+
+def _configurar_sqlite(engine: Engine):
+    """
+    WAL permite leituras simultâneas a uma escrita; busy_timeout faz a conexão esperar
+    pelo lock em vez de falhar imediatamente; synchronous=NORMAL é seguro com WAL.
+    """
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def criar_engine(url: str = settings.DATABASE_URL) -> Engine:
+    engine = create_engine(url, **_opcoes_engine(url))
+    if _eh_sqlite(url):
+        _configurar_sqlite(engine)
+    return engine
+
+
+engine = criar_engine()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def get_db():
+    db_session = SessionLocal()
+    try:
+        yield db_session
+    finally:
+        db_session.close()
+
+
+# --- Variante assíncrona (rotas `async def`) ---
+# Criada no primeiro uso: depende de um driver assíncrono (aiosqlite, asyncpg...) instalado.
+
+_DRIVERS_ASSINCRONOS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "mysql": "mysql+aiomysql"}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def _url_assincrona(url: str) -> str:
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    url_obj = make_url(url)
+    driver = _DRIVERS_ASSINCRONOS.get(url_obj.get_backend_name())
+    if driver is None:
+        raise ValueError(f"Sem driver assíncrono conhecido para '{url_obj.drivername}'. Defina DATABASE_ASYNC_URL.")
+    return url_obj.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def obter_async_sessionmaker():
+    global _async_engine, _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = _url_assincrona(settings.DATABASE_URL)
+        opcoes = _opcoes_engine(url)
+        if _eh_sqlite(url):
+            opcoes["connect_args"].pop("check_same_thread")
+        _async_engine = create_async_engine(url, **opcoes)
+        if _eh_sqlite(url):
+            _configurar_sqlite(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncIterator:
+    async with obter_async_sessionmaker()() as db_session:
+        yield db_session
@@ -2,6 +2,7 @@
 
 import os
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from config import settings
 from models import create_db_tables
@@ -11,6 +12,7 @@ from api.v1.endpoints import brief_routes
 from api.v1.endpoints import data_routes
 from api.v1.endpoints import report_routes
 from auth.auth_routes import auth_router
+from src.observability.tracing import metricas
 
 load_dotenv(override=True)
 
@@ -37,4 +39,9 @@ app.include_router(report_routes.router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
-    return {"message": "Bem-vindo à AI Social Media Analysis API! Acesse /docs para a documentação interativa."}
\ No newline at end of file
+    return {"message": "Bem-vindo à AI Social Media Analysis API! Acesse /docs para a documentação interativa."}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Duração das etapas do pipeline e tokens do LLM no formato texto do Prometheus."""
+    return PlainTextResponse(metricas.exportar(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,59 @@
+# migrations.py
+"""
+Migrações versionadas do banco. Cada migração roda uma única vez e fica registrada na tabela
+`schema_migrations`; no startup só as pendentes são aplicadas, em vez de um `create_all` a cada boot.
+
+Para alterar o esquema, acrescente uma nova entrada ao fim de MIGRACOES (nunca edite uma já aplicada).
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Connection, Engine
+
+from models import Base
+
+
+class Migracao(NamedTuple):
+    versao: int
+    descricao: str
+    aplicar: Callable[[Connection], None]
+
+
+def _esquema_inicial(conexao: Connection):
+    # checkfirst: bancos criados antes das migrações já têm as tabelas
+    Base.metadata.create_all(bind=conexao, checkfirst=True)
+
+
+MIGRACOES: List[Migracao] = [
+    Migracao(1, "Esquema inicial (usuarios, pedidos, itens_pedidos)", _esquema_inicial),
+]
+
+
+def aplicar_migracoes(engine: Engine) -> List[int]:
+    """Aplica, em ordem e cada uma em sua transação, as migrações ainda não registradas. Retorna as versões aplicadas."""
+    with engine.begin() as conexao:
+        conexao.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "versao INTEGER PRIMARY KEY, descricao VARCHAR NOT NULL, aplicada_em VARCHAR NOT NULL)"
+        ))
+        aplicadas = {linha[0] for linha in conexao.execute(text("SELECT versao FROM schema_migrations"))}
+
+    novas = []
+    for migracao in sorted(MIGRACOES, key=lambda m: m.versao):
+        if migracao.versao in aplicadas:
+            continue
+        try:
+            with engine.begin() as conexao:
+                migracao.aplicar(conexao)
+                conexao.execute(
+                    text("INSERT INTO schema_migrations (versao, descricao, aplicada_em) VALUES (:versao, :descricao, :aplicada_em)"),
+                    {"versao": migracao.versao, "descricao": migracao.descricao, "aplicada_em": datetime.utcnow().isoformat()},
+                )
+        except IntegrityError:
+            # Outro processo (ex.: outro worker do uvicorn) aplicou a mesma migração primeiro; a transação foi desfeita
+            continue
+        print(f"Migração {migracao.versao} aplicada: {migracao.descricao}")
+        novas.append(migracao.versao)
+    return novas
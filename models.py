@@ -1,9 +1,10 @@
-from sqlalchemy import create_engine, Column, String, Integer, Boolean, Float, ForeignKey
-from sqlalchemy.orm import declarative_base, sessionmaker # Adicione sessionmaker
+from sqlalchemy import Column, String, Integer, Boolean, Float, ForeignKey
+from sqlalchemy.orm import declarative_base
 from sqlalchemy_utils.types import ChoiceType
+from database import engine, SessionLocal, get_db, get_async_db # Engine, pool e sessões configurados em database.py
 
-# Cria a conexão do seu Banco
-db = create_engine("sqlite:///banco.db")
+# Conexão do seu Banco (nome mantido por compatibilidade)
+db = engine
 
 # cria base do banco de dados
 Base = declarative_base()
@@ -67,17 +68,7 @@ class ItemPedido(Base):
         self.preco_unitario = preco_unitario
         self.pedido = pedido
 
-# Crie uma sessão do banco de dados (novo)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db)
-
-# Função para obter a sessão do banco de dados (novo)
-def get_db():
-    db_session = SessionLocal()
-    try:
-        yield db_session
-    finally:
-        db_session.close()
-
-# Crie as tabelas no banco de dados (novo - para ser chamado uma vez no startup)
+# Aplica as migrações pendentes (chamado no startup). Em um banco já atualizado é só uma consulta.
 def create_db_tables():
-    Base.metadata.create_all(bind=db)
\ No newline at end of file
+    from migrations import aplicar_migracoes
+    aplicar_migracoes(db)
\ No newline at end of file
@@ -70,6 +70,8 @@ def main():
     
     profile_df = engine.load_profiles_to_df(settings.PROFILE_PATH) 
     posts_df = engine.load_posts_to_df(settings.POST_PATH)
+    engine.update_hashtag_index(posts_df) # Coocorrência e tendências de hashtags, só para as publicações novas
+    engine.update_kpis(posts_df, profile_df) # KPIs em janelas móveis de 7/30/90 dias, idem
     profiles_posts_df = engine.load_join_profiles_posts(posts_df, profile_df)
 
     with open(settings.BRIEFING_JSON_PATH, 'w', encoding='utf-8') as arquivo_json:
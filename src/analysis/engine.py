@@ -1,13 +1,18 @@
 # src/analysis/engine.py
 
 import pandas as pd
+import hashlib
 import json
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Dict, List, TYPE_CHECKING
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_core.language_models.chat_models import BaseChatModel
+from config import settings
+from src.observability.tracing import rastrear
+from src.analysis import hashtags, kpis, ranking
+
+if TYPE_CHECKING: # Só para anotações: langchain_core é pesado para importar na inicialização da API
+    from langchain_core.language_models.chat_models import BaseChatModel
 
 # ================
 # Pydantic Schemas
@@ -70,7 +75,7 @@ class CalendarioEditorial(BaseModel):
 # Funções de Análise de Conteúdo
 # ==============================
 
-def parse_objetivos(briefing_text: str, llm: BaseChatModel) -> Objetivos:
+def parse_objetivos(briefing_text: str, llm: "BaseChatModel") -> Objetivos:
 
     structured_llm = llm.with_structured_output(Objetivos)
     prompt = f"""
@@ -100,7 +105,7 @@ def parse_objetivos(briefing_text: str, llm: BaseChatModel) -> Objetivos:
         print(f"Falha ao analisar o briefing: {e}") 
         return None 
 
-def parse_info_empresa(briefing_text: str, llm: BaseChatModel) -> InfoEmpresa:
+def parse_info_empresa(briefing_text: str, llm: "BaseChatModel") -> InfoEmpresa:
 
     structured_llm = llm.with_structured_output(InfoEmpresa)
     prompt = f"""
@@ -126,7 +131,7 @@ def parse_info_empresa(briefing_text: str, llm: BaseChatModel) -> InfoEmpresa:
         print(f"Falha ao analisar o briefing: {e}") 
         return None 
 
-def parse_publicos(briefing_text: str, llm: BaseChatModel) -> Publico:
+def parse_publicos(briefing_text: str, llm: "BaseChatModel") -> Publico:
 
     structured_llm = llm.with_structured_output(Publico)
 
@@ -159,7 +164,7 @@ def parse_publicos(briefing_text: str, llm: BaseChatModel) -> Publico:
         print(f"Falha ao analisar o briefing: {e}") 
         return Publico 
 
-def parse_pilares(briefing_text: str, llm: BaseChatModel, objetivos: dict, publico: dict) -> VetorDePilares:
+def parse_pilares(briefing_text: str, llm: "BaseChatModel", objetivos: dict, publico: dict) -> VetorDePilares:
 
     structured_llm = llm.with_structured_output(VetorDePilares)
     objetivos_dict = objetivos
@@ -192,7 +197,7 @@ def parse_pilares(briefing_text: str, llm: BaseChatModel, objetivos: dict, publi
         print(f"Falha ao analisar o briefing: {e}") 
         return None 
 
-def parse_analyses(analyses: dict, objetivos: dict, llm: BaseChatModel) -> VetorDePilares:
+def parse_analyses(analyses: dict, objetivos: dict, llm: "BaseChatModel") -> VetorDePilares:
 
     structured_llm = llm.with_structured_output(VetorDePilares)
     prompt = f"""
@@ -209,7 +214,7 @@ def parse_analyses(analyses: dict, objetivos: dict, llm: BaseChatModel) -> Vetor
         print(f"Falha ao analisar o briefing: {e}") 
         return None 
 
-def parse_posicionamento(objetivos: dict, publico: dict, llm: BaseChatModel) -> Posicionamento:
+def parse_posicionamento(objetivos: dict, publico: dict, llm: "BaseChatModel") -> Posicionamento:
     """
     Sintetiza um posicionamento de marca estratégico com base nos objetivos e no público-alvo definidos.
     """
@@ -248,7 +253,7 @@ def parse_posicionamento(objetivos: dict, publico: dict, llm: BaseChatModel) ->
         print(f"Falha ao gerar o posicionamento estratégico: {e}") 
         return None
 
-def parse_calendario_editorial(pilares: List[dict], objetivos: dict, publico: dict, llm: BaseChatModel) -> CalendarioEditorial:
+def parse_calendario_editorial(pilares: List[dict], objetivos: dict, publico: dict, llm: "BaseChatModel") -> CalendarioEditorial:
     """
     Gera uma sugestão de calendário editorial para uma semana com base nos pilares,
     objetivos e público-alvo definidos.
@@ -295,15 +300,21 @@ def parse_calendario_editorial(pilares: List[dict], objetivos: dict, publico: di
 # Funções Tratamento e Análise de Dados
 # =====================================
 
+# Nomes fixos em vez de day_name(locale='pt_BR.UTF-8'), que exige o locale instalado no sistema
+DIAS_DA_SEMANA = dict(enumerate(['Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira', 'Sexta-feira', 'Sábado', 'Domingo']))
+
+@rastrear("engine.load_profiles_to_df")
 def load_profiles_to_df(path: str) -> pd.DataFrame:
     return pd.read_json(path) 
 
+@rastrear("engine.load_posts_to_df")
 def load_posts_to_df(path: str) -> pd.DataFrame:
     df = pd.read_json(path)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df['TOTAL ENGAJAMENTO'] = df['likesCount'] + df['commentsCount']
     return df 
 
+@rastrear("engine.load_search_to_df")
 def load_search_to_df(path: str) -> pd.DataFrame:
     try:
         # Lê todo o conteúdo do arquivo
@@ -331,6 +342,7 @@ def load_search_to_df(path: str) -> pd.DataFrame:
     except Exception as e:
         print(f"Ocorreu um erro inesperado: {e}")
 
+@rastrear("engine.load_join_profiles_posts")
 def load_join_profiles_posts(original_posts_df: pd.DataFrame, original_profile_df: pd.DataFrame) -> pd.DataFrame:
         
     posts_df = original_posts_df.copy()
@@ -355,6 +367,7 @@ def load_join_profiles_posts(original_posts_df: pd.DataFrame, original_profile_d
         
     return df_profiles_posts
 
+@rastrear("engine.load_top_3_profiles")
 def load_top_3_profiles(posts_df: pd.DataFrame, profile_df: pd.DataFrame) -> List[pd.DataFrame]:
     """
     Identifica os 3 melhores perfis com base no número de seguidores
@@ -397,13 +410,14 @@ def load_top_3_profiles(posts_df: pd.DataFrame, profile_df: pd.DataFrame) -> Lis
 
     return [dados_pivot_count, dados_pivot_total, dados_pivot_likes, dados_pivot_comments]
 
+@rastrear("engine.load_periodo_dias")
 def load_periodo_dias(posts_df: pd.DataFrame, profile_df: pd.DataFrame) -> List[pd.DataFrame]:
 
     # 1. Garante que a coluna de data está no formato correto
     posts_df['DATA-HORA'] = pd.to_datetime(posts_df['timestamp'])
                 
     # 2. Extrai o nome do dia da semana em português
-    posts_df['DIA_DA_SEMANA'] = posts_df['DATA-HORA'].dt.day_name(locale='pt_BR.UTF-8')
+    posts_df['DIA_DA_SEMANA'] = posts_df['DATA-HORA'].dt.dayofweek.map(DIAS_DA_SEMANA)
     
     # 3. Extrai o período do dia (Manhã, Tarde, etc.)
     def get_periodo_do_dia(hour):
@@ -439,13 +453,14 @@ def load_periodo_dias(posts_df: pd.DataFrame, profile_df: pd.DataFrame) -> List[
     
     return [periodo_df, dias_df]
 
+@rastrear("engine.load_pivot_periodo_dias")
 def load_pivot_periodo_dias(posts_df: pd.DataFrame, profile_df: pd.DataFrame) -> List[pd.DataFrame]:
 
     # Converte a coluna 'timestamp' para o formato datetime
     posts_df['DATA-HORA'] = pd.to_datetime(posts_df['timestamp'])
                 
-    # Usamos .dt.day_name() para obter o nome completo do dia da semana em português
-    posts_df['DIA_DA_SEMANA'] = posts_df['DATA-HORA'].dt.day_name(locale='pt_BR.UTF-8')
+    # Nome completo do dia da semana em português (ver DIAS_DA_SEMANA)
+    posts_df['DIA_DA_SEMANA'] = posts_df['DATA-HORA'].dt.dayofweek.map(DIAS_DA_SEMANA)
 
     # --- Extraindo o Período do Dia ---
 
@@ -516,30 +531,119 @@ def calculate_kpis(profile_df: pd.DataFrame, posts_df: pd.DataFrame) -> pd.DataF
     kpi_df = kpi_df.round(2) 
     return kpi_df 
 
-def analyze_content_strategy_for_user(posts_df: pd.DataFrame, username: str, llm: BaseChatModel) -> ContentStrategyAnalysis:
+# ========================================
+# Índice de Hashtags (src/analysis/hashtags.py)
+# ========================================
 
-    user_posts = posts_df[posts_df['ownerUsername'] == username] 
-    top_captions = user_posts.nlargest(10, 'likesCount')['caption'].dropna().tolist() 
+@rastrear("engine.update_hashtag_index")
+def update_hashtag_index(posts_df: pd.DataFrame) -> int:
+    """Indexa as publicações novas de `posts_df` (coocorrência e frequência por período). Devolve quantas entraram."""
+    return hashtags.atualizar_indice(posts_df)
 
-    if not top_captions:
-        return ContentStrategyAnalysis(content_pillars=[], tone_of_voice="N/A", summary="Dados insuficientes para análise.") 
+def get_top_hashtag_pairs(top: int = 10, min_posts: int = None) -> pd.DataFrame:
+    return hashtags.indice_atual().pares(top, min_posts)
 
-    captions_text = "\n".join(f"- {c}" for c in top_captions) 
-    structured_llm = llm.with_structured_output(ContentStrategyAnalysis) 
+def get_hashtag_cooccurrences(hashtag: str, top: int = 10) -> pd.DataFrame:
+    return hashtags.indice_atual().coocorrentes(hashtag, top)
 
-    prompt = f"""
+def get_rising_hashtags(periods: int = 4, top: int = 10, min_posts: int = None) -> pd.DataFrame:
+    return hashtags.indice_atual().tendencias(periods, top, min_posts)
+
+def get_hashtag_trend(hashtag_list: List[str]) -> pd.DataFrame:
+    return hashtags.indice_atual().frequencia_por_periodo(hashtag_list)
+
+# ========================================
+# KPIs em Janelas Móveis (src/analysis/kpis.py)
+# ========================================
+
+@rastrear("engine.update_kpis")
+def update_kpis(posts_df: pd.DataFrame, profile_df: pd.DataFrame = None) -> int:
+    """Soma as publicações de `posts_df` (e os seguidores de `profile_df`) ao motor de KPIs. Devolve quantas eram novas."""
+    return kpis.atualizar_motor(posts_df, profile_df)
+
+def get_rolling_kpis(windows: List[int] = kpis.JANELAS, until=None) -> pd.DataFrame:
+    return kpis.motor_atual().kpis(windows, until)
+
+def get_profile_kpis(username: str, window: int = 30, until=None) -> dict:
+    return kpis.motor_atual().kpis_do_perfil(username, window, until)
+
+def get_kpis_by_type() -> pd.DataFrame:
+    return kpis.motor_atual().kpis_por_tipo()
+
+_estrategias: "OrderedDict[str, ContentStrategyAnalysis]" = OrderedDict() # hash(perfil, legendas) -> análise
+_estrategias_lock = threading.Lock()
+
+def _analise_vazia(motivo: str, tom: str = "N/A") -> ContentStrategyAnalysis:
+    return ContentStrategyAnalysis(pilares=[], descricao=motivo, tom=tom, resumo=motivo)
+
+def _chave_estrategia(username: str, captions: List[str]) -> str:
+    return hashlib.sha1("\x1f".join([username] + captions).encode("utf-8")).hexdigest()
+
+def _prompt_estrategia(username: str, captions: List[str]) -> str:
+    captions_text = "\n".join(f"- {c}" for c in captions) 
+    return f"""
     Persona: Você é um estrategista de marketing de mídias sociais sênior. 
     Contexto: Analise as seguintes legendas do perfil do Instagram '{username}':\n{captions_text} 
     Tarefa: Identifique os 3-5 principais pilares de conteúdo e descreva o tom de voz da marca. 
     Formato: Responda apenas com o objeto JSON. 
     """
-    try:
-        return structured_llm.invoke(prompt) 
-    except Exception as e:
-        print(f"Falha na análise de conteúdo para {username}: {e}") 
-        return ContentStrategyAnalysis(
-               pilares=[],
-               descricao="Erro na análise",
-               tom="Erro na análise",
-               resumo="Erro na análise"
-              )
\ No newline at end of file
+
+def _top_captions(indice_perfis: ranking.IndicePerfis, usernames: List[str], n: int = 10) -> Dict[str, List[str]]:
+    """Legendas das `n` publicações mais curtidas de cada perfil, lendo só as posições de cada um no índice."""
+    return {username: indice_perfis.top(username, 'likesCount', n)['caption'].dropna().tolist() for username in usernames}
+
+@rastrear("engine.analyze_content_strategy_batch")
+def analyze_content_strategy_batch(posts_df: pd.DataFrame, usernames: List[str], llm: "BaseChatModel",
+                                   max_concurrency: int = None,
+                                   indice_perfis: ranking.IndicePerfis = None) -> Dict[str, ContentStrategyAnalysis]:
+    """
+    Estratégia de conteúdo de vários perfis: as legendas saem do índice de publicações por perfil (montado uma
+    vez; passe `indice_perfis` para reaproveitá-lo entre chamadas) e as chamadas ao LLM rodam em paralelo (até
+    `max_concurrency`, padrão settings.ESTRATEGIA_CONCORRENCIA).
+    Análises ficam em cache por (perfil, legendas); falhas voltam como análises vazias e não entram no cache.
+    """
+    usernames = list(dict.fromkeys(usernames))
+    captions_por_perfil = _top_captions(indice_perfis or ranking.IndicePerfis(posts_df), usernames)
+
+    resultados, pendentes = {}, []
+    with _estrategias_lock:
+        for username in usernames:
+            captions = captions_por_perfil[username]
+            if not captions:
+                resultados[username] = _analise_vazia("Dados insuficientes para análise.")
+                continue
+            chave = _chave_estrategia(username, captions)
+            if chave in _estrategias:
+                _estrategias.move_to_end(chave)
+                resultados[username] = _estrategias[chave].model_copy(deep=True)
+            else:
+                pendentes.append((username, chave, captions))
+
+    if pendentes:
+        # Runnable.batch: pool de threads limitado por max_concurrency, propagando o rastreio e o orçamento atuais
+        respostas = llm.with_structured_output(ContentStrategyAnalysis).batch(
+            [_prompt_estrategia(username, captions) for username, _, captions in pendentes],
+            config={"max_concurrency": max_concurrency or settings.ESTRATEGIA_CONCORRENCIA},
+            return_exceptions=True,
+        )
+        for (username, chave, _), resposta in zip(pendentes, respostas):
+            if isinstance(resposta, dict): # Alguns provedores devolvem o JSON sem validar
+                try:
+                    resposta = ContentStrategyAnalysis.model_validate(resposta)
+                except Exception as e:
+                    resposta = e
+            if isinstance(resposta, ContentStrategyAnalysis):
+                resultados[username] = resposta
+                with _estrategias_lock:
+                    _estrategias[chave] = resposta.model_copy(deep=True)
+                    while len(_estrategias) > settings.ESTRATEGIA_CACHE_MAX_ITENS:
+                        _estrategias.popitem(last=False)
+            else:
+                print(f"Falha na análise de conteúdo para {username}: {resposta}") 
+                resultados[username] = _analise_vazia("Erro na análise", tom="Erro na análise")
+
+    return {username: resultados[username] for username in usernames}
+
+def analyze_content_strategy_for_user(posts_df: pd.DataFrame, username: str, llm: "BaseChatModel",
+                                      indice_perfis: ranking.IndicePerfis = None) -> ContentStrategyAnalysis:
+    return analyze_content_strategy_batch(posts_df, [username], llm, indice_perfis=indice_perfis)[username]
@@ -0,0 +1,341 @@
+# src/analysis/hashtags.py
+"""
+Frequência de hashtags das publicações (coluna `hashtags` do post_data.json: uma lista por post) e nuvem de palavras.
+
+A contagem é feita pelo pandas (`explode` + `value_counts`), sem laços em Python por hashtag. A normalização
+(minúsculas, sem "#" e sem acentos: "#Café" e "cafe" contam juntas) é aplicada só às hashtags distintas,
+depois da contagem, e as frequências vão direto para `WordCloud.generate_from_frequencies`, sem montar um
+texto gigante para o WordCloud tokenizar de novo.
+
+Resultados ficam em cache por conjunto de dados: a chave é um hash das contagens brutas, então o mesmo
+posts_df (ou uma cópia dele) reaproveita a normalização e a imagem da nuvem, que é a etapa mais cara.
+
+`IndiceHashtags` guarda, em matrizes esparsas, quantas publicações usam cada par de hashtags e o engajamento
+(TOTAL ENGAJAMENTO) somado delas, além da contagem por hashtag em cada período (semana, por padrão). O índice
+cresce a cada extração (`atualizar_indice`, só os posts ainda não indexados), fica salvo em
+settings.HASHTAGS_INDICE_PATH e responde às consultas (pares, hashtags que aparecem juntas, tendências) sem
+reprocessar os posts. As funções `*_hashtag_*` de src/analysis/engine.py expõem essas consultas.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from src.utils.persistencia import codificar, gravar_npz_atomico
+
+_cache: "OrderedDict[Tuple, object]" = OrderedDict() # (tipo, hash das contagens, parâmetros) -> resultado
+_lock = threading.Lock()
+
+
+def normalizar(hashtags: pd.Series) -> pd.Series:
+    """Minúsculas, sem "#" nem espaços nas pontas e sem acentos (marcas combinantes após NFKD)."""
+    return (hashtags.astype(str).str.strip().str.lstrip("#").str.lower()
+            .str.normalize("NFKD").str.replace("[\u0300-\u036f]", "", regex=True))
+
+
+def _contagens_brutas(posts_df: pd.DataFrame, coluna: str) -> pd.Series:
+    serie = posts_df[coluna]
+    listas = serie[[isinstance(valor, list) for valor in serie]] # Posts sem hashtags vêm com NaN
+    return listas.explode().dropna().value_counts(sort=False)
+
+
+def _chave(contagens: pd.Series) -> str:
+    return hashlib.sha1(pd.util.hash_pandas_object(contagens, index=True).values.tobytes()).hexdigest()
+
+
+def _em_cache(chave: Tuple, calcular):
+    with _lock:
+        if chave in _cache:
+            _cache.move_to_end(chave)
+            return _cache[chave]
+    valor = calcular()
+    with _lock:
+        _cache[chave] = valor
+        while len(_cache) > settings.HASHTAGS_CACHE_MAX_ITENS:
+            _cache.popitem(last=False)
+    return valor
+
+
+def frequencias(posts_df: pd.DataFrame, coluna: str = "hashtags") -> pd.Series:
+    """Quantidade de posts por hashtag normalizada, em ordem decrescente (índice "hashtag", valores "count")."""
+    brutas = _contagens_brutas(posts_df, coluna)
+    return _frequencias(brutas, _chave(brutas)).copy()
+
+
+def _frequencias(brutas: pd.Series, chave: str) -> pd.Series:
+    def calcular():
+        contagens = pd.Series(brutas.to_numpy(), index=normalizar(brutas.index.to_series()).to_numpy())
+        contagens = contagens[contagens.index != ""]
+        resultado = contagens.groupby(level=0, sort=False).sum().sort_values(ascending=False, kind="stable")
+        resultado.index.name = "hashtag"
+        return resultado.rename("count")
+
+    return _em_cache(("frequencias", chave), calcular)
+
+
+def nuvem_de_palavras(posts_df: pd.DataFrame, coluna: str = "hashtags", largura: int = 800, altura: int = 400,
+                      max_palavras: int = 200) -> Tuple[np.ndarray, pd.Series]:
+    """(imagem RGB da nuvem de palavras, frequências). A imagem é calculada uma vez por conjunto de dados."""
+    brutas = _contagens_brutas(posts_df, coluna)
+    chave = _chave(brutas)
+    contagens = _frequencias(brutas, chave)
+
+    def desenhar():
+        if contagens.empty:
+            return np.full((altura, largura, 3), 255, dtype=np.uint8)
+        from wordcloud import WordCloud # Importado sob demanda: só o relatório de concorrentes usa
+
+        nuvem = WordCloud(width=largura, height=altura, background_color="white", max_words=max_palavras)
+        nuvem.generate_from_frequencies(contagens.head(max_palavras).to_dict())
+        return nuvem.to_array()
+
+    return _em_cache(("nuvem", chave, largura, altura, max_palavras), desenhar), contagens.copy()
+
+
+# --- Índice de coocorrência e tendências ---
+
+_MATRIZES = ("coocorrencias", "engajamento", "posts_por_periodo", "engajamento_por_periodo")
+
+
+def _crescer(matriz, formato: Tuple[int, int], dtype):
+    from scipy import sparse
+
+    if matriz is None:
+        return sparse.csr_matrix(formato, dtype=dtype)
+    matriz = matriz.tocsr()
+    matriz.resize(formato)
+    return matriz
+
+
+class IndiceHashtags:
+    """
+    Coocorrência de hashtags e frequência por período, atualizados incrementalmente.
+
+    coocorrencias[i, j]            publicações com as hashtags i e j (na diagonal: publicações com a hashtag i)
+    engajamento[i, j]              soma do TOTAL ENGAJAMENTO dessas publicações
+    posts_por_periodo[p, i]        publicações com a hashtag i no período p
+    engajamento_por_periodo[p, i]  soma do engajamento delas
+    """
+
+    def __init__(self, periodo: Optional[str] = None):
+        self.periodo = periodo or settings.HASHTAGS_INDICE_PERIODO # Frequência do pandas: "W", "D", "M"...
+        self.hashtags: List[str] = []
+        self.periodos: List[str] = [] # Início de cada período (AAAA-MM-DD), na ordem em que apareceram
+        self.posts_indexados = set()
+        self._posicao: Dict[str, int] = {}
+        self._posicao_periodo: Dict[str, int] = {}
+        self._consultas: Dict[Tuple, pd.DataFrame] = {} # Resultados das consultas; zerado a cada `adicionar`
+        self._lock = threading.Lock()
+        for nome in _MATRIZES:
+            setattr(self, nome, None)
+
+    def adicionar(self, posts_df: pd.DataFrame) -> int:
+        """Indexa as publicações de `posts_df` que ainda não estão no índice (pelo `id`). Devolve quantas entraram."""
+        from scipy import sparse
+
+        coluna_id = "id" if "id" in posts_df.columns else "shortCode"
+        ids = posts_df[coluna_id].astype(str).to_numpy(dtype=object)
+        with self._lock:
+            # Consulta direta ao set: o Series.isin das strings (pyarrow) converte o set inteiro a cada chamada
+            ineditos = np.fromiter((i not in self.posts_indexados for i in ids), dtype=bool, count=len(ids))
+            ineditos &= ~pd.Series(ids).duplicated().to_numpy()
+            if not ineditos.any():
+                return 0
+            novos = posts_df.loc[ineditos].reset_index(drop=True)
+            ids_novos = ids[ineditos]
+
+            if "TOTAL ENGAJAMENTO" in novos.columns:
+                engajamento = novos["TOTAL ENGAJAMENTO"]
+            else:
+                engajamento = novos["likesCount"] + novos["commentsCount"]
+            engajamento = pd.to_numeric(engajamento, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+
+            # Publicação x hashtag (1 se a publicação usa a hashtag), normalizando só as hashtags distintas
+            serie = novos["hashtags"]
+            explodida = serie[[isinstance(valor, list) for valor in serie]].explode().dropna()
+            codigos, distintas = pd.factorize(explodida.astype(str))
+            tags = normalizar(pd.Series(distintas)).to_numpy()[codigos] if len(distintas) else np.array([], dtype=object)
+            validas = tags != ""
+            linhas = explodida.index.to_numpy()[validas]
+            colunas = codificar(tags[validas], self._posicao, self.hashtags)
+            total_tags = len(self.hashtags)
+            incidencia = sparse.csr_matrix((np.ones(len(linhas)), (linhas, colunas)), shape=(len(novos), total_tags))
+            incidencia.sum_duplicates()
+            incidencia.data[:] = 1 # "#Café" e "#cafe" na mesma publicação contam uma vez
+
+            # Publicação x período
+            datas = pd.to_datetime(novos["timestamp"], utc=True, errors="coerce").dt.tz_convert(None)
+            com_data = datas.notna().to_numpy()
+            inicio_periodo = datas[com_data].dt.to_period(self.periodo).dt.start_time.dt.strftime("%Y-%m-%d").to_numpy()
+            colunas_periodo = codificar(inicio_periodo, self._posicao_periodo, self.periodos)
+            periodos = sparse.csr_matrix(
+                (np.ones(len(colunas_periodo)), (np.flatnonzero(com_data), colunas_periodo)),
+                shape=(len(novos), len(self.periodos)))
+
+            ponderada = sparse.diags(engajamento) @ incidencia
+            incrementos = {
+                "coocorrencias": (incidencia.T @ incidencia, (total_tags, total_tags), np.int64),
+                "engajamento": (incidencia.T @ ponderada, (total_tags, total_tags), np.float64),
+                "posts_por_periodo": (periodos.T @ incidencia, (len(self.periodos), total_tags), np.int64),
+                "engajamento_por_periodo": (periodos.T @ ponderada, (len(self.periodos), total_tags), np.float64),
+            }
+            for nome, (incremento, formato, dtype) in incrementos.items():
+                matriz = _crescer(getattr(self, nome), formato, dtype)
+                setattr(self, nome, (matriz + incremento.astype(dtype)).tocsr())
+
+            self.posts_indexados.update(ids_novos)
+            self._consultas.clear()
+            return len(novos)
+
+    def _em_cache(self, chave: Tuple, calcular) -> pd.DataFrame:
+        with self._lock:
+            if chave not in self._consultas:
+                self._consultas[chave] = calcular()
+            return self._consultas[chave].copy()
+
+    def coocorrentes(self, hashtag: str, top: int = 10) -> pd.DataFrame:
+        """Hashtags que mais aparecem junto com `hashtag`, com o engajamento médio dessas publicações."""
+        chave = normalizar(pd.Series([hashtag])).iloc[0]
+
+        def calcular():
+            i = self._posicao.get(chave)
+            if i is None:
+                return pd.DataFrame(columns=["hashtag", "posts", "engajamento_medio"])
+            linha = self.coocorrencias.getrow(i).tocoo()
+            outras = linha.col != i
+            colunas, posts = linha.col[outras], linha.data[outras]
+            engajamento = np.asarray(self.engajamento[np.full(len(colunas), i), colunas]).ravel()
+            resultado = pd.DataFrame({
+                "hashtag": np.asarray(self.hashtags, dtype=object)[colunas],
+                "posts": posts,
+                "engajamento_medio": engajamento / posts,
+            })
+            return resultado.nlargest(top, ["posts", "engajamento_medio"]).reset_index(drop=True)
+
+        return self._em_cache(("coocorrentes", chave, top), calcular)
+
+    def pares(self, top: int = 10, min_posts: Optional[int] = None) -> pd.DataFrame:
+        """Pares de hashtags com maior engajamento médio, entre os usados juntos em pelo menos `min_posts` publicações."""
+        from scipy import sparse
+
+        min_posts = min_posts or settings.HASHTAGS_MIN_POSTS
+
+        def calcular():
+            pares = sparse.triu(self.coocorrencias, k=1).tocoo() if self.coocorrencias is not None else None
+            if pares is None or pares.nnz == 0:
+                return pd.DataFrame(columns=["hashtag_1", "hashtag_2", "posts", "engajamento_medio"])
+            frequentes = pares.data >= min_posts
+            linhas, colunas, posts = pares.row[frequentes], pares.col[frequentes], pares.data[frequentes]
+            engajamento = np.asarray(self.engajamento[linhas, colunas]).ravel()
+            nomes = np.asarray(self.hashtags, dtype=object)
+            resultado = pd.DataFrame({
+                "hashtag_1": nomes[linhas],
+                "hashtag_2": nomes[colunas],
+                "posts": posts,
+                "engajamento_medio": engajamento / np.maximum(posts, 1),
+            })
+            return resultado.nlargest(top, ["engajamento_medio", "posts"]).reset_index(drop=True)
+
+        return self._em_cache(("pares", top, min_posts), calcular)
+
+    def tendencias(self, periodos: int = 4, top: int = 10, min_posts: Optional[int] = None) -> pd.DataFrame:
+        """
+        Hashtags em alta: publicações nos últimos `periodos` períodos contra os `periodos` anteriores
+        (crescimento = (recentes + 1) / (anteriores + 1)), entre as com pelo menos `min_posts` publicações recentes.
+        """
+        min_posts = min_posts or settings.HASHTAGS_MIN_POSTS
+
+        def calcular():
+            colunas = ["hashtag", "posts_recentes", "posts_anteriores", "crescimento", "engajamento_medio"]
+            if not self.periodos:
+                return pd.DataFrame(columns=colunas)
+            ordem = np.argsort(self.periodos) # "AAAA-MM-DD" ordena como data
+            recentes, anteriores = ordem[-periodos:], ordem[-2 * periodos:-periodos]
+            posts_recentes = np.asarray(self.posts_por_periodo[recentes].sum(axis=0)).ravel()
+            posts_anteriores = np.asarray(self.posts_por_periodo[anteriores].sum(axis=0)).ravel()
+            engajamento = np.asarray(self.engajamento_por_periodo[recentes].sum(axis=0)).ravel()
+            resultado = pd.DataFrame({
+                "hashtag": self.hashtags,
+                "posts_recentes": posts_recentes,
+                "posts_anteriores": posts_anteriores,
+                "crescimento": (posts_recentes + 1) / (posts_anteriores + 1),
+                "engajamento_medio": engajamento / np.maximum(posts_recentes, 1),
+            }, columns=colunas)
+            resultado = resultado[resultado["posts_recentes"] >= min_posts]
+            return resultado.nlargest(top, ["crescimento", "posts_recentes"]).reset_index(drop=True)
+
+        return self._em_cache(("tendencias", periodos, top, min_posts), calcular)
+
+    def frequencia_por_periodo(self, hashtags: List[str]) -> pd.DataFrame:
+        """Publicações por período (linhas, em ordem cronológica) para cada uma das `hashtags` (colunas)."""
+        nomes = list(normalizar(pd.Series(hashtags, dtype=object)))
+        posicoes = [self._posicao.get(nome) for nome in nomes]
+        ordem = np.argsort(self.periodos)
+        dados = {nome: (np.asarray(self.posts_por_periodo[ordem][:, [i]].todense()).ravel() if i is not None
+                        else np.zeros(len(ordem), dtype=np.int64))
+                 for nome, i in zip(nomes, posicoes)}
+        return pd.DataFrame(dados, index=pd.Index(np.asarray(self.periodos, dtype=object)[ordem], name="periodo"))
+
+    def salvar(self, caminho=None) -> str:
+        """Grava o índice (matrizes CSR e vocabulário) num .npz, de forma atômica."""
+        caminho = str(caminho or settings.HASHTAGS_INDICE_PATH)
+        with self._lock:
+            dados = {
+                "periodo": np.array(self.periodo),
+                "hashtags": np.array(self.hashtags, dtype=str),
+                "periodos": np.array(self.periodos, dtype=str),
+                "posts_indexados": np.array(sorted(self.posts_indexados), dtype=str),
+            }
+            for nome in _MATRIZES:
+                matriz = getattr(self, nome)
+                if matriz is not None:
+                    dados.update({f"{nome}_data": matriz.data, f"{nome}_indices": matriz.indices,
+                                  f"{nome}_indptr": matriz.indptr, f"{nome}_formato": np.array(matriz.shape)})
+            gravar_npz_atomico(caminho, **dados)
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho=None) -> "IndiceHashtags":
+        from scipy import sparse
+
+        with np.load(str(caminho or settings.HASHTAGS_INDICE_PATH)) as dados:
+            indice = cls(periodo=str(dados["periodo"]))
+            indice.hashtags = dados["hashtags"].tolist()
+            indice.periodos = dados["periodos"].tolist()
+            indice.posts_indexados = set(dados["posts_indexados"].tolist())
+            indice._posicao = {hashtag: i for i, hashtag in enumerate(indice.hashtags)}
+            indice._posicao_periodo = {periodo: i for i, periodo in enumerate(indice.periodos)}
+            for nome in _MATRIZES:
+                if f"{nome}_data" in dados:
+                    setattr(indice, nome, sparse.csr_matrix(
+                        (dados[f"{nome}_data"], dados[f"{nome}_indices"], dados[f"{nome}_indptr"]),
+                        shape=tuple(dados[f"{nome}_formato"])))
+        return indice
+
+
+_indice: Optional[IndiceHashtags] = None
+_lock_indice = threading.Lock()
+
+
+def indice_atual() -> IndiceHashtags:
+    """Índice do processo, carregado de settings.HASHTAGS_INDICE_PATH na primeira chamada (vazio se não existir)."""
+    global _indice
+    with _lock_indice:
+        if _indice is None:
+            caminho = str(settings.HASHTAGS_INDICE_PATH)
+            _indice = IndiceHashtags.carregar(caminho) if os.path.exists(caminho) else IndiceHashtags()
+        return _indice
+
+
+def atualizar_indice(posts_df: pd.DataFrame) -> int:
+    """Acrescenta ao índice as publicações novas de `posts_df` e o salva. Devolve quantas foram indexadas."""
+    indice = indice_atual()
+    novos = indice.adicionar(posts_df)
+    if novos:
+        indice.salvar()
+    return novos
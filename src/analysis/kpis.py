@@ -0,0 +1,295 @@
+# src/analysis/kpis.py
+"""
+KPIs por perfil em janelas móveis (7/30/90 dias) e por tipo de publicação, mantidos incrementalmente.
+
+`MotorKPIs` guarda, para cada perfil, a contagem de publicações, a soma do engajamento (curtidas + comentários)
+e a soma dos quadrados:
+
+- por dia, nos últimos settings.KPIS_HORIZONTE_DIAS dias (a janela desliza quando chegam dias novos);
+- por tipo de publicação (Image, Video, Sidecar), em todo o histórico.
+
+Uma nova extração só soma as publicações recebidas (O(novas)); publicações já vistas entram com a diferença do
+engajamento (curtidas crescem entre uma extração e outra). As consultas usam somas prefixadas ao longo dos
+dias, refeitas uma vez após cada atualização: o total de uma janela é a diferença de duas posições, O(1) por
+perfil, e daí saem média, taxa de engajamento, cadência e desvio padrão (E[x²] - E[x]²).
+
+O motor fica salvo em settings.KPIS_PATH e as funções `*_kpi*` de src/analysis/engine.py o expõem.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from src.utils.persistencia import codificar, gravar_npz_atomico
+
+JANELAS = (7, 30, 90)
+
+
+def _dias(timestamps: pd.Series) -> np.ndarray:
+    """Dias desde 1970-01-01 (UTC); datas inválidas viram -1."""
+    datas = pd.to_datetime(timestamps, utc=True, errors="coerce").dt.tz_convert(None)
+    dias = datas.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    return np.where(datas.isna().to_numpy(), -1, dias.astype(np.int64))
+
+
+def _dia(data) -> int:
+    return int(np.datetime64(pd.Timestamp(data).date(), "D").astype(np.int64))
+
+
+class MotorKPIs:
+    """Agregados por perfil (contagem, soma e soma dos quadrados do engajamento) por dia e por tipo."""
+
+    def __init__(self, horizonte_dias: Optional[int] = None):
+        self.horizonte = horizonte_dias or settings.KPIS_HORIZONTE_DIAS
+        self.perfis: List[str] = []
+        self.tipos: List[str] = []
+        self.ultimo_dia: Optional[int] = None # Dia mais recente com publicação; última coluna do eixo diário
+        self.seguidores = np.zeros(0)
+        self._posicao_perfil: Dict[str, int] = {}
+        self._posicao_tipo: Dict[str, int] = {}
+        # [contagem, soma, soma dos quadrados] x perfis x (dias | tipos)
+        self._diario = np.zeros((3, 0, self.horizonte))
+        self._por_tipo = np.zeros((3, 0, 0))
+        self._primeiro_dia = np.zeros(0, dtype=np.int64)
+        self._ultimo_dia_perfil = np.zeros(0, dtype=np.int64)
+        self._prefixos: Optional[np.ndarray] = None # Somas prefixadas de _diario; None = refazer na próxima consulta
+        # Registro de cada publicação já contada, para aplicar só a diferença quando ela volta numa extração
+        self._linha_post: Dict[str, int] = {}
+        self._registro = np.zeros((0, 4)) # perfil, tipo, dia, engajamento
+        self._registrados = 0
+        self._lock = threading.Lock()
+
+    # --- Atualização ---
+
+    def _crescer(self):
+        """Acompanha perfis e tipos novos nas matrizes."""
+        perfis, tipos = len(self.perfis), len(self.tipos)
+        faltam_perfis = perfis - self._diario.shape[1]
+        if faltam_perfis:
+            self._diario = np.pad(self._diario, ((0, 0), (0, faltam_perfis), (0, 0)))
+            self.seguidores = np.pad(self.seguidores, (0, faltam_perfis), constant_values=np.nan)
+            self._primeiro_dia = np.pad(self._primeiro_dia, (0, faltam_perfis), constant_values=np.iinfo(np.int64).max)
+            self._ultimo_dia_perfil = np.pad(self._ultimo_dia_perfil, (0, faltam_perfis), constant_values=-1)
+        self._por_tipo = np.pad(self._por_tipo, ((0, 0), (0, perfis - self._por_tipo.shape[1]),
+                                                 (0, tipos - self._por_tipo.shape[2])))
+
+    def _deslizar(self, novo_ultimo_dia: int):
+        """Avança o eixo diário até `novo_ultimo_dia`; os dias que saem do horizonte ficam só no total por tipo."""
+        if self.ultimo_dia is not None and novo_ultimo_dia <= self.ultimo_dia:
+            return
+        deslocamento = self.horizonte if self.ultimo_dia is None else novo_ultimo_dia - self.ultimo_dia
+        if deslocamento >= self.horizonte:
+            self._diario[:] = 0
+        else:
+            self._diario = np.concatenate(
+                [self._diario[:, :, deslocamento:], np.zeros(self._diario.shape[:2] + (deslocamento,))], axis=2)
+        self.ultimo_dia = novo_ultimo_dia
+
+    def _aplicar(self, perfil: np.ndarray, tipo: np.ndarray, dia: np.ndarray, engajamento: np.ndarray, sinal: int):
+        valores = sinal * np.stack([np.ones_like(engajamento), engajamento, engajamento ** 2])
+        np.add.at(self._por_tipo, (slice(None), perfil, tipo), valores)
+        coluna = dia - (self.ultimo_dia - self.horizonte + 1)
+        no_horizonte = (dia >= 0) & (coluna >= 0)
+        np.add.at(self._diario, (slice(None), perfil[no_horizonte], coluna[no_horizonte]), valores[:, no_horizonte])
+
+    def _registrar(self, linhas: np.ndarray, dados: np.ndarray):
+        """Grava as publicações no registro (capacidade dobrada quando precisa, para crescer em O(novas))."""
+        necessario = self._registrados + int((linhas < 0).sum())
+        if necessario > len(self._registro):
+            capacidade = max(necessario, 2 * len(self._registro), 1024)
+            self._registro = np.concatenate([self._registro, np.zeros((capacidade - len(self._registro), 4))])
+        novas = linhas < 0
+        linhas = linhas.copy()
+        linhas[novas] = np.arange(self._registrados, self._registrados + novas.sum())
+        self._registro[linhas] = dados
+        self._registrados += int(novas.sum())
+        return linhas
+
+    def adicionar(self, posts_df: pd.DataFrame) -> int:
+        """
+        Soma as publicações de `posts_df` aos agregados: as novas entram inteiras, as já contadas (mesmo `id`)
+        entram com a diferença de engajamento. Devolve quantas publicações novas foram contadas.
+        """
+        if posts_df.empty:
+            return 0
+        coluna_id = "id" if "id" in posts_df.columns else "shortCode"
+        posts = posts_df.assign(_id=posts_df[coluna_id].astype(str)).drop_duplicates("_id", keep="last")
+        if "TOTAL ENGAJAMENTO" in posts.columns:
+            engajamento = posts["TOTAL ENGAJAMENTO"]
+        else:
+            engajamento = posts["likesCount"] + posts["commentsCount"]
+        engajamento = pd.to_numeric(engajamento, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        ids = posts["_id"].to_numpy(dtype=object)
+        dias = _dias(posts["timestamp"])
+        tipos_post = posts["type"].fillna("Desconhecido").astype(str).to_numpy(dtype=object) if "type" in posts.columns \
+            else np.full(len(posts), "Desconhecido", dtype=object)
+
+        with self._lock:
+            perfil = codificar(posts["ownerUsername"].astype(str).to_numpy(dtype=object), self._posicao_perfil, self.perfis)
+            tipo = codificar(tipos_post, self._posicao_tipo, self.tipos)
+            self._crescer()
+            if (dias >= 0).any():
+                self._deslizar(int(dias.max()))
+
+            linhas = np.fromiter((self._linha_post.get(i, -1) for i in ids), dtype=np.int64, count=len(ids))
+            existentes = linhas >= 0
+            if existentes.any(): # Retira a contribuição anterior das publicações que voltaram
+                anterior = self._registro[linhas[existentes]]
+                self._aplicar(anterior[:, 0].astype(np.int64), anterior[:, 1].astype(np.int64),
+                              anterior[:, 2].astype(np.int64), anterior[:, 3], -1)
+            self._aplicar(perfil, tipo, dias, engajamento, +1)
+
+            com_data = dias >= 0
+            np.minimum.at(self._primeiro_dia, perfil[com_data], dias[com_data])
+            np.maximum.at(self._ultimo_dia_perfil, perfil[com_data], dias[com_data])
+
+            linhas = self._registrar(linhas, np.column_stack([perfil, tipo, dias, engajamento]))
+            self._linha_post.update(zip(ids[~existentes], linhas[~existentes].tolist()))
+            self._prefixos = None
+            return int((~existentes).sum())
+
+    def atualizar_seguidores(self, profile_df: pd.DataFrame):
+        """Seguidores atuais de cada perfil (denominador da taxa de engajamento)."""
+        with self._lock:
+            perfil = codificar(profile_df["username"].astype(str).to_numpy(dtype=object), self._posicao_perfil, self.perfis)
+            self._crescer()
+            self.seguidores[perfil] = pd.to_numeric(profile_df["followersCount"], errors="coerce").to_numpy(dtype=np.float64)
+
+    # --- Consultas ---
+
+    def _somas_janela(self, dias: int, ate=None) -> np.ndarray:
+        """
+        [contagem, soma, soma dos quadrados] x perfis nos `dias` dias que terminam em `ate`. Sem `ate`, ou com uma
+        data posterior à publicação mais recente, a janela termina no último dia com publicação.
+        """
+        if self.ultimo_dia is None:
+            return np.zeros((3, len(self.perfis)))
+        if self._prefixos is None:
+            self._prefixos = np.concatenate([np.zeros(self._diario.shape[:2] + (1,)), np.cumsum(self._diario, axis=2)], axis=2)
+        dia_final = self.ultimo_dia if ate is None else min(_dia(ate), self.ultimo_dia)
+        fim = self.horizonte - (self.ultimo_dia - dia_final) # Exclusivo
+        inicio = fim - dias
+        if inicio < 0:
+            raise ValueError(f"Janela de {dias} dias até {ate} fora dos {self.horizonte} dias mantidos (KPIS_HORIZONTE_DIAS).")
+        return self._prefixos[:, :, fim] - self._prefixos[:, :, inicio]
+
+    def _metricas(self, somas: np.ndarray, dias: int, seguidores: np.ndarray) -> Dict[str, np.ndarray]:
+        contagem, soma, quadrados = somas
+        with np.errstate(divide="ignore", invalid="ignore"):
+            media = np.where(contagem > 0, soma / contagem, np.nan)
+            variancia = np.where(contagem > 0, np.maximum(quadrados / contagem - media ** 2, 0), np.nan)
+            taxa = np.where(seguidores > 0, media / seguidores * 100, np.nan)
+        return {
+            "posts": contagem.astype(np.int64),
+            "engajamento_medio": media,
+            "desvio_engajamento": np.sqrt(variancia),
+            "taxa_engajamento": taxa, # % sobre os seguidores atuais, como em engine.calculate_kpis
+            "posts_por_semana": contagem / dias * 7,
+        }
+
+    def kpis_do_perfil(self, username: str, dias: int = 30, ate=None) -> Dict[str, float]:
+        """KPIs de um perfil numa janela; O(1) depois da primeira consulta após uma atualização."""
+        with self._lock:
+            i = self._posicao_perfil.get(username)
+            if i is None:
+                raise KeyError(f"Perfil '{username}' sem publicações indexadas.")
+            somas = self._somas_janela(dias, ate)[:, i:i + 1]
+            metricas = self._metricas(somas, dias, self.seguidores[i:i + 1])
+        return {nome: valores[0].item() for nome, valores in metricas.items()}
+
+    def kpis(self, janelas: Sequence[int] = JANELAS, ate=None) -> pd.DataFrame:
+        """Uma linha por perfil, com as métricas de cada janela (sufixo _7d, _30d...) e recência/frequência."""
+        with self._lock:
+            colunas = {"seguidores": self.seguidores.copy()}
+            for dias in janelas:
+                for nome, valores in self._metricas(self._somas_janela(dias, ate), dias, self.seguidores).items():
+                    colunas[f"{nome}_{dias}d"] = valores
+            colunas.update(self._recencia_frequencia())
+            return pd.DataFrame(colunas, index=pd.Index(self.perfis, name="username"))
+
+    def _recencia_frequencia(self) -> Dict[str, np.ndarray]:
+        # RECENCIA/FREQUENCIA de engine.load_join_profiles_posts, sem reler os posts (em dias de calendário)
+        total = self._por_tipo[0].sum(axis=1)
+        com_posts = self._ultimo_dia_perfil >= 0
+        ultimo_geral = self._ultimo_dia_perfil[com_posts].max() if com_posts.any() else 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recencia = np.where(com_posts, 1 / (ultimo_geral - self._ultimo_dia_perfil + 1), np.nan)
+            frequencia = np.where(com_posts, total / (self._ultimo_dia_perfil - self._primeiro_dia + 1), np.nan)
+        return {"RECENCIA": recencia, "FREQUENCIA": frequencia}
+
+    def kpis_por_tipo(self) -> pd.DataFrame:
+        """Publicações, engajamento médio e desvio por perfil e tipo de publicação, em todo o histórico."""
+        with self._lock:
+            perfis, tipos = np.nonzero(self._por_tipo[0] > 0)
+            contagem, soma, quadrados = self._por_tipo[:, perfis, tipos]
+            media = soma / contagem
+            return pd.DataFrame({
+                "username": np.asarray(self.perfis, dtype=object)[perfis],
+                "type": np.asarray(self.tipos, dtype=object)[tipos],
+                "posts": contagem.astype(np.int64),
+                "engajamento_medio": media,
+                "desvio_engajamento": np.sqrt(np.maximum(quadrados / contagem - media ** 2, 0)),
+            })
+
+    # --- Persistência ---
+
+    def salvar(self, caminho=None) -> str:
+        """Grava o registro das publicações (os agregados são refeitos a partir dele ao carregar)."""
+        caminho = str(caminho or settings.KPIS_PATH)
+        with self._lock:
+            ids = np.empty(self._registrados, dtype=object)
+            for post_id, linha in self._linha_post.items():
+                ids[linha] = post_id
+            gravar_npz_atomico(caminho, horizonte=np.array(self.horizonte), perfis=np.array(self.perfis, dtype=str),
+                               tipos=np.array(self.tipos, dtype=str), seguidores=self.seguidores,
+                               ids=ids.astype(str), registro=self._registro[:self._registrados])
+        return caminho
+
+    @classmethod
+    def carregar(cls, caminho=None) -> "MotorKPIs":
+        with np.load(str(caminho or settings.KPIS_PATH)) as dados:
+            motor = cls(horizonte_dias=int(dados["horizonte"]))
+            motor.perfis = dados["perfis"].tolist()
+            motor.tipos = dados["tipos"].tolist()
+            motor._posicao_perfil = {perfil: i for i, perfil in enumerate(motor.perfis)}
+            motor._posicao_tipo = {tipo: i for i, tipo in enumerate(motor.tipos)}
+            motor._crescer()
+            motor.seguidores = dados["seguidores"]
+            registro, ids = dados["registro"], dados["ids"].tolist()
+        if len(registro):
+            perfil, tipo, dia = (registro[:, k].astype(np.int64) for k in range(3))
+            motor._deslizar(int(dia.max()))
+            motor._aplicar(perfil, tipo, dia, registro[:, 3], +1)
+            com_data = dia >= 0
+            np.minimum.at(motor._primeiro_dia, perfil[com_data], dia[com_data])
+            np.maximum.at(motor._ultimo_dia_perfil, perfil[com_data], dia[com_data])
+            motor._registro, motor._registrados = registro.copy(), len(registro)
+            motor._linha_post = {post_id: i for i, post_id in enumerate(ids)}
+        return motor
+
+
+_motor: Optional[MotorKPIs] = None
+_lock_motor = threading.Lock()
+
+
+def motor_atual() -> MotorKPIs:
+    """Motor do processo, carregado de settings.KPIS_PATH na primeira chamada (vazio se não existir)."""
+    global _motor
+    with _lock_motor:
+        if _motor is None:
+            caminho = str(settings.KPIS_PATH)
+            _motor = MotorKPIs.carregar(caminho) if os.path.exists(caminho) else MotorKPIs()
+        return _motor
+
+
+def atualizar_motor(posts_df: pd.DataFrame, profile_df: Optional[pd.DataFrame] = None) -> int:
+    """Soma as publicações (e os seguidores de `profile_df`) ao motor e o salva. Devolve quantas eram novas."""
+    motor = motor_atual()
+    novas = motor.adicionar(posts_df)
+    if profile_df is not None and not profile_df.empty:
+        motor.atualizar_seguidores(profile_df)
+    motor.salvar()
+    return novas
@@ -0,0 +1,86 @@
+# src/analysis/ranking.py
+"""
+Rankings (top N) de perfis e publicações sem ordenar o DataFrame inteiro a cada pergunta.
+
+`ranking(df, chave, colunas, agregacao)` agrega `df` por `chave` uma única vez (ex.: soma por perfil) e guarda
+cada coluna como um array do numpy; `Ranking.top` escolhe os N maiores com `np.argpartition` (O(n)) e ordena
+só esses N. Quem faz várias perguntas sobre a mesma tabela (as figuras com o top 10 de colunas diferentes)
+guarda o `Ranking` e agrega uma vez só.
+
+`IndicePerfis` guarda as posições das publicações de cada perfil (`groupby(...).indices`), montadas uma vez;
+as consultas por perfil leem só essas posições em vez de varrer o posts_df inteiro a cada usuário.
+
+Não há cache entre chamadas: quem chama mantém o `Ranking`/`IndicePerfis` durante uma execução. Um DataFrame
+alterado no lugar daria resultados desatualizados, e conferir o conteúdo (hash) custaria mais que refazer tudo.
+"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _array(serie: pd.Series) -> np.ndarray:
+    if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in "if":
+        return serie.to_numpy()
+    return serie.to_numpy(dtype=float, na_value=np.nan) # Anuláveis (Int64, Float64), object e sem sinal (`-valores` daria a volta)
+
+
+class Ranking:
+    """Valores agregados por `chave`, um array por coluna, para consultas de top N."""
+
+    def __init__(self, agregado: pd.DataFrame, chave: str):
+        self.chave = chave
+        self.chaves = agregado.index.to_numpy()
+        self._valores = {coluna: _array(agregado[coluna]) for coluna in agregado.columns}
+
+    def top(self, coluna: str, n: int = 10) -> pd.DataFrame:
+        """
+        Os `n` maiores valores de `coluna` (ignorando vazios) em ordem crescente, como
+        `groupby(chave)[coluna].agg().sort_values().dropna().tail(n).reset_index()`.
+        """
+        valores = self._valores[coluna]
+        posicoes = np.flatnonzero(~np.isnan(valores)) if valores.dtype.kind == "f" else np.arange(len(valores))
+        if len(posicoes) > n:
+            posicoes = posicoes[np.argpartition(valores[posicoes], len(posicoes) - n)[-n:]]
+        posicoes = posicoes[np.argsort(valores[posicoes], kind="stable")]
+        return pd.DataFrame({self.chave: self.chaves[posicoes], coluna: valores[posicoes]})
+
+
+def ranking(df: pd.DataFrame, chave: str, colunas: Sequence[str], agregacao: str = "sum") -> Ranking:
+    """`Ranking` de `colunas` agregadas ("sum" ou "max") por `chave`."""
+    colunas = list(colunas)
+    if df[chave].is_unique:
+        # Uma linha por chave (ex.: perfis): a agregação seria a própria linha
+        agregado = df.set_index(chave)[colunas]
+        if agregacao == "sum":
+            agregado = agregado.fillna(0) # Como no groupby: soma de um grupo vazio é 0
+    else:
+        agregado = df.groupby(chave, sort=False)[colunas].agg(agregacao)
+    return Ranking(agregado, chave)
+
+
+class IndicePerfis:
+    """Posições das publicações de cada perfil em `posts_df`; válido enquanto `posts_df` não for alterado."""
+
+    def __init__(self, posts_df: pd.DataFrame, coluna: str = "ownerUsername"):
+        self.posts_df = posts_df
+        self._posicoes: Dict[str, np.ndarray] = posts_df.groupby(coluna, sort=False).indices
+        self._valores: Dict[str, np.ndarray] = {} # Colunas já convertidas para array, por nome
+
+    def posicoes(self, username: str) -> np.ndarray:
+        return self._posicoes.get(username, np.array([], dtype=np.int64))
+
+    def posts(self, username: str) -> pd.DataFrame:
+        return self.posts_df.iloc[self.posicoes(username)]
+
+    def top(self, username: str, coluna: str, n: int = 10, colunas: List[str] = None) -> pd.DataFrame:
+        """As `n` publicações de `username` com maior `coluna` (ordem decrescente, como `nlargest`)."""
+        if coluna not in self._valores:
+            self._valores[coluna] = _array(self.posts_df[coluna])
+        posicoes = self.posicoes(username)
+        valores = self._valores[coluna][posicoes]
+        if valores.dtype.kind == "f":
+            posicoes, valores = posicoes[~np.isnan(valores)], valores[~np.isnan(valores)]
+        # Ordenação estável do maior para o menor: empates na ordem original, como nlargest(keep="first")
+        top = self.posts_df.iloc[posicoes[np.argsort(-valores, kind="stable")[:n]]]
+        return top[colunas] if colunas else top
@@ -2,15 +2,21 @@
 
 import os
 import json
-from typing import List, Dict, Union, Optional
+import unicodedata
+from typing import Iterator, List, Dict, Union, Optional
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 from langchain_core.runnables import RunnablePassthrough
 # REMOVIDO: from langchain_core.output_parsers import JsonOutputParser # Não será usado para a resposta do LLM diretamente
 from pydantic.v1 import BaseModel, Field # MANTIDO: Usando pydantic.v1 para BaseModel e Field
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.language_models.chat_models import BaseChatModel
 from config import settings # Para acessar o LLM e caminhos de salvamento
+from config.llm_router import llm_para
 from src.analysis import engine # Para as funções parse_objetivos, etc.
+from src.chatbot.chat_journal import ChatJournal
+from src.utils.persistencia import gravar_json_atomico
+from src.chatbot.context_window import JanelaDeContexto
+from src.chatbot.briefing_extractor import ExtratorIncrementalBriefing
 
 # --- 1. Definir os modelos de saída para o briefing (Pydantic V1) ---
 # Essas classes são usadas para validar e estruturar a saída do LLM (se houver, no compile_full_briefing)
@@ -89,6 +95,7 @@ class BriefingState(BaseModel):
 
     # Controle de fluxo do chatbot
     current_question_index: int = 0
+    aguardando_elaboracao: bool = False # True quando o bot pediu para o usuário detalhar a última resposta
     briefing_questions = [
         "Qual é o nome da sua empresa?", # 0
         "Em poucas palavras, o que a sua empresa faz e qual problema ela resolve?", # 1
@@ -116,69 +123,170 @@ class BriefingState(BaseModel):
     ]
 
     def is_briefing_complete(self) -> bool:
-        """Verifica se o índice da pergunta atual atingiu ou ultrapassou o número total de perguntas."""
-        return self.current_question_index >= len(self.briefing_questions)
+        """
+        Verifica se todas as perguntas foram respondidas. O índice conta as perguntas já feitas,
+        então a última resposta chega com o índice igual ao total de perguntas.
+        """
+        return self.current_question_index > len(self.briefing_questions)
+
+    def pergunta_pendente(self) -> Optional[str]:
+        """Última pergunta feita pelo bot e ainda não respondida (o índice conta as perguntas já feitas)."""
+        indice = self.current_question_index - 1
+        if 0 <= indice < len(self.briefing_questions):
+            return self.briefing_questions[indice]
+        return None
+
+# Campo do BriefingState preenchido por cada pergunta, na ordem de briefing_questions
+CAMPOS_PERGUNTAS = [
+    "nome_empresa", "o_que_faz", "valores_personalidade", "percepcao_desejada", "produtos_servicos",
+    "produtos_promover", "concorrentes", "cliente_ideal_geral", "cliente_idade", "cliente_genero",
+    "cliente_localizacao", "cliente_interesses", "cliente_renda", "cliente_dores_necessidades_desejos",
+    "objetivo_principal_social", "metas_especificas", "resultado_justificar_investimento",
+    "redes_sociais_ativas", "tipo_conteudo_desejado", "tom_de_voz_desejado", "assunto_evitar",
+    "material_marketing", "informacao_extra",
+]
+
+# Blocos temáticos do roteiro: empresa, público, objetivos e conteúdo
+BLOCOS_PERGUNTAS = [range(0, 7), range(7, 14), range(14, 17), range(17, 23)]
+
+def campos_relevantes(state: BriefingState, indice_pergunta: int) -> Dict[str, str]:
+    """Retorna só os campos já respondidos do mesmo bloco temático da pergunta indicada."""
+    bloco = next((b for b in BLOCOS_PERGUNTAS if indice_pergunta in b), range(0))
+    campos = {}
+    for i in bloco:
+        valor = getattr(state, CAMPOS_PERGUNTAS[i], None)
+        if valor:
+            campos[CAMPOS_PERGUNTAS[i]] = valor
+    if state.nome_empresa and "nome_empresa" not in campos:
+        campos["nome_empresa"] = state.nome_empresa
+    return campos
+
+# Perguntas do roteiro para as quais "sim"/"não" é uma resposta completa
+PERGUNTAS_SIM_NAO = {15, 20, 21, 22}
+
+RESPOSTAS_VAGAS = {
+    "nao sei", "sei la", "talvez", "depende", "tanto faz", "qualquer", "qualquer um",
+    "ok", "hmm", "hm", "?", "...", "-", "n/a",
+}
+# Completas só nas PERGUNTAS_SIM_NAO (ex.: "nenhum" assunto a evitar); vagas nas demais
+RESPOSTAS_SIM_NAO = {"sim", "nao", "s", "n", "nada", "nenhum", "nenhuma"}
+
+def resposta_ambigua(resposta: str, indice_pergunta: int) -> bool:
+    """
+    Verificação barata (sem LLM) da qualidade da resposta. Só as respostas vazias, vagas,
+    um "sim"/"não"/"nenhum" solto para uma pergunta aberta ou uma pergunta de volta ao bot
+    disparam a chamada ao LLM para pedir elaboração.
+    """
+    texto = unicodedata.normalize("NFKD", resposta.strip().lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).strip(" .!")
+    if not texto or texto in RESPOSTAS_VAGAS:
+        return True
+    if texto in RESPOSTAS_SIM_NAO:
+        return indice_pergunta not in PERGUNTAS_SIM_NAO
+    return texto.endswith("?") and len(texto.split()) <= 12
 
 class ChatbotHandler:
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, session_id: str):
+    def __init__(self, llm: BaseChatModel, session_id: str):
         
         self.llm = llm
         self.session_id = session_id
         self.briefing_file_path = os.path.join(settings.PROCESSED_DATA_PATH, f"briefing_chat_state_{session_id}.json")
         self.chat_history_file_path = os.path.join(settings.CHAT_HISTORY_PATH, f"chat_history_{session_id}.json")
+        self.journal_file_path = os.path.join(settings.CHAT_HISTORY_PATH, f"chat_journal_{session_id}.jsonl")
 
+        # `seq` do último registro do diário já contido em cada snapshot (ver ChatJournal)
+        self._seq_estado = 0
+        self._seq_historico = 0
         self.briefing_state: BriefingState = self._load_briefing_state()
         self.chat_history: List[BaseMessage] = self._load_chat_history()
 
+        # Diário append-only: cada turno grava só o que mudou. Os snapshots acima
+        # são reescritos apenas na compactação.
+        self.journal = ChatJournal(
+            self.journal_file_path,
+            fsync_a_cada=settings.CHAT_JOURNAL_FSYNC_A_CADA,
+            compactar_a_cada=settings.CHAT_JOURNAL_COMPACTAR_A_CADA,
+            seq_inicial=max(self._seq_estado, self._seq_historico),
+        )
+        self._replay_journal()
+        self._estado_persistido: Dict = self.briefing_state.dict()
+        self._mensagens_persistidas: int = len(self.chat_history)
+
+        # Extração incremental do briefing (engine.parse_*) enquanto a conversa acontece
+        self.extrator = ExtratorIncrementalBriefing(llm=llm_para("extracao"))
+
         # self.parser = JsonOutputParser(pydantic_object=BriefingState) # Não usaremos mais diretamente na chain
 
-        # PROMPT PARA GERAR A PRÓXIMA PERGUNTA (texto simples)
+        # Janela de contexto limitada: últimos turnos na íntegra + resumo dos anteriores
+        self.janela_contexto = JanelaDeContexto(
+            max_tokens=settings.CHAT_CONTEXTO_MAX_TOKENS,
+            turnos_verbatim=settings.CHAT_CONTEXTO_TURNOS_VERBATIM,
+        )
+
+        # PROMPT USADO APENAS QUANDO A RESPOSTA PRECISA DE ELABORAÇÃO (texto simples).
+        # A próxima pergunta do roteiro é servida direto pela máquina de estados, sem LLM.
         self.prompt = ChatPromptTemplate(
             messages=[
                 ("system", """Você é um assistente de briefing de social media. Seu objetivo é guiar o usuário pelas perguntas de briefing, uma por vez.
-                Sua resposta deve ser SOMENTE a próxima pergunta na sequência do briefing ou a mensagem de conclusão.
-                Não adicione comentários extras ou formatações. Apenas a pergunta ou a mensagem final.
-                Se a resposta do usuário para a PERGUNTA ANTERIOR for ambígua, peça para ele elaborar antes de fazer a próxima pergunta.
-                As perguntas devem ser feitas na seguinte ordem:
-                {briefing_questions_list}
+                A resposta do usuário para a pergunta abaixo foi curta ou ambígua. Peça, de forma simpática e em no máximo duas frases, que ele elabore a resposta.
+                Não adicione comentários extras ou formatações. Não avance para outras perguntas.
+                Pergunta em aberto: {pergunta_pendente}
 
                 ---
-                Considere o histórico da conversa e o estado atual do briefing para formular a próxima pergunta.
-                Estado atual do briefing (para sua referência, não retorne JSON na sua resposta): {briefing_state_json}
+                Resumo da conversa até aqui: {resumo_conversa}
+                Respostas já coletadas sobre este tema (para sua referência, não retorne JSON na sua resposta): {briefing_state_json}
                 ---
                 """),
                 MessagesPlaceholder(variable_name="chat_history"),
-                ("user", "{input_message}") # input_message é a resposta do usuário à pergunta anterior
+                ("user", "{input_message}") # input_message é a resposta do usuário à pergunta em aberto
             ],
-            # partial_variables não é mais necessário aqui, pois o parser não está na chain final
         )
 
         self.chain = (
             RunnablePassthrough.assign(
-                briefing_questions_list=lambda x: "\n".join([f"{i+1}. {q}" for i, q in enumerate(self.briefing_state.briefing_questions)]),
-                briefing_state_json=lambda x: self.briefing_state.json() # CORREÇÃO: Usando .json()
+                pergunta_pendente=lambda x: self.briefing_state.pergunta_pendente() or "Nenhuma",
+                briefing_state_json=lambda x: json.dumps(
+                    campos_relevantes(self.briefing_state, self.briefing_state.current_question_index - 1),
+                    ensure_ascii=False,
+                ),
             )
             | self.prompt
             | self.llm # CORREÇÃO: A chain termina no LLM, que retorna APENAS TEXTO
-            # REMOVIDO: | self.parser # JsonOutputParser não está mais aqui
         )
 
+    def _montar_contexto(self) -> Dict:
+        """Monta o histórico limitado por orçamento de tokens (sem a última mensagem do usuário, que vai em input_message)."""
+        resumo, recentes = self.janela_contexto.montar(self.chat_history[:-1])
+        return {"resumo_conversa": resumo or "Nenhum", "chat_history": recentes}
+
     def _load_briefing_state(self) -> BriefingState:
         if os.path.exists(self.briefing_file_path):
             with open(self.briefing_file_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+                self._seq_estado = data.pop("seq_diario", 0)
                 return BriefingState(**data)
         return BriefingState()
 
     def _save_briefing_state(self):
-        with open(self.briefing_file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.briefing_state.dict(), f, indent=4, ensure_ascii=False) # CORREÇÃO: Usando .dict()
+        """Registra no diário apenas os campos do estado que mudaram desde a última gravação."""
+        estado_atual = self.briefing_state.dict()
+        campos_alterados = {
+            campo: valor for campo, valor in estado_atual.items()
+            if self._estado_persistido.get(campo) != valor
+        }
+        if campos_alterados:
+            self.journal.registrar({"tipo": "estado", "campos": campos_alterados})
+            self._estado_persistido = estado_atual
+        self._compactar_se_necessario()
 
     def _load_chat_history(self) -> List[BaseMessage]:
         if os.path.exists(self.chat_history_file_path):
             with open(self.chat_history_file_path, 'r', encoding='utf-8') as f:
                 raw_history = json.load(f)
+                if isinstance(raw_history, dict): # {"seq_diario", "mensagens"}; snapshots antigos são só a lista
+                    self._seq_historico = raw_history.get("seq_diario", 0)
+                    raw_history = raw_history["mensagens"]
                 history = []
                 for msg in raw_history:
                     if msg['type'] == 'human':
@@ -189,11 +297,42 @@ class ChatbotHandler:
         return []
 
     def _save_chat_history(self):
-        serializable_history = []
-        for msg in self.chat_history:
-            serializable_history.append({"type": msg.type, "content": msg.content})
-        with open(self.chat_history_file_path, 'w', encoding='utf-8') as f:
-            json.dump(serializable_history, f, indent=4, ensure_ascii=False)
+        """Acrescenta ao diário somente as mensagens ainda não persistidas."""
+        for msg in self.chat_history[self._mensagens_persistidas:]:
+            self.journal.registrar({"tipo": "mensagem", "type": msg.type, "content": msg.content})
+        self._mensagens_persistidas = len(self.chat_history)
+        self._compactar_se_necessario()
+
+    def _replay_journal(self):
+        """
+        Reaplica sobre os snapshots os registros do diário (recuperação após queda), pulando os que cada
+        snapshot já contém: a queda pode ter ocorrido depois de gravá-lo e antes de truncar o diário.
+        """
+        for registro in self.journal.ler():
+            seq = registro.get("seq", 0) # Registros anteriores à numeração: sempre reaplicados
+            if registro.get("tipo") == "estado" and (not seq or seq > self._seq_estado):
+                dados = self.briefing_state.dict()
+                dados.update(registro.get("campos", {}))
+                self.briefing_state = BriefingState(**dados)
+            elif registro.get("tipo") == "mensagem" and (not seq or seq > self._seq_historico):
+                if registro.get("type") == "human":
+                    self.chat_history.append(HumanMessage(content=registro["content"]))
+                elif registro.get("type") == "ai":
+                    self.chat_history.append(AIMessage(content=registro["content"]))
+
+    def _compactar_se_necessario(self):
+        if self.journal.precisa_compactar():
+            self.compactar()
+
+    def compactar(self):
+        """Reescreve os snapshots de estado e histórico, cada um com o `seq` do diário que já contém, e esvazia o diário."""
+        self._seq_estado = self._seq_historico = self.journal.ultimo_seq
+        gravar_json_atomico(self.briefing_file_path, {**self.briefing_state.dict(), "seq_diario": self._seq_estado})
+        gravar_json_atomico(self.chat_history_file_path, {
+            "seq_diario": self._seq_historico,
+            "mensagens": [{"type": msg.type, "content": msg.content} for msg in self.chat_history[:self._mensagens_persistidas]],
+        })
+        self.journal.truncar()
 
     def get_initial_greeting(self) -> str:
         # CORREÇÃO: A primeira mensagem real virá do process_message após o "Olá" do usuário
@@ -206,6 +345,26 @@ class ChatbotHandler:
             return "O briefing já está completo. Posso agora processar os relatórios com base nas suas respostas?"
 
     def process_message(self, user_message: str) -> Dict[str, Union[str, bool, Dict]]:
+        resultado = {}
+        for evento in self.stream_message(user_message):
+            if evento["evento"] == "fim":
+                resultado = evento
+        return {
+            "response": resultado["response"],
+            "chat_history": [{"role": m.type, "content": m.content} for m in self.chat_history],
+            "briefing_complete": resultado["briefing_complete"],
+            "extracted_briefing": resultado["extracted_briefing"],
+        }
+
+    def stream_message(self, user_message: str) -> Iterator[Dict]:
+        """
+        Processa a mensagem do usuário emitindo eventos à medida que a resposta é produzida:
+        - {"evento": "token", "conteudo": ...} para cada trecho da resposta (um único trecho
+          quando a pergunta vem do roteiro, vários quando o LLM pede elaboração);
+        - {"evento": "fim", "response", "mensagens", "briefing_complete", "extracted_briefing"} ao final,
+          onde `mensagens` traz apenas as mensagens novas deste turno (com seus ids).
+        """
+        primeira_nova = len(self.chat_history)
         # Adiciona a mensagem do usuário ao histórico
         self.chat_history.append(HumanMessage(content=user_message))
 
@@ -213,30 +372,45 @@ class ChatbotHandler:
         extracted_briefing_data = {} # Será preenchido se o briefing for completo
 
         try:
-            # 1. ATUALIZA o BriefingState com a resposta do usuário à PERGUNTA ANTERIOR
+            # 1. ATUALIZA o BriefingState com a resposta do usuário à PERGUNTA PENDENTE
             # O 'user_message' é a resposta para a pergunta que o bot fez no turno anterior.
             self._update_briefing_state_from_user_response(user_message)
 
-            # 2. Incrementa o índice da pergunta, pois a pergunta anterior foi "respondida"
-            # (Mesmo que o LLM peça elaboração, avançamos o índice para manter o fluxo simples.
-            # O LLM será instruído a repetir a pergunta se precisar de elaboração).
-            if not self.briefing_state.is_briefing_complete():
-                self.briefing_state.current_question_index += 1
-            self._save_briefing_state() # Salva o estado atualizado imediatamente
-
-            # 3. CHAMA o LLM para GERAR a PRÓXIMA PERGUNTA (texto simples) ou a mensagem final
-            llm_response = self.chain.invoke({ # chain agora retorna TEXTO diretamente
-                "input_message": user_message, # A última resposta do usuário para contexto
-                "chat_history": self.chat_history, # Histórico completo da conversa
-            })
-            # O retorno do invoke deve ser uma Content (string) do LLM
-            ai_response = str(llm_response.content) if hasattr(llm_response, 'content') else str(llm_response)
-
-            # 4. Verifica se o briefing está completo após o avanço do índice
+            indice_respondido = self.briefing_state.current_question_index - 1
+            precisa_elaborar = (
+                indice_respondido >= 0
+                and not self.briefing_state.aguardando_elaboracao # No máximo um pedido de elaboração por pergunta
+                and resposta_ambigua(user_message, indice_respondido)
+            )
+
+            if precisa_elaborar:
+                # 2a. Caminho lento: o LLM pede elaboração e o índice NÃO avança.
+                # A próxima resposta complementa o mesmo campo.
+                self.briefing_state.aguardando_elaboracao = True
+                self._save_briefing_state()
+                trechos = []
+                for trecho in self._pedir_elaboracao(user_message):
+                    trechos.append(trecho)
+                    yield {"evento": "token", "conteudo": trecho}
+                ai_response = "".join(trechos) or ai_response
+            else:
+                # 2b. Caminho rápido: a próxima pergunta é determinada pelo índice, sem chamar o LLM
+                self.briefing_state.aguardando_elaboracao = False
+                if not self.briefing_state.is_briefing_complete():
+                    self.briefing_state.current_question_index += 1
+                self._save_briefing_state() # Salva o estado atualizado imediatamente
+                ai_response = self.briefing_state.pergunta_pendente() or ai_response
+                # Adianta em segundo plano a extração dos blocos do briefing já respondidos
+                self.extrator.agendar(self._build_full_briefing_text, self.briefing_state.current_question_index - 1)
+
+            # 3. Verifica se o briefing está completo após o avanço do índice
             if self.briefing_state.is_briefing_complete():
                 ai_response = "Obrigado! O briefing foi concluído. Posso agora processar os relatórios com base nas suas respostas?"
                 extracted_briefing_data = self.compile_full_briefing()
 
+            if not precisa_elaborar:
+                yield {"evento": "token", "conteudo": ai_response}
+
         except Exception as e:
             print(f"Erro ao processar mensagem do chatbot: {e}")
             ai_response = "Desculpe, tive um problema interno ao processar sua mensagem. Poderia repetir ou reformular, por favor?"
@@ -245,13 +419,42 @@ class ChatbotHandler:
         self.chat_history.append(AIMessage(content=ai_response))
         self._save_chat_history()
 
-        return {
+        yield {
+            "evento": "fim",
             "response": ai_response,
-            "chat_history": [{"role": m.type, "content": m.content} for m in self.chat_history],
+            "mensagens": self.mensagens_desde(primeira_nova - 1),
             "briefing_complete": self.briefing_state.is_briefing_complete(),
             "extracted_briefing": extracted_briefing_data if self.briefing_state.is_briefing_complete() else {}
         }
 
+    def mensagens_desde(self, after_id: int = -1) -> List[Dict]:
+        """Mensagens com id maior que `after_id`. O id é a posição da mensagem no histórico da sessão."""
+        inicio = max(0, after_id + 1)
+        return [
+            {"id": indice, "role": msg.type, "content": msg.content}
+            for indice, msg in enumerate(self.chat_history[inicio:], start=inicio)
+        ]
+
+    def _pedir_elaboracao(self, user_message: str) -> Iterator[str]:
+        """Chama o LLM em modo streaming para pedir que o usuário detalhe a resposta à pergunta pendente."""
+        recebeu_trecho = False
+        try:
+            for chunk in self.chain.stream({
+                "input_message": user_message,
+                **self._montar_contexto(), # Resumo + últimos turnos, dentro do orçamento de tokens
+            }):
+                # Cada chunk é um AIMessageChunk com um pedaço do texto gerado
+                trecho = str(chunk.content) if hasattr(chunk, 'content') else str(chunk)
+                if trecho:
+                    recebeu_trecho = True
+                    yield trecho
+        except Exception as e:
+            print(f"Falha ao pedir elaboração ao LLM, usando pergunta do roteiro: {e}")
+            if recebeu_trecho:
+                return
+        if not recebeu_trecho:
+            yield f"Poderia detalhar um pouco mais a sua resposta? {self.briefing_state.pergunta_pendente()}"
+
     def _update_briefing_state_from_user_response(self, user_response: str):
         """
         Atualiza o campo correspondente no BriefingState com base na resposta do usuário
@@ -263,70 +466,37 @@ class ChatbotHandler:
         # a uma pergunta do briefing para processar ainda.
         if self.briefing_state.current_question_index > 0:
             answered_question_idx = self.briefing_state.current_question_index - 1
-            # Isso é um mapeamento manual e simples. Para um bot mais robusto,
-            # o LLM faria a extração da entidade de forma mais flexível.
-            if answered_question_idx == 0: self.briefing_state.nome_empresa = user_response
-            elif answered_question_idx == 1: self.briefing_state.o_que_faz = user_response
-            elif answered_question_idx == 2: self.briefing_state.valores_personalidade = user_response
-            elif answered_question_idx == 3: self.briefing_state.percepcao_desejada = user_response
-            elif answered_question_idx == 4: self.briefing_state.produtos_servicos = user_response
-            elif answered_question_idx == 5: self.briefing_state.produtos_promover = user_response
-            elif answered_question_idx == 6: self.briefing_state.concorrentes = user_response
-            elif answered_question_idx == 7: self.briefing_state.cliente_ideal_geral = user_response
-            elif answered_question_idx == 8: self.briefing_state.cliente_idade = user_response
-            elif answered_question_idx == 9: self.briefing_state.cliente_genero = user_response
-            elif answered_question_idx == 10: self.briefing_state.cliente_localizacao = user_response
-            elif answered_question_idx == 11: self.briefing_state.cliente_interesses = user_response
-            elif answered_question_idx == 12: self.briefing_state.cliente_renda = user_response
-            elif answered_question_idx == 13: self.briefing_state.cliente_dores_necessidades_desejos = user_response
-            elif answered_question_idx == 14: self.briefing_state.objetivo_principal_social = user_response
-            elif answered_question_idx == 15: self.briefing_state.metas_especificas = user_response
-            elif answered_question_idx == 16: self.briefing_state.resultado_justificar_investimento = user_response
-            elif answered_question_idx == 17: self.briefing_state.redes_sociais_ativas = user_response
-            elif answered_question_idx == 18: self.briefing_state.tipo_conteudo_desejado = user_response
-            elif answered_question_idx == 19: self.briefing_state.tom_de_voz_desejado = user_response
-            elif answered_question_idx == 20: self.briefing_state.assunto_evitar = user_response
-            elif answered_question_idx == 21: self.briefing_state.material_marketing = user_response
-            elif answered_question_idx == 22: self.briefing_state.informacao_extra = user_response
-            # Você pode adicionar um else para 'print' ou log se o índice for inesperado.
+            if answered_question_idx >= len(CAMPOS_PERGUNTAS):
+                return
+            campo = CAMPOS_PERGUNTAS[answered_question_idx]
+            # Depois de um pedido de elaboração, a nova resposta complementa a anterior
+            resposta_anterior = getattr(self.briefing_state, campo)
+            if self.briefing_state.aguardando_elaboracao and resposta_anterior:
+                user_response = f"{resposta_anterior}\n{user_response}"
+            setattr(self.briefing_state, campo, user_response)
 
     def compile_full_briefing(self) -> Dict:
         """
         Compila o BriefingState em um formato compatível com o seu BriefingData,
-        re-analisando o texto completo com as funções 'engine'.
+        re-analisando o texto com as funções 'engine'. As etapas que já foram extraídas
+        em segundo plano durante a conversa (e cujas respostas não mudaram) são reaproveitadas.
         """
-        compiled_briefing = {}
-
         full_briefing_text = self._build_full_briefing_text()
         print(f"DEBUG: Texto completo do briefing para análise final: {full_briefing_text[:500]}...")
 
-        llm = settings.LLM
-
         try:
-            compiled_briefing['objetivos'] = engine.parse_objetivos(full_briefing_text, llm).dict()
-            compiled_briefing['publico'] = engine.parse_publicos(full_briefing_text, llm).dict()
-            compiled_briefing['pilares'] = engine.parse_pilares(full_briefing_text, llm, compiled_briefing['objetivos'], compiled_briefing['publico']).dict()["pilares"]
-            compiled_briefing['infoempresa'] = engine.parse_info_empresa(full_briefing_text, llm).dict()
-            compiled_briefing['posicionamento'] = engine.parse_posicionamento(
-                objetivos=compiled_briefing['objetivos'], publico=compiled_briefing['publico'], llm=llm
-            ).dict()
-
-            calendario_obj = engine.parse_calendario_editorial(
-                pilares=compiled_briefing['pilares'],
-                objetivos=compiled_briefing['objetivos'],
-                publico=compiled_briefing['publico'],
-                llm=llm
-            )
-            compiled_briefing['calendario'] = calendario_obj.dict()["calendario"] if calendario_obj else []
-
+            compiled_briefing = self.extrator.compilar(self._build_full_briefing_text)
         except Exception as e:
             print(f"Erro ao compilar briefing completo com funções de análise: {e}")
             raise
 
         return compiled_briefing
 
-    def _build_full_briefing_text(self) -> str:
-        """Constrói um texto de briefing completo a partir do BriefingState para re-análise."""
+    def _build_full_briefing_text(self, ultima_pergunta: Optional[int] = None) -> str:
+        """
+        Constrói um texto de briefing a partir do BriefingState para re-análise.
+        Com `ultima_pergunta`, inclui apenas as respostas até essa pergunta (extração incremental).
+        """
         full_text = ""
         qa_map = {
             "nome_empresa": "1. Pergunta Original: Qual é o nome da sua empresa?\n*Resposta: ",
@@ -354,7 +524,10 @@ class ChatbotHandler:
             "informacao_extra": "24. Pergunta Original: Existe mais alguma informação que você acha que eu deveria saber sobre a sua empresa antes de começarmos a estratégia?\n*Resposta: "
         }
 
+        campos_incluidos = CAMPOS_PERGUNTAS if ultima_pergunta is None else CAMPOS_PERGUNTAS[:ultima_pergunta + 1]
         for field_name, question__prefix in qa_map.items():
+            if field_name not in campos_incluidos:
+                continue
             response_value = getattr(self.briefing_state, field_name, None)
             if response_value:
                 full_text += f"{question__prefix}{response_value}\n\n"
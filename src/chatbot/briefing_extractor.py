@@ -0,0 +1,159 @@
+# src/chatbot/briefing_extractor.py
+
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from config import settings
+from src.analysis import engine
+
+
+class Etapa(NamedTuple):
+    nome: str
+    ultima_pergunta: Optional[int] # Índice da última pergunta cujas respostas a etapa lê (None = só dependências)
+    dependencias: Tuple[str, ...]
+    executar: Callable # (texto, resultados_dependencias, llm) -> dict | list | None
+    obrigatoria: bool = True
+
+
+def _dump(obj, chave: Optional[str] = None):
+    if obj is None:
+        return None
+    dados = obj.dict()
+    return dados[chave] if chave else dados
+
+
+# Etapas em ordem topológica. Cada uma começa assim que as perguntas que ela lê foram respondidas
+# e suas dependências estão agendadas: empresa (0-6), público (7-13), objetivos (14-16), conteúdo (17-22).
+ETAPAS = [
+    Etapa("infoempresa", 6, (), lambda texto, deps, llm: _dump(engine.parse_info_empresa(texto, llm))),
+    Etapa("publico", 13, (), lambda texto, deps, llm: _dump(engine.parse_publicos(texto, llm))),
+    Etapa("objetivos", 16, (), lambda texto, deps, llm: _dump(engine.parse_objetivos(texto, llm))),
+    Etapa("posicionamento", None, ("objetivos", "publico"), lambda texto, deps, llm: _dump(
+        engine.parse_posicionamento(objetivos=deps["objetivos"], publico=deps["publico"], llm=llm))),
+    Etapa("pilares", 22, ("objetivos", "publico"), lambda texto, deps, llm: _dump(
+        engine.parse_pilares(texto, llm, deps["objetivos"], deps["publico"]), "pilares")),
+    Etapa("calendario", None, ("pilares", "objetivos", "publico"), lambda texto, deps, llm: _dump(
+        engine.parse_calendario_editorial(pilares=deps["pilares"], objetivos=deps["objetivos"], publico=deps["publico"], llm=llm),
+        "calendario"), obrigatoria=False),
+]
+ETAPAS_POR_NOME = {etapa.nome: etapa for etapa in ETAPAS}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _obter_executor() -> ThreadPoolExecutor:
+    """Pool compartilhado entre as sessões, criado no primeiro uso."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BRIEFING_EXTRACAO_WORKERS, thread_name_prefix="briefing-extracao"
+            )
+        return _executor
+
+
+class ExtratorIncrementalBriefing:
+    """
+    Executa as funções `engine.parse_*` em segundo plano enquanto o usuário ainda responde o briefing.
+
+    Cada resultado fica em cache junto com uma chave (hash) das respostas e dependências usadas.
+    Se o usuário alterar uma resposta, a chave muda e a etapa é recalculada; caso contrário,
+    `compilar` apenas reaproveita o que já foi extraído.
+    """
+
+    def __init__(self, llm):
+        self.llm = llm
+        self._lock = threading.Lock()
+        self._resultados: Dict[str, Tuple[str, object]] = {}
+        self._futuros: Dict[str, Tuple[str, Future]] = {}
+
+    def _chave(self, etapa: Etapa, textos: Dict[int, str]) -> str:
+        partes = [etapa.nome]
+        if etapa.ultima_pergunta is not None:
+            partes.append(textos[etapa.ultima_pergunta])
+        partes.extend(self._chave(ETAPAS_POR_NOME[dep], textos) for dep in etapa.dependencias)
+        return hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+
+    def _pronta(self, etapa: Etapa, respondidas: int) -> bool:
+        if etapa.ultima_pergunta is not None and respondidas <= etapa.ultima_pergunta:
+            return False
+        return all(self._pronta(ETAPAS_POR_NOME[dep], respondidas) for dep in etapa.dependencias)
+
+    def _submeter(self, etapa: Etapa, chave: str, textos: Dict[int, str]) -> Future:
+        """Agenda a etapa, reaproveitando o futuro em andamento se a chave for a mesma. Requer self._lock."""
+        atual = self._futuros.get(etapa.nome)
+        if atual and atual[0] == chave:
+            return atual[1]
+        futuro = _obter_executor().submit(self._rodar, etapa, chave, textos)
+        self._futuros[etapa.nome] = (chave, futuro)
+        return futuro
+
+    def _rodar(self, etapa: Etapa, chave: str, textos: Dict[int, str]):
+        # Dependências já submetidas estão à frente na fila (ordem topológica); as que faltarem
+        # rodam nesta mesma thread, para nunca bloquear um worker esperando outro da mesma fila
+        try:
+            deps = {dep: self._resolver(dep, textos, na_thread_atual=True) for dep in etapa.dependencias}
+            texto = textos[etapa.ultima_pergunta] if etapa.ultima_pergunta is not None else ""
+            resultado = etapa.executar(texto, deps, self.llm)
+            with self._lock:
+                if resultado is not None:
+                    self._resultados[etapa.nome] = (chave, resultado)
+        finally:
+            # Também na falha: o próximo _resolver agenda uma nova tentativa em vez de receber o futuro que falhou
+            with self._lock:
+                if self._futuros.get(etapa.nome, (None,))[0] == chave:
+                    del self._futuros[etapa.nome]
+        if resultado is None and etapa.obrigatoria:
+            raise ValueError(f"Falha ao extrair '{etapa.nome}' do briefing.")
+        return resultado
+
+    def _resolver(self, nome: str, textos: Dict[int, str], na_thread_atual: bool = False):
+        etapa = ETAPAS_POR_NOME[nome]
+        chave = self._chave(etapa, textos)
+        with self._lock:
+            em_cache = self._resultados.get(nome)
+            if em_cache and em_cache[0] == chave:
+                return em_cache[1]
+            atual = self._futuros.get(nome)
+            if atual and atual[0] == chave:
+                futuro = atual[1]
+            elif na_thread_atual:
+                futuro = None
+            else:
+                futuro = self._submeter(etapa, chave, textos)
+        if futuro is None:
+            return self._rodar(etapa, chave, textos)
+        return futuro.result()
+
+    def agendar(self, montar_texto: Callable[[int], str], respondidas: int):
+        """Dispara em segundo plano as etapas cujas perguntas já foram respondidas."""
+        textos = self._textos(montar_texto)
+        with self._lock:
+            for etapa in ETAPAS:
+                if not self._pronta(etapa, respondidas):
+                    continue
+                chave = self._chave(etapa, textos)
+                em_cache = self._resultados.get(etapa.nome)
+                if not (em_cache and em_cache[0] == chave):
+                    self._submeter(etapa, chave, textos)
+
+    def compilar(self, montar_texto: Callable[[int], str]) -> Dict:
+        """Retorna o briefing completo, esperando apenas pelas etapas que ainda não terminaram."""
+        textos = self._textos(montar_texto)
+        compilado = {}
+        for etapa in ETAPAS:
+            try:
+                resultado = self._resolver(etapa.nome, textos)
+            except Exception as e:
+                # Uma falha especulativa (ex.: erro transitório do LLM) ganha uma nova tentativa aqui
+                print(f"Extração antecipada de '{etapa.nome}' falhou ({e}). Tentando novamente...")
+                resultado = self._resolver(etapa.nome, textos)
+            compilado[etapa.nome] = resultado if resultado is not None else []
+        return compilado
+
+    @staticmethod
+    def _textos(montar_texto: Callable[[int], str]) -> Dict[int, str]:
+        # Snapshot dos textos no momento do agendamento: o estado da conversa continua mudando depois
+        indices = {etapa.ultima_pergunta for etapa in ETAPAS if etapa.ultima_pergunta is not None}
+        return {indice: montar_texto(indice) for indice in indices}
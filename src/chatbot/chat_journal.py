@@ -0,0 +1,93 @@
+# src/chatbot/chat_journal.py
+
+import os
+import json
+from typing import Dict, List
+
+
+class ChatJournal:
+    """
+    Diário (journal) append-only em JSON Lines para uma sessão de chat.
+
+    Cada chamada a `registrar` escreve apenas uma linha nova no fim do arquivo, então o custo
+    por mensagem é constante, independente do tamanho da conversa. O `fsync` é feito em lote
+    (a cada `fsync_a_cada` registros) e a compactação (reescrever o snapshot e truncar o diário)
+    fica a cargo de quem usa o diário, quando `precisa_compactar` retornar True.
+
+    Cada registro recebe um número de sequência (`seq`) que continua crescendo depois da compactação.
+    O snapshot guarda o `seq` do último registro que já contém; no replay, os registros até ele são
+    ignorados, então uma queda entre gravar o snapshot e truncar o diário não duplica nada.
+    """
+
+    def __init__(self, caminho: str, fsync_a_cada: int = 8, compactar_a_cada: int = 200, seq_inicial: int = 0):
+        self.caminho = caminho
+        self.fsync_a_cada = max(1, fsync_a_cada)
+        self.compactar_a_cada = max(1, compactar_a_cada)
+        self._arquivo = None
+        self._pendentes_fsync = 0
+        registros = self.ler()
+        # Quantidade de registros no diário desde a última compactação
+        self.total_registros = len(registros)
+        # `seq` do último registro (do diário ou, se ele foi truncado, do snapshot: `seq_inicial`)
+        self.ultimo_seq = max([seq_inicial] + [registro.get("seq", 0) for registro in registros])
+
+    def _abrir(self):
+        if self._arquivo is None or self._arquivo.closed:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+            self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+        return self._arquivo
+
+    def registrar(self, registro: Dict):
+        """Acrescenta um registro ao fim do diário, com o próximo número de sequência."""
+        arquivo = self._abrir()
+        self.ultimo_seq += 1
+        arquivo.write(json.dumps({**registro, "seq": self.ultimo_seq}, ensure_ascii=False) + "\n")
+        arquivo.flush()
+        self.total_registros += 1
+        self._pendentes_fsync += 1
+        if self._pendentes_fsync >= self.fsync_a_cada:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Força a gravação em disco dos registros pendentes."""
+        if self._arquivo is not None and not self._arquivo.closed:
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+        self._pendentes_fsync = 0
+
+    def ler(self) -> List[Dict]:
+        """
+        Lê todos os registros do diário para replay. Uma última linha incompleta
+        (queda no meio de uma escrita) é descartada.
+        """
+        if not os.path.exists(self.caminho):
+            return []
+        registros = []
+        with open(self.caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registros.append(json.loads(linha))
+                except json.JSONDecodeError:
+                    print(f"Registro corrompido ignorado no diário {self.caminho}")
+                    break
+        return registros
+
+    def precisa_compactar(self) -> bool:
+        return self.total_registros >= self.compactar_a_cada
+
+    def truncar(self):
+        """Esvazia o diário (a sequência continua). Deve ser chamado somente depois que o snapshot foi gravado."""
+        self.fechar()
+        with open(self.caminho, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.total_registros = 0
+
+    def fechar(self):
+        if self._arquivo is not None and not self._arquivo.closed:
+            self.sincronizar()
+            self._arquivo.close()
+        self._arquivo = None
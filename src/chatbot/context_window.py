@@ -0,0 +1,58 @@
+# src/chatbot/context_window.py
+
+from typing import List, Tuple
+from langchain_core.messages import BaseMessage
+from src.observability.orcamento import estimar_tokens
+
+
+class JanelaDeContexto:
+    """
+    Mantém o contexto enviado ao LLM com tamanho limitado.
+
+    Os últimos `turnos_verbatim` turnos (pergunta + resposta) vão na íntegra; as mensagens mais
+    antigas são dobradas, uma única vez, em um resumo incremental de uma linha por mensagem.
+    Se resumo + mensagens recentes passarem de `max_tokens`, as linhas mais antigas do resumo
+    são descartadas primeiro e, em último caso, as mensagens recentes mais antigas.
+    """
+
+    def __init__(self, max_tokens: int = 1500, turnos_verbatim: int = 3, max_caracteres_linha: int = 160):
+        self.max_tokens = max_tokens
+        self.turnos_verbatim = turnos_verbatim
+        self.max_caracteres_linha = max_caracteres_linha
+        self.linhas_resumo: List[str] = []
+        self.mensagens_resumidas = 0 # Quantas mensagens do início do histórico já estão no resumo
+
+    def _resumir_mensagem(self, msg: BaseMessage) -> str:
+        autor = "Usuário" if msg.type == "human" else "Assistente"
+        conteudo = " ".join(str(msg.content).split())
+        if len(conteudo) > self.max_caracteres_linha:
+            conteudo = conteudo[:self.max_caracteres_linha - 3] + "..."
+        return f"{autor}: {conteudo}"
+
+    def montar(self, chat_history: List[BaseMessage]) -> Tuple[str, List[BaseMessage]]:
+        """Retorna (resumo, mensagens_recentes) respeitando o orçamento de tokens."""
+        limite_verbatim = max(0, len(chat_history) - 2 * self.turnos_verbatim)
+
+        # O histórico só cresce: basta dobrar no resumo as mensagens que saíram da janela desde a última chamada
+        if limite_verbatim < self.mensagens_resumidas:
+            self.linhas_resumo, self.mensagens_resumidas = [], 0
+        for msg in chat_history[self.mensagens_resumidas:limite_verbatim]:
+            self.linhas_resumo.append(self._resumir_mensagem(msg))
+        self.mensagens_resumidas = limite_verbatim
+
+        recentes = list(chat_history[limite_verbatim:])
+        tokens_recentes = sum(estimar_tokens(str(m.content)) for m in recentes)
+        while recentes and tokens_recentes > self.max_tokens:
+            tokens_recentes -= estimar_tokens(str(recentes.pop(0).content))
+
+        orcamento_resumo = self.max_tokens - tokens_recentes
+        linhas, tokens_resumo = [], 0
+        for linha in reversed(self.linhas_resumo):
+            custo = estimar_tokens(linha) + 1
+            if tokens_resumo + custo > orcamento_resumo:
+                linhas.append("(...)")
+                break
+            linhas.append(linha)
+            tokens_resumo += custo
+
+        return "\n".join(reversed(linhas)), recentes
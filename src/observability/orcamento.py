@@ -0,0 +1,143 @@
+# src/observability/orcamento.py
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+from config import settings
+
+
+class OrcamentoExcedido(Exception):
+    """A execução (ou uma única chamada) passaria do orçamento de tokens/custo configurado."""
+
+
+def custo_usd(provedor: Optional[str], tokens_prompt: int, tokens_resposta: int) -> float:
+    preco_entrada, preco_saida = settings.LLM_PRECOS_USD_POR_MILHAO.get(provedor, (0.0, 0.0))
+    return (tokens_prompt * preco_entrada + tokens_resposta * preco_saida) / 1_000_000
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa barata de tokens (~4 caracteres por token), suficiente para controlar orçamento."""
+    return max(1, len(texto) // 4) if texto else 0
+
+
+def limitar_texto(texto: str, max_tokens: int) -> str:
+    """Corta o texto para caber em ~`max_tokens` (mesma estimativa de 4 caracteres por token de `estimar_tokens`)."""
+    max_caracteres = max_tokens * 4
+    if len(texto) <= max_caracteres:
+        return texto
+    return texto[:max_caracteres].rsplit(" ", 1)[0] + " (...)"
+
+
+class Orcamento:
+    """
+    Contabiliza tokens e custo das chamadas ao LLM de uma execução (ex.: um relatório de um cliente).
+
+    Antes de cada chamada, `verificar` recebe a estimativa de tokens do prompt e recusa a chamada
+    (OrcamentoExcedido) se ela sozinha passar do limite por chamada ou se levar a execução além do
+    orçamento total. Assim a execução é interrompida antes de gastar, e não depois.
+    """
+
+    def __init__(self, nome: str, cliente: str = "", max_tokens: int = 0, max_custo_usd: float = 0.0,
+                 max_tokens_por_chamada: int = 0):
+        self.nome = nome
+        self.cliente = cliente
+        self.max_tokens = max_tokens # 0 = sem limite
+        self.max_custo_usd = max_custo_usd
+        self.max_tokens_por_chamada = max_tokens_por_chamada
+        self.chamadas = 0
+        self.tokens_prompt = 0
+        self.tokens_resposta = 0
+        self.custo_usd = 0.0
+        self.maior_prompt = 0
+        self._lock = threading.Lock()
+
+    def verificar(self, tokens_prompt: int, provedor: Optional[str] = None):
+        if self.max_tokens_por_chamada and tokens_prompt > self.max_tokens_por_chamada:
+            raise OrcamentoExcedido(
+                f"Prompt com ~{tokens_prompt} tokens passa do limite por chamada ({self.max_tokens_por_chamada}).")
+        with self._lock:
+            previsto_tokens = self.tokens_prompt + self.tokens_resposta + tokens_prompt
+            previsto_custo = self.custo_usd + custo_usd(provedor, tokens_prompt, 0)
+        if self.max_tokens and previsto_tokens > self.max_tokens:
+            raise OrcamentoExcedido(
+                f"'{self.nome}' passaria de {self.max_tokens} tokens (já usados: {previsto_tokens - tokens_prompt}).")
+        if self.max_custo_usd and previsto_custo > self.max_custo_usd:
+            raise OrcamentoExcedido(
+                f"'{self.nome}' passaria de US$ {self.max_custo_usd:.4f} (já gastos: US$ {self.custo_usd:.4f}).")
+
+    def registrar(self, provedor: Optional[str], tokens_prompt: int, tokens_resposta: int):
+        with self._lock:
+            self.chamadas += 1
+            self.tokens_prompt += tokens_prompt
+            self.tokens_resposta += tokens_resposta
+            self.custo_usd += custo_usd(provedor, tokens_prompt, tokens_resposta)
+            self.maior_prompt = max(self.maior_prompt, tokens_prompt)
+
+    def resumo(self) -> Dict:
+        with self._lock:
+            return {
+                "cliente": self.cliente,
+                "chamadas": self.chamadas,
+                "tokens_prompt": self.tokens_prompt,
+                "tokens_resposta": self.tokens_resposta,
+                "maior_prompt": self.maior_prompt,
+                "custo_usd": round(self.custo_usd, 6),
+            }
+
+
+_orcamento_atual: ContextVar[Optional[Orcamento]] = ContextVar("orcamento_atual", default=None)
+_custos_lock = threading.Lock()
+
+
+def orcamento_atual() -> Optional[Orcamento]:
+    return _orcamento_atual.get()
+
+
+@contextmanager
+def iniciar_orcamento(nome: str, cliente: str = "", max_tokens: Optional[int] = None,
+                      max_custo_usd: Optional[float] = None) -> Iterator[Orcamento]:
+    """
+    Abre a contabilidade de uma execução. Limites não informados vêm de settings
+    (RELATORIO_MAX_TOKENS, RELATORIO_MAX_CUSTO_USD, LLM_MAX_TOKENS_POR_CHAMADA).
+    Ao final, o consumo é somado ao histórico do cliente em settings.LLM_CUSTOS_PATH.
+    """
+    orcamento = Orcamento(
+        nome, cliente,
+        max_tokens=settings.RELATORIO_MAX_TOKENS if max_tokens is None else max_tokens,
+        max_custo_usd=settings.RELATORIO_MAX_CUSTO_USD if max_custo_usd is None else max_custo_usd,
+        max_tokens_por_chamada=settings.LLM_MAX_TOKENS_POR_CHAMADA,
+    )
+    token = _orcamento_atual.set(orcamento)
+    try:
+        yield orcamento
+    finally:
+        _orcamento_atual.reset(token)
+        if orcamento.chamadas:
+            registrar_custo_cliente(orcamento)
+
+
+def registrar_custo_cliente(orcamento: Orcamento, caminho=None):
+    """Acumula tokens e custo por cliente e por tipo de execução em um JSON (gravação atômica)."""
+    from src.utils.persistencia import gravar_json_atomico
+
+    caminho = caminho or settings.LLM_CUSTOS_PATH
+    with _custos_lock:
+        custos = {}
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                custos = json.load(f)
+        resumo = orcamento.resumo()
+        cliente = custos.setdefault(orcamento.cliente or "(sem cliente)", {})
+        total = cliente.setdefault(orcamento.nome, {"execucoes": 0, "tokens_prompt": 0, "tokens_resposta": 0, "custo_usd": 0.0})
+        total["execucoes"] += 1
+        total["tokens_prompt"] += resumo["tokens_prompt"]
+        total["tokens_resposta"] += resumo["tokens_resposta"]
+        total["custo_usd"] = round(total["custo_usd"] + resumo["custo_usd"], 6)
+        total["ultima_execucao"] = datetime.now().isoformat(timespec="seconds")
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        gravar_json_atomico(caminho, custos)
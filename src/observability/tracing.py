@@ -0,0 +1,193 @@
+# src/observability/tracing.py
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class Span:
+    """Um trecho medido do pipeline (carga de dados, figura, chamada ao LLM, gravação do .docx...)."""
+
+    __slots__ = ("nome", "atributos", "segundos", "erro")
+
+    def __init__(self, nome: str, atributos: Optional[Dict[str, Any]] = None):
+        self.nome = nome
+        self.atributos = atributos or {}
+        self.segundos = 0.0
+        self.erro: Optional[str] = None
+
+
+class Rastreio:
+    """
+    Coleta os spans de uma execução (ex.: uma geração de relatório) para devolver no resultado.
+
+    `resumo()` agrega por nome. Spans aninhados também são contados separadamente
+    (o tempo de `analisarFigura1` já inclui o de `Secao_2_1_Figura1` e o das chamadas ao LLM).
+    """
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def adicionar(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def resumo(self) -> Dict:
+        etapas: Dict[str, Dict] = {}
+        tokens = {"prompt": 0, "resposta": 0}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            etapa = etapas.setdefault(span.nome, {"chamadas": 0, "segundos": 0.0, "erros": 0})
+            etapa["chamadas"] += 1
+            etapa["segundos"] += span.segundos
+            etapa["erros"] += span.erro is not None
+            tokens["prompt"] += span.atributos.get("tokens_prompt", 0)
+            tokens["resposta"] += span.atributos.get("tokens_resposta", 0)
+        for etapa in etapas.values():
+            etapa["segundos"] = round(etapa["segundos"], 4)
+        return {
+            "nome": self.nome,
+            "total_segundos": round((self.fim or time.perf_counter()) - self.inicio, 4),
+            "etapas": etapas,
+            "tokens": tokens,
+        }
+
+
+class MetricasPrometheus:
+    """Histograma de duração por etapa e contadores de tokens, expostos no formato texto do Prometheus."""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._duracoes: Dict[str, List] = {} # etapa -> [contagens por bucket, soma, total, erros]
+        self._tokens: Dict[Tuple[str, str], int] = {} # (tarefa, tipo) -> tokens
+
+    def observar(self, span: Span):
+        with self._lock:
+            dados = self._duracoes.setdefault(span.nome, [[0] * (len(self.BUCKETS) + 1), 0.0, 0, 0])
+            dados[0][bisect_left(self.BUCKETS, span.segundos)] += 1
+            dados[1] += span.segundos
+            dados[2] += 1
+            dados[3] += span.erro is not None
+            tarefa = span.atributos.get("tarefa")
+            if tarefa:
+                for tipo in ("prompt", "resposta"):
+                    chave = (tarefa, tipo)
+                    self._tokens[chave] = self._tokens.get(chave, 0) + span.atributos.get(f"tokens_{tipo}", 0)
+
+    def exportar(self) -> str:
+        linhas = [
+            "# HELP pipeline_etapa_segundos Duração das etapas do pipeline de relatórios.",
+            "# TYPE pipeline_etapa_segundos histogram",
+        ]
+        with self._lock:
+            duracoes = {nome: (list(d[0]), d[1], d[2], d[3]) for nome, d in self._duracoes.items()}
+            tokens = dict(self._tokens)
+        for nome, (contagens, soma, total, _) in sorted(duracoes.items()):
+            acumulado = 0
+            for limite, quantidade in zip(self.BUCKETS, contagens):
+                acumulado += quantidade
+                linhas.append(f'pipeline_etapa_segundos_bucket{{etapa="{nome}",le="{limite}"}} {acumulado}')
+            linhas.append(f'pipeline_etapa_segundos_bucket{{etapa="{nome}",le="+Inf"}} {total}')
+            linhas.append(f'pipeline_etapa_segundos_sum{{etapa="{nome}"}} {soma:.6f}')
+            linhas.append(f'pipeline_etapa_segundos_count{{etapa="{nome}"}} {total}')
+        linhas += ["# HELP pipeline_etapa_erros_total Etapas que terminaram com exceção.",
+                   "# TYPE pipeline_etapa_erros_total counter"]
+        for nome, (_, _, _, erros) in sorted(duracoes.items()):
+            linhas.append(f'pipeline_etapa_erros_total{{etapa="{nome}"}} {erros}')
+        linhas += ["# HELP llm_tokens_total Tokens enviados (prompt) e recebidos (resposta) por tarefa do LLM.",
+                   "# TYPE llm_tokens_total counter"]
+        for (tarefa, tipo), quantidade in sorted(tokens.items()):
+            linhas.append(f'llm_tokens_total{{tarefa="{tarefa}",tipo="{tipo}"}} {quantidade}')
+        return "\n".join(linhas) + "\n"
+
+
+metricas = MetricasPrometheus()
+_rastreio_atual: ContextVar[Optional[Rastreio]] = ContextVar("rastreio_atual", default=None)
+
+_tracer_otel = None
+_tracer_carregado = False
+
+def _obter_tracer_otel():
+    """Tracer do OpenTelemetry, se o pacote estiver instalado (sem SDK configurado ele não faz nada)."""
+    global _tracer_otel, _tracer_carregado
+    if not _tracer_carregado:
+        try:
+            from opentelemetry import trace
+            _tracer_otel = trace.get_tracer("ai-social.pipeline")
+        except ImportError:
+            _tracer_otel = None
+        _tracer_carregado = True
+    return _tracer_otel
+
+
+def _valor_otel(valor):
+    return valor if isinstance(valor, (str, bool, int, float)) else str(valor)
+
+
+@contextmanager
+def iniciar_rastreamento(nome: str) -> Iterator[Rastreio]:
+    """Coleta todos os spans abertos (nesta thread/contexto) até o fim do bloco."""
+    rastreio = Rastreio(nome)
+    token = _rastreio_atual.set(rastreio)
+    try:
+        with span(nome):
+            yield rastreio
+    finally:
+        rastreio.fim = time.perf_counter()
+        _rastreio_atual.reset(token)
+
+
+def registrar_span(registro: Span):
+    """Registra um span já medido (útil quando o trecho não cabe em um bloco `with`, como um stream)."""
+    metricas.observar(registro)
+    rastreio = _rastreio_atual.get()
+    if rastreio is not None:
+        rastreio.adicionar(registro)
+
+
+@contextmanager
+def span(nome: str, **atributos) -> Iterator[Span]:
+    """
+    Mede um trecho do pipeline. O span vai para o rastreio corrente (se houver), para as métricas
+    do Prometheus e, com o opentelemetry instalado, para o tracer do OpenTelemetry.
+    Atributos podem ser acrescentados dentro do bloco em `span.atributos`.
+    """
+    registro = Span(nome, atributos)
+    tracer = _obter_tracer_otel()
+    with (tracer.start_as_current_span(nome) if tracer else nullcontext()) as span_otel:
+        inicio = time.perf_counter()
+        try:
+            yield registro
+        except Exception as e:
+            registro.erro = type(e).__name__
+            raise
+        finally:
+            registro.segundos = time.perf_counter() - inicio
+            if span_otel is not None:
+                for chave, valor in registro.atributos.items():
+                    span_otel.set_attribute(chave, _valor_otel(valor))
+            registrar_span(registro)
+
+
+def rastrear(nome: Optional[str] = None):
+    """Decorador: cada chamada da função vira um span com o nome dela (ou `nome`)."""
+    def decorador(funcao):
+        nome_span = nome or funcao.__name__
+
+        @wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            with span(nome_span):
+                return funcao(*args, **kwargs)
+        return envoltorio
+    return decorador
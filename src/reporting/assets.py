@@ -0,0 +1,79 @@
+# src/reporting/assets.py
+"""
+Imagens da marca (logo) para os relatórios .docx, decodificadas uma vez por processo.
+
+O Logo.png original tem 2048x2048 px, mas aparece com 3 a 6 cm no documento. `imagem` reduz a imagem
+para o tamanho em que ela será exibida (na resolução settings.ASSETS_DPI) e guarda os bytes já
+reencodados em memória: os relatórios seguintes reaproveitam o mesmo PNG, sem reler nem redimensionar
+o arquivo, e o .docx final fica bem menor.
+"""
+import io
+import math
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from config import settings
+
+_originais: Dict[str, Tuple[float, object]] = {} # caminho -> (mtime, imagem PIL decodificada)
+_reduzidas: Dict[Tuple, bytes] = {} # (caminho, mtime, largura_px, altura_px) -> PNG
+_lock = threading.Lock()
+
+
+def _original(caminho: str):
+    """Imagem decodificada do disco; só é lida de novo se o arquivo mudar."""
+    from PIL import Image # Importado sob demanda: só os geradores de .docx precisam dele
+
+    mtime = os.path.getmtime(caminho)
+    em_cache = _originais.get(caminho)
+    if em_cache is None or em_cache[0] != mtime:
+        with Image.open(caminho) as arquivo:
+            arquivo.load()
+            em_cache = (mtime, arquivo.copy())
+        _originais[caminho] = em_cache
+    return em_cache
+
+
+def _tamanho_alvo(original_px: Tuple[int, int], largura, altura, dpi: int) -> Tuple[int, int]:
+    """Pixels necessários para exibir a imagem com `largura`/`altura` (docx.shared.Length) em `dpi`, sem ampliar."""
+    largura_px, altura_px = original_px
+    if largura is not None:
+        escala = largura.inches * dpi / largura_px
+    elif altura is not None:
+        escala = altura.inches * dpi / altura_px
+    else:
+        escala = 1.0
+    escala = min(escala, 1.0)
+    return max(1, math.ceil(largura_px * escala)), max(1, math.ceil(altura_px * escala))
+
+
+def imagem(caminho, largura=None, altura=None, dpi: Optional[int] = None) -> io.BytesIO:
+    """
+    PNG de `caminho` reduzido para ser exibido com `largura` (ou `altura`) em `dpi` pontos por polegada
+    (padrão: settings.ASSETS_DPI). Cada chamada devolve um novo BytesIO sobre os mesmos bytes em cache.
+    """
+    caminho = str(caminho)
+    dpi = dpi or settings.ASSETS_DPI
+    with _lock:
+        mtime, original = _original(caminho)
+        tamanho = _tamanho_alvo(original.size, largura, altura, dpi)
+        chave = (caminho, mtime) + tamanho
+        dados = _reduzidas.get(chave)
+        if dados is None:
+            from PIL import Image
+
+            reduzida = original if tamanho == original.size else original.resize(tamanho, Image.LANCZOS)
+            buffer = io.BytesIO()
+            reduzida.save(buffer, format="PNG", optimize=True, dpi=(dpi, dpi))
+            dados = buffer.getvalue()
+            _reduzidas[chave] = dados
+    return io.BytesIO(dados)
+
+
+def adicionar_imagem(run, caminho, largura=None, altura=None):
+    """`run.add_picture` com a imagem já reduzida pelo cache de `imagem`."""
+    return run.add_picture(imagem(caminho, largura, altura), width=largura, height=altura)
+
+
+def adicionar_logo(run, largura=None, altura=None):
+    return adicionar_imagem(run, settings.LOGO_PATH, largura, altura)
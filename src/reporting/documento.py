@@ -0,0 +1,473 @@
+# src/reporting/documento.py
+"""
+Motor de renderização compartilhado pelos relatórios.
+
+Os geradores montam um `Relatorio` (capa, títulos, parágrafos, listas, imagens, tabelas) e este módulo o
+renderiza em .docx, HTML ou PDF. No .docx:
+
+- o template (ex.: templates/template.docx) é aberto e recebe os estilos da casa (`definir_estilos`) uma única
+  vez por processo; cada relatório parte de uma cópia em memória desse pacote já estilizado;
+- os blocos de texto viram XML do WordprocessingML e são inseridos no corpo de uma vez, em vez de um
+  `add_paragraph`/`add_run` por elemento. Só as imagens passam pelo python-docx (que cuida das relações do pacote).
+
+O `Relatorio` é serializável (`salvar_modelo`/`carregar_modelo`, um JSON por execução em
+settings.RELATORIOS_MODELOS_PATH) e a renderização depende só dele: trocar o `tema` ou substituir os blocos
+de uma seção (`substituir_secao`) e renderizar de novo não refaz gráficos nem chamadas ao LLM.
+"""
+import base64
+import html
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Annotated, Dict, Iterator, List, Literal, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.shared import Cm, Pt, RGBColor
+from docx.text.paragraph import Paragraph
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+from config import settings
+from src.reporting.assets import adicionar_logo, imagem as imagem_asset
+
+AZUL_CORPORATIVO = "0A2540"
+
+# =================================================================
+# Modelo do relatório
+# =================================================================
+
+class Tema(BaseModel):
+    fonte: str = "Abadi"
+    tamanho_texto: int = 11
+    cor_titulos: str = AZUL_CORPORATIVO # Hexadecimal RGB, sem "#"
+
+class Trecho(BaseModel):
+    texto: str
+    negrito: bool = False
+
+class _Bloco(BaseModel):
+    secao: Optional[str] = None # Chave da seção que criou o bloco (ex.: "figura_7"), para regerá-la sozinha
+
+class Capa(_Bloco):
+    tipo: Literal["capa"] = "capa"
+    titulo: str
+    cliente: str
+    autor: str
+    data: str
+    logo_cm: float = 6.0
+
+class Titulo(_Bloco):
+    tipo: Literal["titulo"] = "titulo"
+    texto: str
+    nivel: int = 2
+
+class Paragrafo(_Bloco):
+    tipo: Literal["paragrafo"] = "paragrafo"
+    texto: str = ""
+    trechos: List[Trecho] = [] # Quando informados, substituem `texto` (ex.: rótulo em negrito + valor)
+    alinhamento: Optional[Literal["esquerda", "centro", "direita", "justificado"]] = None
+
+class Lista(_Bloco):
+    tipo: Literal["lista"] = "lista"
+    itens: List[str]
+
+class Imagem(_Bloco):
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+    tipo: Literal["imagem"] = "imagem"
+    dados: bytes # PNG/JPEG já renderizado (src/reporting/renderizacao.py)
+    largura_cm: float
+
+class Tabela(_Bloco):
+    tipo: Literal["tabela"] = "tabela"
+    cabecalho: List[str]
+    linhas: List[List[str]]
+
+class QuebraPagina(_Bloco):
+    tipo: Literal["quebra_pagina"] = "quebra_pagina"
+
+Bloco = Annotated[Union[Capa, Titulo, Paragrafo, Lista, Imagem, Tabela, QuebraPagina], Field(discriminator="tipo")]
+
+
+def nova_execucao() -> str:
+    """Identificador de uma execução (também usado para retomar um relatório interrompido)."""
+    return datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+
+class Relatorio(BaseModel):
+    """Conteúdo de um relatório, independente do formato de saída. Os métodos `adicionar_*` devolvem o bloco criado."""
+
+    titulo: str
+    nome: str = "relatorio" # Tipo do relatório (ex.: "concorrentes"), usado no caminho do modelo salvo
+    cliente: str = ""
+    execucao: str = Field(default_factory=nova_execucao)
+    template: Optional[str] = None # .docx base; None = modelo padrão do python-docx
+    tema: Tema = Tema()
+    logo_cabecalho_cm: Optional[float] = None # Altura do logo no cabeçalho das páginas (exceto a capa)
+    blocos: List[Bloco] = []
+    textos: Dict[str, str] = {} # Texto gerado por seção, para seções que resumem as outras (ex.: a conclusão)
+    _secao_atual: Optional[str] = PrivateAttr(default=None)
+
+    @contextmanager
+    def secao(self, chave: str) -> Iterator["Relatorio"]:
+        """Os blocos adicionados dentro do bloco `with` pertencem à seção `chave`."""
+        anterior, self._secao_atual = self._secao_atual, chave
+        try:
+            yield self
+        finally:
+            self._secao_atual = anterior
+
+    def blocos_da_secao(self, chave: str) -> List:
+        return [bloco for bloco in self.blocos if bloco.secao == chave]
+
+    def substituir_secao(self, chave: str, blocos: List):
+        """Troca os blocos da seção `chave` por `blocos`, na mesma posição (ou no fim, se a seção não existir)."""
+        for bloco in blocos:
+            bloco.secao = chave
+        posicoes = [i for i, bloco in enumerate(self.blocos) if bloco.secao == chave]
+        restantes = [bloco for bloco in self.blocos if bloco.secao != chave]
+        inicio = posicoes[0] if posicoes else len(restantes)
+        self.blocos = restantes[:inicio] + list(blocos) + restantes[inicio:]
+
+    def _adicionar(self, bloco):
+        bloco.secao = self._secao_atual
+        self.blocos.append(bloco)
+        return bloco
+
+    def adicionar_capa(self, titulo: str, cliente: str, autor: str, data: str) -> Capa:
+        return self._adicionar(Capa(titulo=titulo, cliente=cliente, autor=autor, data=data))
+
+    def adicionar_titulo(self, texto: str, nivel: int = 2) -> Titulo:
+        return self._adicionar(Titulo(texto=texto, nivel=nivel))
+
+    def adicionar_paragrafo(self, texto: str = "", trechos: Optional[List[Trecho]] = None, alinhamento=None) -> Paragrafo:
+        return self._adicionar(Paragrafo(texto=texto, trechos=trechos or [], alinhamento=alinhamento))
+
+    def adicionar_lista(self, itens: List[str]) -> Lista:
+        return self._adicionar(Lista(itens=[str(item) for item in itens]))
+
+    def adicionar_imagem(self, buffer, largura) -> Imagem:
+        """`buffer`: BytesIO ou bytes da imagem; `largura`: docx.shared.Length (ex.: Inches(6))."""
+        dados = buffer.getvalue() if hasattr(buffer, "getvalue") else buffer
+        return self._adicionar(Imagem(dados=dados, largura_cm=largura.cm))
+
+    def adicionar_tabela(self, cabecalho: List[str], linhas: List[List[str]]) -> Tabela:
+        return self._adicionar(Tabela(cabecalho=cabecalho, linhas=[[str(c) for c in linha] for linha in linhas]))
+
+    def quebrar_pagina(self) -> QuebraPagina:
+        return self._adicionar(QuebraPagina())
+
+# =================================================================
+# Estilos e template compilado
+# =================================================================
+
+def definir_estilos(document, tema: Optional[Tema] = None):
+    """
+    Centraliza todas as modificações de estilo do documento para garantir consistência.
+    """
+    tema = tema or Tema()
+    # 1. ALTERAR A FONTE PADRÃO (ESTILO 'NORMAL')
+    fonte_normal = document.styles['Normal'].font
+    fonte_normal.name = tema.fonte
+    fonte_normal.size = Pt(tema.tamanho_texto)
+
+    # 2. TÍTULOS: (tamanho, alinhamento, espaço antes, espaço depois) por nível
+    # O nível 1 é usado pela capa
+    titulos = {
+        1: (22, WD_ALIGN_PARAGRAPH.CENTER, 12, 12),
+        2: (14, WD_ALIGN_PARAGRAPH.LEFT, 18, 6),
+        3: (12, WD_ALIGN_PARAGRAPH.LEFT, 10, 4),
+    }
+    for nivel, (tamanho, alinhamento, antes, depois) in titulos.items():
+        estilo = document.styles[f'Heading {nivel}']
+        estilo.font.name = tema.fonte
+        estilo.font.size = Pt(tamanho)
+        estilo.font.bold = True
+        estilo.font.color.rgb = RGBColor.from_string(tema.cor_titulos)
+        estilo.paragraph_format.alignment = alinhamento
+        estilo.paragraph_format.space_before = Pt(antes)
+        estilo.paragraph_format.space_after = Pt(depois)
+
+
+_modelos: Dict[Tuple, Tuple[bytes, Dict[str, Optional[str]]]] = {} # (template, tema) -> (pacote estilizado, ids dos estilos)
+_modelos_lock = threading.Lock()
+
+
+def _modelo_compilado(template: Optional[str], tema: Tema) -> Tuple[bytes, Dict[str, Optional[str]]]:
+    """Pacote .docx do template já com `definir_estilos` aplicado, montado uma vez por processo e tema."""
+    chave = (template, tema.model_dump_json())
+    with _modelos_lock:
+        if chave not in _modelos:
+            document = Document(template) if template else Document()
+            definir_estilos(document, tema)
+            # Os ids mudam com o idioma do template (ex.: "Heading 1" é "Ttulo1" no template em português)
+            ids = {estilo.name: estilo.style_id for estilo in document.styles}
+            estilos = {nome: ids.get(nome) for nome in ("Heading 1", "Heading 2", "Heading 3", "List Bullet", "Table Grid")}
+            buffer = io.BytesIO()
+            document.save(buffer)
+            _modelos[chave] = (buffer.getvalue(), estilos)
+        return _modelos[chave]
+
+# =================================================================
+# .docx
+# =================================================================
+
+_NS_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_ALINHAMENTOS_DOCX = {"esquerda": "left", "centro": "center", "direita": "right", "justificado": "both"}
+
+
+def _xml_run(texto: str, negrito: bool = False) -> str:
+    propriedades = "<w:rPr><w:b/></w:rPr>" if negrito else ""
+    partes = "<w:br/>".join(f'<w:t xml:space="preserve">{escape(linha)}</w:t>' for linha in texto.split("\n"))
+    return f"<w:r>{propriedades}{partes}</w:r>"
+
+
+def _xml_paragrafo(runs: str = "", estilo: Optional[str] = None, alinhamento: Optional[str] = None) -> str:
+    propriedades = ""
+    if estilo:
+        propriedades += f'<w:pStyle w:val="{estilo}"/>'
+    if alinhamento:
+        propriedades += f'<w:jc w:val="{_ALINHAMENTOS_DOCX[alinhamento]}"/>'
+    return f"<w:p>{f'<w:pPr>{propriedades}</w:pPr>' if propriedades else ''}{runs}</w:p>"
+
+
+def _xml_tabela(bloco: Tabela, estilo: Optional[str], largura_twips: int) -> str:
+    colunas = max(1, len(bloco.cabecalho))
+    largura_coluna = largura_twips // colunas
+    if estilo:
+        propriedades = f'<w:tblStyle w:val="{estilo}"/>'
+    else: # Template sem o estilo "Table Grid": bordas simples na própria tabela
+        bordas = "".join(f'<w:{lado} w:val="single" w:sz="4" w:space="0" w:color="auto"/>'
+                         for lado in ("top", "left", "bottom", "right", "insideH", "insideV"))
+        propriedades = f"<w:tblBorders>{bordas}</w:tblBorders>"
+
+    def linha(celulas, negrito=False):
+        return "<w:tr>" + "".join(
+            f'<w:tc><w:tcPr><w:tcW w:w="{largura_coluna}" w:type="dxa"/></w:tcPr>{_xml_paragrafo(_xml_run(c, negrito))}</w:tc>'
+            for c in celulas) + "</w:tr>"
+
+    grade = f'<w:gridCol w:w="{largura_coluna}"/>' * colunas
+    return (f'<w:tbl><w:tblPr>{propriedades}<w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>{grade}</w:tblGrid>'
+            f'{linha(bloco.cabecalho, negrito=True)}{"".join(linha(l) for l in bloco.linhas)}</w:tbl>')
+
+
+def _xml_bloco(bloco, estilos: Dict[str, Optional[str]], largura_twips: int) -> List[str]:
+    """XML dos elementos do corpo de um bloco. Parágrafos de imagem saem vazios e recebem a imagem depois."""
+    if isinstance(bloco, Titulo):
+        return [_xml_paragrafo(_xml_run(bloco.texto), estilos.get(f"Heading {bloco.nivel}"))]
+    if isinstance(bloco, Paragrafo):
+        trechos = bloco.trechos or [Trecho(texto=bloco.texto)]
+        return [_xml_paragrafo("".join(_xml_run(t.texto, t.negrito) for t in trechos), alinhamento=bloco.alinhamento)]
+    if isinstance(bloco, Lista):
+        if estilos.get("List Bullet"):
+            return [_xml_paragrafo(_xml_run(item), estilos["List Bullet"]) for item in bloco.itens]
+        return [_xml_paragrafo(_xml_run(f"• {item}")) for item in bloco.itens]
+    if isinstance(bloco, Imagem):
+        return [_xml_paragrafo(alinhamento="centro")]
+    if isinstance(bloco, Tabela):
+        return [_xml_tabela(bloco, estilos.get("Table Grid"), largura_twips)]
+    if isinstance(bloco, QuebraPagina):
+        return [_xml_paragrafo('<w:r><w:br w:type="page"/></w:r>')]
+    if isinstance(bloco, Capa):
+        return [
+            _xml_paragrafo(alinhamento="centro"), # Logo
+            _xml_paragrafo(_xml_run(bloco.titulo), estilos.get("Heading 1")),
+            _xml_paragrafo(),
+            _xml_paragrafo(_xml_run("Preparado para:\n", True) + _xml_run(f"{bloco.cliente}\n\n")
+                           + _xml_run("Análise por:\n", True) + _xml_run(f"{bloco.autor}\n\n"), alinhamento="centro"),
+            _xml_paragrafo(_xml_run(bloco.data), alinhamento="centro"),
+            _xml_paragrafo('<w:r><w:br w:type="page"/></w:r>'),
+        ]
+    raise TypeError(f"Bloco desconhecido: {type(bloco).__name__}")
+
+
+def renderizar_docx(relatorio: Relatorio, caminho_saida):
+    pacote, estilos = _modelo_compilado(relatorio.template, relatorio.tema)
+    document = Document(io.BytesIO(pacote))
+    secao = document.sections[0]
+    largura_twips = int((secao.page_width - secao.left_margin - secao.right_margin) / 635)
+
+    # Todo o texto em um único fragmento XML; guarda onde entram as imagens
+    fragmentos, imagens = [], []
+    for bloco in relatorio.blocos:
+        xmls = _xml_bloco(bloco, estilos, largura_twips)
+        if isinstance(bloco, (Imagem, Capa)):
+            imagens.append((len(fragmentos), bloco))
+        fragmentos += xmls
+    elementos = list(parse_xml(f'<w:body xmlns:w="{_NS_W}">{"".join(fragmentos)}</w:body>'))
+
+    corpo = document.element.body
+    fim = corpo.sectPr
+    for elemento in elementos:
+        if fim is not None:
+            fim.addprevious(elemento)
+        else:
+            corpo.append(elemento)
+
+    for posicao, bloco in imagens:
+        run = Paragraph(elementos[posicao], document._body).add_run()
+        if isinstance(bloco, Capa):
+            adicionar_logo(run, largura=Cm(bloco.logo_cm))
+        else:
+            run.add_picture(io.BytesIO(bloco.dados), width=Cm(bloco.largura_cm))
+
+    if relatorio.logo_cabecalho_cm:
+        secao.different_first_page_header_footer = True
+        paragrafo = secao.header.add_paragraph()
+        paragrafo.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        adicionar_logo(paragrafo.add_run(), altura=Cm(relatorio.logo_cabecalho_cm))
+
+    document.save(caminho_saida)
+
+# =================================================================
+# HTML e PDF
+# =================================================================
+
+def _css(tema: Tema) -> str:
+    return f"""
+body {{ font-family: {tema.fonte}, Arial, sans-serif; font-size: {tema.tamanho_texto}pt; max-width: 17cm; margin: 2cm auto; }}
+h1, h2, h3 {{ color: #{tema.cor_titulos}; }}
+h1 {{ font-size: 22pt; text-align: center; margin: 12pt 0; }}
+h2 {{ font-size: 14pt; margin: 18pt 0 6pt; }}
+h3 {{ font-size: 12pt; margin: 10pt 0 4pt; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ border: 1px solid #000; padding: 2pt 4pt; text-align: left; }}
+.centro {{ text-align: center; }} .direita {{ text-align: right; }} .justificado {{ text-align: justify; }}
+.quebra {{ page-break-after: always; }}
+"""
+
+
+def _data_uri(dados: bytes) -> str:
+    tipo = "image/jpeg" if dados[:2] == b"\xff\xd8" else "image/svg+xml" if dados.lstrip()[:1] == b"<" else "image/png"
+    return f"data:{tipo};base64,{base64.b64encode(dados).decode('ascii')}"
+
+
+def _html_texto(texto: str) -> str:
+    return html.escape(texto).replace("\n", "<br>")
+
+
+def _html_bloco(bloco) -> str:
+    if isinstance(bloco, Titulo):
+        return f"<h{bloco.nivel}>{_html_texto(bloco.texto)}</h{bloco.nivel}>"
+    if isinstance(bloco, Paragrafo):
+        trechos = bloco.trechos or [Trecho(texto=bloco.texto)]
+        conteudo = "".join(f"<b>{_html_texto(t.texto)}</b>" if t.negrito else _html_texto(t.texto) for t in trechos)
+        classe = f' class="{bloco.alinhamento}"' if bloco.alinhamento and bloco.alinhamento != "esquerda" else ""
+        return f"<p{classe}>{conteudo}</p>"
+    if isinstance(bloco, Lista):
+        return "<ul>" + "".join(f"<li>{_html_texto(item)}</li>" for item in bloco.itens) + "</ul>"
+    if isinstance(bloco, Imagem):
+        return f'<p class="centro"><img src="{_data_uri(bloco.dados)}" style="width: {bloco.largura_cm}cm; max-width: 100%"></p>'
+    if isinstance(bloco, Tabela):
+        cabecalho = "".join(f"<th>{_html_texto(c)}</th>" for c in bloco.cabecalho)
+        linhas = "".join("<tr>" + "".join(f"<td>{_html_texto(c)}</td>" for c in linha) + "</tr>" for linha in bloco.linhas)
+        return f"<table><tr>{cabecalho}</tr>{linhas}</table>"
+    if isinstance(bloco, QuebraPagina):
+        return '<div class="quebra"></div>'
+    if isinstance(bloco, Capa):
+        logo = imagem_asset(settings.LOGO_PATH, largura=Cm(bloco.logo_cm)).getvalue()
+        return (f'<p class="centro"><img src="{_data_uri(logo)}" style="width: {bloco.logo_cm}cm"></p>'
+                f"<h1>{_html_texto(bloco.titulo)}</h1>"
+                f'<p class="centro"><b>Preparado para:</b><br>{_html_texto(bloco.cliente)}<br><br>'
+                f"<b>Análise por:</b><br>{_html_texto(bloco.autor)}</p>"
+                f'<p class="centro">{_html_texto(bloco.data)}</p><div class="quebra"></div>')
+    raise TypeError(f"Bloco desconhecido: {type(bloco).__name__}")
+
+
+def renderizar_html(relatorio: Relatorio) -> str:
+    corpo = "\n".join(_html_bloco(bloco) for bloco in relatorio.blocos)
+    return (f'<!DOCTYPE html>\n<html lang="pt-BR"><head><meta charset="utf-8"><title>{html.escape(relatorio.titulo)}</title>'
+            f"<style>{_css(relatorio.tema)}</style></head><body>\n{corpo}\n</body></html>")
+
+
+def renderizar_pdf(relatorio: Relatorio, caminho_saida):
+    """PDF pelo weasyprint (a partir do HTML) ou, sem ele, pelo LibreOffice (a partir do .docx)."""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        HTML = None
+    if HTML is not None:
+        HTML(string=renderizar_html(relatorio)).write_pdf(str(caminho_saida))
+        return
+
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None:
+        raise RuntimeError("Para gerar PDF é preciso instalar o weasyprint (pip install weasyprint) ou o LibreOffice.")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_docx = os.path.join(diretorio, "relatorio.docx")
+        renderizar_docx(relatorio, caminho_docx)
+        subprocess.run([soffice, "--headless", "--convert-to", "pdf", "--outdir", diretorio, caminho_docx],
+                       check=True, capture_output=True)
+        shutil.move(os.path.join(diretorio, "relatorio.pdf"), str(caminho_saida))
+
+
+def salvar(relatorio: Relatorio, caminho_saida):
+    """Renderiza no formato indicado pela extensão de `caminho_saida` (.docx, .html ou .pdf)."""
+    diretorio = os.path.dirname(str(caminho_saida))
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    extensao = os.path.splitext(str(caminho_saida))[1].lower()
+    if extensao == ".html":
+        with open(caminho_saida, "w", encoding="utf-8") as f:
+            f.write(renderizar_html(relatorio))
+    elif extensao == ".pdf":
+        renderizar_pdf(relatorio, caminho_saida)
+    else:
+        renderizar_docx(relatorio, caminho_saida)
+
+# =================================================================
+# Persistência do modelo
+# =================================================================
+
+_FORMATO_EXECUCAO = re.compile(r"\d{8}-\d{6}-\d{6}") # Como em nova_execucao()
+
+
+def validar_execucao(execucao: str) -> str:
+    """Confere que `execucao` tem o formato de nova_execucao(), já que ela vira nome de arquivo."""
+    if not isinstance(execucao, str) or not _FORMATO_EXECUCAO.fullmatch(execucao):
+        raise ValueError(f"Execução inválida: {execucao!r} (esperado AAAAMMDD-HHMMSS-ffffff, como devolvido na geração).")
+    return execucao
+
+
+def _diretorio_modelos(cliente: str, nome: str) -> str:
+    cliente = re.sub(r"[^\w.-]", "_", cliente or "sem_cliente")
+    diretorio = os.path.join(str(settings.RELATORIOS_MODELOS_PATH), cliente, nome)
+    raiz = os.path.realpath(str(settings.RELATORIOS_MODELOS_PATH))
+    if os.path.commonpath([raiz, os.path.realpath(diretorio)]) != raiz: # Ex.: cliente ".."
+        raise ValueError(f"Modelos de relatório fora de {settings.RELATORIOS_MODELOS_PATH}: {diretorio}")
+    return diretorio
+
+
+def caminho_modelo(cliente: str, nome: str, execucao: str) -> str:
+    return os.path.join(_diretorio_modelos(cliente, nome), f"{validar_execucao(execucao)}.json")
+
+
+def salvar_modelo(relatorio: Relatorio, caminho: Optional[str] = None) -> str:
+    """Grava o modelo (imagens em base64) e devolve o caminho. Padrão: um arquivo por cliente/relatório/execução."""
+    from src.utils.persistencia import gravar_json_atomico
+
+    caminho = caminho or caminho_modelo(relatorio.cliente, relatorio.nome, relatorio.execucao)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    gravar_json_atomico(caminho, relatorio.model_dump(mode="json"))
+    return caminho
+
+
+def carregar_modelo(caminho: str) -> Relatorio:
+    with open(caminho, "r", encoding="utf-8") as f:
+        return Relatorio.model_validate_json(f.read())
+
+
+def ultimo_modelo(cliente: str, nome: str) -> Optional[str]:
+    """Caminho do modelo mais recente do cliente para o tipo de relatório `nome`, se houver."""
+    diretorio = _diretorio_modelos(cliente, nome)
+    if not os.path.isdir(diretorio):
+        return None
+    execucoes = sorted(arquivo for arquivo in os.listdir(diretorio) if arquivo.endswith(".json"))
+    return os.path.join(diretorio, execucoes[-1]) if execucoes else None
@@ -1,11 +1,9 @@
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain.chains import ConversationChain
 from langchain.memory import ConversationBufferMemory
 from langchain.prompts import PromptTemplate
-from langchain_ollama import ChatOllama
-from langchain_groq import ChatGroq
+from config.llm_router import llm_para
 
 # Adicionamos a importação da exceção
 from langchain_core.exceptions import OutputParserException
@@ -18,7 +16,7 @@ def preencher_briefing(output_path):
     # --- 1. MODELO DE LINGUAGEM ---
     # Inicializa o modelo de linguagem que será o cérebro do nosso chatbot.
     # O `temperature=0.7` permite um equilíbrio entre respostas criativas e consistentes.
-    llm = ChatGroq(model="gemma2-9b-it", temperature=0.4)
+    llm = llm_para("chat") # Provedores configurados em settings.LLM_ROTAS["chat"]
 
     # --- 2. PERGUNTAS DO BRIEFING ---
     # Todas as perguntas que o agente deve fazer.
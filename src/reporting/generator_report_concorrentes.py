@@ -1,23 +1,25 @@
-import io
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib import gridspec
-import seaborn as sns
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Inches
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
-from langchain_ollama import ChatOllama
-from langchain_groq import ChatGroq
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from wordcloud import WordCloud
+# seaborn e sklearn são importados dentro das figuras que os usam, e wordcloud em src/analysis/hashtags.py (importação lenta)
 from datetime import date
 import locale
+import os
 import numpy as np
 import time
+from typing import List
+from pydantic import BaseModel, Field
 from config import settings
+from src.observability.orcamento import limitar_texto
+from src.reporting.serializacao_prompt import serializar_tabela
+from src.reporting.documento import Relatorio, caminho_modelo, carregar_modelo, nova_execucao, salvar, salvar_modelo
+from src.reporting.renderizacao import salvar_figura
+from src.observability.tracing import rastrear, span
+from src.analysis import hashtags
+from src.analysis.ranking import ranking
 
 try:
     locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
@@ -30,6 +32,8 @@ except locale.Error:
         # Fallback para o locale padrão do sistema
         locale.setlocale(locale.LC_ALL, '')
 
+LARGURA_FIGURA = Inches(6) # Largura das figuras no documento (também define a resolução em que são salvas)
+
 def safe_invoke(llm, prompt):
     try:
         prompt.encode("utf-8")  # Testa se o prompt tem caracteres válidos
@@ -40,6 +44,102 @@ def safe_invoke(llm, prompt):
         prompt_clean = prompt.encode("utf-8", "ignore").decode("utf-8", "ignore")
         return llm.invoke(prompt_clean)
 
+def _sem_quebras(texto: str) -> str:
+    # Usado dentro das f-strings dos prompts (barra invertida em f-string só é aceita a partir do Python 3.12)
+    return texto.replace('\n', '')
+
+# --- Análise das Figuras em Lote ---
+
+class AnaliseFigura(BaseModel):
+    figura: str = Field(description="Identificador da figura, exatamente como informado. Ex: 'figura_5'")
+    analise: str = Field(description="Parágrafo com a análise descritiva dos dados da figura.")
+    recomendacoes: str = Field(description="Parágrafo com as recomendações para o cliente a partir da análise.")
+
+class AnalisesFiguras(BaseModel):
+    """Análise e recomendações de cada figura enviada no lote."""
+    figuras: List[AnaliseFigura]
+
+
+def figuras_por_lote_do_provedor(llm) -> int:
+    """Tamanho do lote configurado (settings.RELATORIO_FIGURAS_POR_LOTE) para o provedor que vai atender `llm`."""
+    provedor = llm.provedor_preferido() if hasattr(llm, "provedor_preferido") else settings.LLM_PROVIDER
+    return settings.RELATORIO_FIGURAS_POR_LOTE.get(provedor, 1)
+
+
+class LoteAnalises:
+    """
+    Junta os pedidos de análise de várias figuras e resolve cada grupo de `tamanho` figuras numa única
+    chamada com saída estruturada (análise e recomendações por figura), em vez de duas chamadas por figura.
+
+    As figuras continuam sendo inseridas no documento na ordem de sempre: `adicionar` reserva os parágrafos
+    da análise e das recomendações, que são preenchidos quando o lote é enviado.
+    """
+
+    def __init__(self, llm, client_name: str, tamanho: int):
+        self.llm = llm.with_structured_output(AnalisesFiguras)
+        self.client_name = client_name
+        self.tamanho = tamanho
+        self.textos = {} # figura -> análise + recomendações (para a conclusão), na ordem de adição
+        self._pendentes = []
+
+    def adicionar(self, relatorio, figura: str, pergunta_analise: str, pergunta_recomendacoes: str,
+                  inicio_analise: str, inicio_recomendacoes: str, dados: str):
+        self.textos[figura] = None
+        self._pendentes.append({
+            "figura": figura,
+            "pergunta_analise": pergunta_analise,
+            "pergunta_recomendacoes": pergunta_recomendacoes,
+            "inicio_analise": inicio_analise,
+            "inicio_recomendacoes": inicio_recomendacoes,
+            "dados": dados,
+            "paragrafos": (relatorio.adicionar_paragrafo(), relatorio.adicionar_paragrafo()),
+        })
+        if len(self._pendentes) >= self.tamanho:
+            self.enviar()
+
+    def _prompt(self, pedidos) -> str:
+        blocos = '\n'.join(f"""
+        ### {pedido['figura']}
+        Análise: {pedido['pergunta_analise']} Inicie o texto dizendo "{pedido['inicio_analise']}".
+        Recomendações: {pedido['pergunta_recomendacoes']} Inicie o texto dizendo "{pedido['inicio_recomendacoes']}".
+        Dados:
+        {pedido['dados']}
+        """ for pedido in pedidos)
+        return f"""
+        Persona: Você é um analista\\estrategista de marketing de mídias sociais sênior, especialista em social metrics.
+        Contexto: Abaixo estão os dados de {len(pedidos)} figura(s) do relatório de concorrentes da empresa "{self.client_name}" no instagram.
+        Tarefa: Para cada figura, gere um texto científico detalhado de 1 parágrafo com a análise e um texto detalhado de 1 parágrafo com as recomendações, respondendo ao que é pedido na figura.
+        Formato: Um item por figura, com o identificador exatamente como informado.
+        {blocos}
+        """
+
+    def enviar(self):
+        """Envia os pedidos pendentes. Figuras que faltarem na resposta são pedidas de novo, uma por chamada."""
+        pendentes, self._pendentes = self._pendentes, []
+        if not pendentes:
+            return
+        with span("analise_figuras.lote", figuras=len(pendentes)):
+            resposta = self.llm.invoke(self._prompt(pendentes)).figuras
+        por_figura = {item.figura: item for item in resposta}
+        if not any(pedido["figura"] in por_figura for pedido in pendentes) and len(resposta) == len(pendentes):
+            # Identificadores reescritos pelo modelo, mas uma resposta por figura: vale a ordem
+            por_figura = {pedido["figura"]: item for pedido, item in zip(pendentes, resposta)}
+
+        for pedido in pendentes:
+            item = por_figura.get(pedido["figura"])
+            if item is None and len(pendentes) == 1 and resposta:
+                item = resposta[0]
+            if item is None:
+                if len(pendentes) == 1:
+                    raise ValueError(f"O LLM não devolveu a análise da {pedido['figura']}.")
+                self._pendentes = [pedido]
+                self.enviar()
+                continue
+            paragrafo_analise, paragrafo_recomendacoes = pedido["paragrafos"]
+            paragrafo_analise.texto = _sem_quebras(item.analise)
+            paragrafo_recomendacoes.texto = _sem_quebras(item.recomendacoes)
+            self.textos[pedido["figura"]] = '\n'.join([paragrafo_analise.texto, paragrafo_recomendacoes.texto])
+
 # --- Funções Auxiliares de Estilização ---
 def set_cell_shading(cell, hex_color: str):
     """Define a cor de fundo de uma célula da tabela.""" 
@@ -64,12 +164,16 @@ def set_header_style(table):
         p.alignment = 1 # WD_ALIGN_PARAGRAPH.CENTER
 
 # --- Gráficos ---
+@rastrear()
 def Secao_2_1_Figura1(client_name, df_profiles_posts):
 
+    # Máximo por perfil das três colunas, agregado uma vez só (src/analysis/ranking.py)
+    ranking_perfis = ranking(df_profiles_posts, 'username', ['followersCount', 'followsCount', 'postsCount'], "max")
+
     def plotarBarraMax(client_name, x_col, y_col, ax1, x_col_name, y_col_name):
         
         # Calcular Estatísticas
-        top_10 = df_profiles_posts.groupby([y_col])[x_col].max().sort_values(ascending=True).dropna().tail(10).reset_index()
+        top_10 = ranking_perfis.top(x_col, 10)
         
         # --- 4. Configuração do Primeiro Gráfico (Superior) ---
         # Preparar cores e rótulos para o primeiro gráfico
@@ -110,20 +214,17 @@ def Secao_2_1_Figura1(client_name, df_profiles_posts):
     # --- 6. Finalização e Exibição/Salvamento da Figura ---
     plt.tight_layout(rect=[0, 0, 1, 0.96]) # Ajusta o layout para evitar sobreposição
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # Para exibir a figura diretamente (se estiver em um ambiente interativo como Jupyter)
     plt.close()
 
-    buffer.seek(0)
-
     print("Figura 'graficos_de_barras_destacados.png' gerada com sucesso.")
 
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_1_Figura2(df_profiles_posts):
 
     def plotarFiguraNColsPCA(df_original, df_cluster, fig):
@@ -132,6 +233,9 @@ def Secao_2_1_Figura2(df_profiles_posts):
             
             cluster_columns = [column for column in df_cluster.columns if column != 'Clusters (AutoClusterHPO)']
             
+            import seaborn as sns
+            from sklearn.decomposition import PCA
+
             # Redução de dimensionalidade com PCA
             pca = PCA(n_components=2)
             df_pca = pca.fit_transform(df_original[cluster_columns])
@@ -205,8 +309,10 @@ def Secao_2_1_Figura2(df_profiles_posts):
     df_cluster = df_profiles_posts[['followersCount', 'followsCount', 'postsCount']].copy()
 
     # Inicializar e aplicar o AutoCluster
+    from notebooks.AutoClusterHPO import AutoClusterHPO
     autocluster_tool = AutoClusterHPO(max_evals_per_algo=100) 
-    df_original['Clusters (AutoClusterHPO)'], model, config, score, algo_name = autocluster_tool.fit_predict(df_cluster)
+    with span("AutoClusterHPO.fit_predict", linhas=len(df_cluster)):
+        df_original['Clusters (AutoClusterHPO)'], model, config, score, algo_name = autocluster_tool.fit_predict(df_cluster)
 
     fig = plt.figure(figsize=(16, 5))
     
@@ -215,37 +321,18 @@ def Secao_2_1_Figura2(df_profiles_posts):
     # --- 6. Finalização e Exibição/Salvamento da Figura ---
     plt.tight_layout(rect=[0, 0, 1, 0.96]) # Ajusta o layout para evitar sobreposição
 
-    buffer = io.BytesIO() 
-        
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
         
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_1_Figura3(posts_df):
 
-    def plotarNuvemPalavras():
-
-        lista_unica = []
-
-        for sublista in posts_df['hashtags']:
-            if isinstance(sublista, list):
-                for item in sublista:
-                    lista_unica.append(item)
-
-        # Seu texto aqui
-        texto = " ".join(lista_unica)
-
-        # Criar o objeto WordCloud
-        nuvem_palavras = WordCloud(width=800, height=400, background_color="white").generate(texto)
-        
-        return nuvem_palavras, pd.DataFrame(lista_unica).value_counts()
-
-    nuvem_palavras, df = plotarNuvemPalavras()
+    # Frequências normalizadas e imagem da nuvem, em cache por conjunto de posts (src/analysis/hashtags.py)
+    nuvem_palavras, df = hashtags.nuvem_de_palavras(posts_df)
 
     # Exibir a imagem gerada
     plt.figure(figsize=(16, 8))
@@ -255,23 +342,20 @@ def Secao_2_1_Figura3(posts_df):
     # --- 6. Finalização e Exibição/Salvamento da Figura ---
     plt.tight_layout(rect=[0, 0, 1, 0.96]) # Ajusta o layout para evitar sobreposição
 
-    buffer = io.BytesIO() 
-        
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
         
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, df 
 
+@rastrear()
 def Secao_2_2_Figura4(client_name, posts_df, df_profiles_posts):
  
-    def plotarBarraSum(client_name, df, x_col, y_col, ax1, fmt, x_col_name, y_col_name):
+    def plotarBarraSum(client_name, ranking_df, x_col, y_col, ax1, fmt, x_col_name, y_col_name):
         
         # Calcular Estatísticas
-        top_10 = df.groupby([y_col])[x_col].sum().sort_values(ascending=True).tail(10).reset_index()
+        top_10 = ranking_df.top(x_col, 10)
         
         # --- 4. Configuração do Primeiro Gráfico (Superior) ---
         # Preparar cores e rótulos para o primeiro gráfico
@@ -298,13 +382,17 @@ def Secao_2_2_Figura4(client_name, posts_df, df_profiles_posts):
     # --- 3. Criação da Figura e dos Gráficos (Subplots) ---
     # Cria a figura com 2 linhas e 1 coluna de gráficos
     fig, axes = plt.subplots(2, 3, figsize=(16, 5))
+
+    # Somas por perfil e por publicação calculadas uma vez; cada gráfico só seleciona o seu top 10
+    ranking_perfis = ranking(df_profiles_posts, 'username', ['likesSum', 'commentsSum', '% ENGAJAMENTO'])
+    ranking_posts = ranking(posts_df, 'shortCode', ['likesCount', 'commentsCount', 'TOTAL ENGAJAMENTO'])
        
-    top_10_likes_profiles = plotarBarraSum(client_name, df_profiles_posts, 'likesSum', 'username', axes[0, 0], '%d', 'Qtd de Curtidas', 'Usuário')
-    top_10_comments_profiles = plotarBarraSum(client_name, df_profiles_posts, 'commentsSum', 'username', axes[0, 1], '%d', 'Qtd de Comentários', 'Usuário')
-    top_10_perc_engaj_profiles = plotarBarraSum(client_name, df_profiles_posts, '% ENGAJAMENTO', 'username', axes[0, 2], '%.2f', 'Taxa de Engajamento', 'Usuário')
-    top_10_likes_posts = plotarBarraSum(client_name, posts_df, 'likesCount', 'shortCode', axes[1, 0], '%d', 'Qtd de Curtidas', 'ShortCode (Publicação)')
-    top_10_comments_posts = plotarBarraSum(client_name, posts_df, 'commentsCount', 'shortCode', axes[1, 1], '%d', 'Qtd de Comentários', 'ShortCode (Publicação)')
-    top_10_engaj_posts = plotarBarraSum(client_name, posts_df, 'TOTAL ENGAJAMENTO', 'shortCode', axes[1, 2], '%d', 'Qtd de Engajamentos', 'ShortCode (Publicação)')
+    top_10_likes_profiles = plotarBarraSum(client_name, ranking_perfis, 'likesSum', 'username', axes[0, 0], '%d', 'Qtd de Curtidas', 'Usuário')
+    top_10_comments_profiles = plotarBarraSum(client_name, ranking_perfis, 'commentsSum', 'username', axes[0, 1], '%d', 'Qtd de Comentários', 'Usuário')
+    top_10_perc_engaj_profiles = plotarBarraSum(client_name, ranking_perfis, '% ENGAJAMENTO', 'username', axes[0, 2], '%.2f', 'Taxa de Engajamento', 'Usuário')
+    top_10_likes_posts = plotarBarraSum(client_name, ranking_posts, 'likesCount', 'shortCode', axes[1, 0], '%d', 'Qtd de Curtidas', 'ShortCode (Publicação)')
+    top_10_comments_posts = plotarBarraSum(client_name, ranking_posts, 'commentsCount', 'shortCode', axes[1, 1], '%d', 'Qtd de Comentários', 'ShortCode (Publicação)')
+    top_10_engaj_posts = plotarBarraSum(client_name, ranking_posts, 'TOTAL ENGAJAMENTO', 'shortCode', axes[1, 2], '%d', 'Qtd de Engajamentos', 'ShortCode (Publicação)')
 
     dataframes = {
                     "top_10_likes_profiles": top_10_likes_profiles,
@@ -319,20 +407,17 @@ def Secao_2_2_Figura4(client_name, posts_df, df_profiles_posts):
     # --- 6. Finalização e Exibição/Salvamento da Figura ---
     plt.tight_layout(rect=[0, 0, 1, 0.96]) # Ajusta o layout para evitar sobreposição
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # Para exibir a figura diretamente (se estiver em um ambiente interativo como Jupyter)
     plt.close()
 
-    buffer.seek(0)
-
     print("Figura 'graficos_de_barras_destacados.png' gerada com sucesso.")
 
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_2_Figura5(dados_pivot_count, dados_pivot_total):   
 
     def plotarBarrasAgrupadas(dados_pivot, x_column, y_column, group_column, ax, x_column_name, y_column_name):
@@ -399,18 +484,15 @@ def Secao_2_2_Figura5(dados_pivot_count, dados_pivot_total):
     # Ajusta o layout para garantir que nada (como a legenda) seja cortado
     fig.tight_layout()
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # 7. Exibir o gráfico
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_2_Figura6(dados_pivot_likes, dados_pivot_comments):
 
     def plotarBarrasAgrupadas(dados_pivot, x_column, y_column, group_column, ax, x_column_name, y_column_name):
@@ -473,18 +555,15 @@ def Secao_2_2_Figura6(dados_pivot_likes, dados_pivot_comments):
     # Ajusta o layout para garantir que nada (como a legenda) seja cortado
     fig.tight_layout()
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # 7. Exibir o gráfico
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_3_Figura7(client_name, periodo_df, dias_df):
 
     def plotarBarraSum(top_10, x_col, y_col, ax1, fmt, x_col_name, y_col_name):
@@ -517,20 +596,17 @@ def Secao_2_3_Figura7(client_name, periodo_df, dias_df):
     # --- 6. Finalização e Exibição/Salvamento da Figura ---
     plt.tight_layout(rect=[0, 0, 1, 0.96]) # Ajusta o layout para evitar sobreposição
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # Para exibir a figura diretamente (se estiver em um ambiente interativo como Jupyter)
     plt.close()
 
-    buffer.seek(0)
-
     print("Figura 'graficos_de_barras_destacados.png' gerada com sucesso.")
 
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_3_Figura8(dados_pivot_periodos, dados_pivot_dias):
 
     def plotarBarrasAgrupadas(dados_pivot, x_column, y_column, group_column, ax, x_column_name, y_column_name):
@@ -600,18 +676,15 @@ def Secao_2_3_Figura8(dados_pivot_periodos, dados_pivot_dias):
     # Ajusta o layout para garantir que nada (como a legenda) seja cortado
     fig.tight_layout()
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # 7. Exibir o gráfico
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, dataframes
 
+@rastrear()
 def Secao_2_3_Figura9(dados_pivot_periodos, dados_pivot_dias):
 
     def plotarBarrasAgrupadas(dados_pivot, x_column, y_column, group_column, ax, x_column_name, y_column_name):
@@ -681,58 +754,63 @@ def Secao_2_3_Figura9(dados_pivot_periodos, dados_pivot_dias):
     # Ajusta o layout para garantir que nada (como a legenda) seja cortado
     fig.tight_layout()
 
-    buffer = io.BytesIO() 
-    
-    # Para salvar a figura em um arquivo
-    plt.savefig(buffer, format='png', dpi=300)
+    # Resolução calculada para a largura em que a figura entra no documento
+    buffer = salvar_figura(LARGURA_FIGURA)
 
     # 7. Exibir o gráfico
     plt.close()
 
-    buffer.seek(0)
-
     return buffer, dataframes
 
 # --- Análises de Gráficos ---
       
-def analisarFigura1(llm, document, client_name, dataframes):
+@rastrear()
+def analisarFigura1(llm, relatorio, client_name, dataframes, lote=None):
             
-    document.add_paragraph(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes da {client_name}, "
+    relatorio.adicionar_paragrafo(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes da {client_name}, "
                         "segundo os indicadores seguidores, seguindo, quantidade de posts e de contagem de hashtags, "
                         "tanto a nível de perfil quanto a nível de publicações.")
         
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_1_Figura1(client_name, dataframes['df_profiles_posts'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Dados dos Top 10 concorrentes mais seguidores: {serializar_tabela(dict_df['followers'])}
+
+        Dados dos Top 10  concorrentes mais seguindo pessoas: {serializar_tabela(dict_df['follows'])}
+
+        Dados dos Top 10  concorrentes com mais publicações: {serializar_tabela(dict_df['posts_count'])}
+    """
+
+    bio_cols = ['username', 'fullName', 'biography', 'externalUrl']        
+    usernames = dict_df['followers']['username'].unique()
+    profiles_df = dataframes['df_profiles_posts']
+    df_bios = profiles_df[profiles_df['username'].isin(usernames)][bio_cols]
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_1",
+            pergunta_analise="Produza uma análise exclusivamente descritiva dos dados dos gráficos de barras.",
+            pergunta_recomendacoes="Analise o posicionamento dos melhores concorrentes pelas biografias: estão claras? Explicam o que as marcas fazem? Usam CTAs ou emojis estratégicos?",
+            inicio_analise="Segundo os gráficos acima...",
+            inicio_recomendacoes="Com base nas análises das biografias dos concorrentes, foi possível perceber...",
+            dados=f"{dados}\n        Biografias: {serializar_tabela(df_bios)}",
+        )
+        return
 
     # Gerar Análise dos Dados da Figura 1 
-    textos_analises = []
-                
     prompt = f"""
         Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
         Contexto: Produza uma análise exclusivamente descritiva detalhada dos dados do gráfico de barras abaixo. 
         Tarefa: Gere um texto científico detalhado de 1 parágrafo com sua análise. 
         Formato: Responda apenas o parágrafo da análise.
         Requisito: Inicie o texto dizendo "Segundo os gráficos acima...
-        
-        Dados dos Top 10 concorrentes mais seguidores: {dict_df['followers']}
-
-        Dados dos Top 10  concorrentes mais seguindo pessoas: {dict_df['follows']}
-
-        Dados dos Top 10  concorrentes com mais publicações: {dict_df['posts_count']}
-    
+        {dados}
     """
             
     analise = llm.invoke(prompt)
-    document.add_paragraph(analise.content.replace('\n',''))  
-            
-    bio_cols = ['username', 'fullName', 'biography', 'externalUrl']        
-    usernames = dict_df['followers']['username'].unique()
-    profiles_df = dataframes['df_profiles_posts']
-    df_bios = profiles_df[profiles_df['username'].isin(usernames)][bio_cols]
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))  
     
     # Gerar Recomendações            
     prompt = f"""
@@ -742,27 +820,25 @@ def analisarFigura1(llm, document, client_name, dataframes):
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Com base nas análises das biuografias dos concorrentes, foi possível perceber...". 
         
-        Biografias: {df_bios}
+        Biografias: {serializar_tabela(df_bios)}
     
         """
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')])
 
-def analisarFigura2(llm, document, dataframes):
-    document.add_paragraph(f"Na análise que se segue, será possível perceber uma visão geral sobre os concorrentes "
+@rastrear()
+def analisarFigura2(llm, relatorio, dataframes):
+    relatorio.adicionar_paragrafo(f"Na análise que se segue, será possível perceber uma visão geral sobre os concorrentes "
                         "por meio dos resultados de uma análise de clusterização. Esta análise é um tipo de análise estatística que "
                         "tem o objetivo de encontrar padrões ocultos em conjuntos de dados. Com ela, será possível perceber "
                         "quais concorrentes tem comportamentos parecidos no que diz respeito a Seguidores, Seguindo e Quantidade de Posts, sendo possível assim "
                         " a segmentação dos concorrentes em poucos grupos com alto grau de similaridade entre si.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_1_Figura2(dataframes['df_profiles_posts'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
 
     # Gerar Análise dos Dados da Figura 1
     textos_analises = []
@@ -783,14 +859,14 @@ def analisarFigura2(llm, document, dataframes):
                 Tarefa: Gere um texto científico detalhado de 1 parágrafo com sua análise. 
                 Formato: Responda apenas o parágrafo da análise.
                 Requisito: Inicie o texto dizendo {inicio}.
-                Dados: {df}
+                Dados: {serializar_tabela(df)}
         """
             
         analise = llm.invoke(prompt)
         textos_analises.append(analise.content)
             
     analise_figura_1 = ' '.join(textos_analises)
-    document.add_paragraph('\n'.join(textos_analises))
+    relatorio.adicionar_paragrafo('\n'.join(textos_analises))
 
     prompt = f"""
                 Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -804,20 +880,29 @@ def analisarFigura2(llm, document, dataframes):
     print()
     recomendacoes = llm.invoke(prompt)
     print(f'Recomendações: {recomendacoes.content}')
-    document.add_paragraph(recomendacoes.content) 
+    relatorio.adicionar_paragrafo(recomendacoes.content) 
             
-def analisarFigura3(llm, client_name, document, dataframes):
-    document.add_paragraph(f" Na análise seguinte, será possível perceber uma visão geral sobre as hashtags utilizadas pelos concorrentes "
+@rastrear()
+def analisarFigura3(llm, client_name, relatorio, dataframes, lote=None):
+    relatorio.adicionar_paragrafo(f" Na análise seguinte, será possível perceber uma visão geral sobre as hashtags utilizadas pelos concorrentes "
                                 "por meio de uma nuvem de palavras. Uma nuvem de palavras (ou word cloud) é uma representação visual de texto onde "
                                 "as palavras mais frequentes aparecem em destaque, com um tamanho maior ou cor diferente, enquanto as menos comuns "
                                 "são menores. É usada para identificar rapidamente os termos mais importantes ou populares em um conjunto de dados textuais.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, df = Secao_2_1_Figura3(dataframes['posts_df'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_3",
+            pergunta_analise="Quais são as hashtags mais e menos utilizadas pelos concorrentes?",
+            pergunta_recomendacoes="Quais hashtags o cliente deve utilizar no instagram? Justifique segundo os dados.",
+            inicio_analise="De acordo com a nuvem de palavras acima...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=serializar_tabela(df),
+        )
+        return
 
     # Gerar Análise dos Dados da Figura 1 
     prompt = f"""
@@ -826,11 +911,11 @@ def analisarFigura3(llm, client_name, document, dataframes):
         Tarefa: Gere um texto científico detalhado de 1 parágrafo com sua análise. 
         Formato: Responda apenas os parágrafos da análise.
         Requisito: Inicie o texto dizendo "De acordo com a nuvem de palavras acima...".
-        Dados: {df}
+        Dados: {serializar_tabela(df)}
     """
             
     analise = llm.invoke(prompt)
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -838,25 +923,55 @@ def analisarFigura3(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com suas recomendações. 
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-        Analises: {analise.content.replace('\n','')}
+        Analises: {_sem_quebras(analise.content)}
     """
 
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')])
   
-def analisarFigura4(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura4(llm, client_name, relatorio, dataframes, lote=None):
             
-    document.add_paragraph(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes do negócio, "
+    relatorio.adicionar_paragrafo(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes do negócio, "
                                 "segundo os indicadores de engajamento, tanto a nível de perfil quanto a nível de publicações.")
         
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_2_Figura4(client_name, dataframes['posts_df'], dataframes['df_profiles_posts'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    posts_df = dataframes['posts_df']
+
+    list_posts = dict_df['top_10_engaj_posts']['shortCode'].unique()
+    cols_content = ['shortCode', 'caption', 'hashtags', 'mentions', 'firstComment', 'latestComments']
+    df_content = posts_df[posts_df['shortCode'].isin(list_posts)][cols_content]
+
+    if lote is not None:
+        # Em lote, a análise cobre perfis e publicações e as recomendações, o conteúdo das melhores publicações
+        lote.adicionar(
+            relatorio, "figura_4",
+            pergunta_analise="Quem são os concorrentes e quais são as publicações com a maior quantidade de likes, comentários e taxa de engajamento?",
+            pergunta_recomendacoes="Qual exatamente é o conteúdo das publicações com maior engajamento? O que as pessoas comentaram sobre o conteúdo?",
+            inicio_analise="De acordo com os gráficos da figura acima...",
+            inicio_recomendacoes="Quanto ao conteúdo das publicações,...",
+            dados=f"""
+            Top 10 perfis com maior quantidade de likes: {serializar_tabela(dict_df['top_10_likes_profiles'])}
+
+            Top 10 perfis com maior quantidade de comments: {serializar_tabela(dict_df['top_10_comments_profiles'])}
+
+            Top 10 perfis com maior percentual de engajamento: {serializar_tabela(dict_df['top_10_perc_engaj_profiles'])}
+
+            Top 10 publicações com maior quantidade de likes: {serializar_tabela(dict_df['top_10_likes_posts'])}
+
+            Top 10 publicações com maior quantidade de comments: {serializar_tabela(dict_df['top_10_comments_posts'])}
+
+            Top 10 publicações com maior percentual de engajamento: {serializar_tabela(dict_df['top_10_engaj_posts'])}
+
+            Publicações com maior engajamento: {serializar_tabela(df_content)}
+            """,
+        )
+        return
                 
     prompt_perfis = f"""
             Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -865,15 +980,15 @@ def analisarFigura4(llm, client_name, document, dataframes):
             Formato: Responda apenas o parágrafo da resposta.
             Requisito: Inicie o texto dizendo "De acordo com os 3 primeiros gráficos da figura acima...".
             
-            Top 10 perfis com maior quantidade de likes: {dict_df['top_10_likes_profiles']}
+            Top 10 perfis com maior quantidade de likes: {serializar_tabela(dict_df['top_10_likes_profiles'])}
 
-            Top 10 perfis com maior quantidade de comments: {dict_df['top_10_comments_profiles']}
+            Top 10 perfis com maior quantidade de comments: {serializar_tabela(dict_df['top_10_comments_profiles'])}
 
-            Top 10 perfis com maior quantidade de percentual de engajamento: {dict_df["top_10_perc_engaj_profiles"]}
+            Top 10 perfis com maior quantidade de percentual de engajamento: {serializar_tabela(dict_df['top_10_perc_engaj_profiles'])}
     """
             
     analise_perfis = llm.invoke(prompt_perfis)            
-    document.add_paragraph(analise_perfis.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise_perfis.content.replace('\n',''))
 
     prompt_posts = f"""
             Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -882,21 +997,15 @@ def analisarFigura4(llm, client_name, document, dataframes):
             Formato: Responda apenas o parágrafo da resposta.
             Requisito: Inicie o texto dizendo "Já de acordo com os 3 últimos gráficos da figura acima...".
             
-            Top 10 perfis com maior quantidade de likes: {dict_df['top_10_likes_posts']}
+            Top 10 perfis com maior quantidade de likes: {serializar_tabela(dict_df['top_10_likes_posts'])}
 
-            Top 10 perfis com maior quantidade de comments: {dict_df['top_10_comments_posts']}
+            Top 10 perfis com maior quantidade de comments: {serializar_tabela(dict_df['top_10_comments_posts'])}
 
-            Top 10 perfis com maior quantidade de percentual de engajamento: {dict_df['top_10_engaj_posts']}
+            Top 10 perfis com maior quantidade de percentual de engajamento: {serializar_tabela(dict_df['top_10_engaj_posts'])}
     """
             
     analise_posts = llm.invoke(prompt_posts)            
-    document.add_paragraph(analise_posts.content.replace('\n',''))
-
-    posts_df = dataframes['posts_df']
-
-    list_posts = dict_df['top_10_engaj_posts']['shortCode'].unique()
-    cols_content = ['shortCode', 'caption', 'hashtags', 'mentions', 'firstComment', 'latestComments']
-    df_content = posts_df[posts_df['shortCode'].isin(list_posts)][cols_content]
+    relatorio.adicionar_paragrafo(analise_posts.content.replace('\n',''))
     
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em análise de conteúdo. 
@@ -904,25 +1013,40 @@ def analisarFigura4(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com suas análises. 
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Quanto ao conteúdo das publicações,..."
-        Publicações: {df_content}
+        Publicações: {serializar_tabela(df_content)}
     """
             
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise_perfis.content.replace('\n',''), analise_posts.content.replace('\n',''), recomendacoes.content.replace('\n','')])
 
-def analisarFigura5(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura5(llm, client_name, relatorio, dataframes, lote=None):
     
-    document.add_paragraph(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
+    relatorio.adicionar_paragrafo(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
                                 "os concorrentes mais utilizam, bem como os que mais geraram engajamento.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_2_Figura5(dataframes['dados_pivot_count'], dataframes['dados_pivot_total'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Quantidade de posts por tipo dos 3 melhores concorrentes: {serializar_tabela(dict_df['Type'])}
+
+        Quantidade de Interações por tipo dos 3 melhores concorrentes: {serializar_tabela(dict_df['total'])}
+    """
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_5",
+            pergunta_analise="Quais são os formatos mais utilizados e que mais geram engajamento para os concorrentes?",
+            pergunta_recomendacoes="Quais formatos de conteúdo o cliente deve explorar no instagram? Justifique cada um.",
+            inicio_analise="No gráfico acima, é possível perceber que...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=dados,
+        )
+        return
                 
     prompt = f"""
         Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -931,14 +1055,12 @@ def analisarFigura5(llm, client_name, document, dataframes):
         Formato: Responda apenas o parágrafo da análise.
         Requisito: Inicie o texto dizendo "No gráfico acima, é possível perceber que...".
         
-        Quantidade de posts por tipo dos 3 melhores concorrentes: {dict_df['Type']}
-        
-        Quantidade de Interações por tipo dos 3 melhores concorrentes: {dict_df['total']}
-    
+        {dados}
+
     """
             
     analise = llm.invoke(prompt)
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -946,25 +1068,40 @@ def analisarFigura5(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com suas recomendações. 
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-        Analises: {analise.content.replace('\n','')}
+        Analises: {_sem_quebras(analise.content)}
     """
             
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content)
+    relatorio.adicionar_paragrafo(recomendacoes.content)
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')]) 
 
-def analisarFigura6(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura6(llm, client_name, relatorio, dataframes, lote=None):
     
-    document.add_paragraph(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
+    relatorio.adicionar_paragrafo(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
                                 "mais geraram curtidas e comentários para os concorrentes.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_2_Figura6(dataframes['dados_pivot_likes'], dataframes['dados_pivot_comments'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Proporção de comentários dos 3 melhores concorrentes por tipo de publicação: {serializar_tabela(dict_df['comments'])}
+
+        Proporção de likes dos 3 melhores concorrentes por tipo de publicação: {serializar_tabela(dict_df['likes'])}
+    """
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_6",
+            pergunta_analise="Quais foram os tipos de conteúdo que mais geraram likes e comentários para os 3 melhores concorrentes?",
+            pergunta_recomendacoes="Quais tipos de conteúdo o cliente deve publicar no instagram para gerar engajamento? Justifique cada um.",
+            inicio_analise="De acordo com os gráficos acima...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=dados,
+        )
+        return
                 
     prompt = f"""
         Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -973,13 +1110,11 @@ def analisarFigura6(llm, client_name, document, dataframes):
         Formato: Responda apenas o parágrafo da análise.
         Requisito: Inicie o texto dizendo "De acordo com os gráficos acima...".
         
-        Proporção de comentários dos 3 melhores concorrentes por tipo de publicação: {dict_df['comments']}
-        
-        Proporção de likes dos 3 melhores concorrentes por tipo de publicação: {dict_df['likes']}
-    """
+        {dados}
+"""
             
     analise = llm.invoke(prompt)            
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -987,24 +1122,39 @@ def analisarFigura6(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com suas recomendações. 
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-        Analises: {analise.content.replace('\n','')}
+        Analises: {_sem_quebras(analise.content)}
     """
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')]) 
 
-def analisarFigura7(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura7(llm, client_name, relatorio, dataframes, lote=None):
             
-    document.add_paragraph(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes do negócio, "
+    relatorio.adicionar_paragrafo(f"A figura abaixo nos dá uma visão geral sobre quem são os melhores concorrentes do negócio, "
                                 "segundo os indicadores de engajamento, tanto a nível de perfil quanto a nível de publicações.")
         
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_3_Figura7(client_name, dataframes['periodo_df'], dataframes['dias_df'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Quantidade de publicações pelo periodo do dia: {serializar_tabela(dict_df['periodos'])}
+
+        Quantidade de publicações pelo dia da semana: {serializar_tabela(dict_df['dias'])}
+    """
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_7",
+            pergunta_analise="Quais períodos e dias da semana os concorrentes mais publicam?",
+            pergunta_recomendacoes="Quais os melhores dias e períodos para o cliente publicar no instagram? Justifique cada um.",
+            inicio_analise="De acordo com os gráficos acima...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=dados,
+        )
+        return
     
     prompt = f"""
         Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1013,13 +1163,11 @@ def analisarFigura7(llm, client_name, document, dataframes):
         Formato: Responda apenas o parágrafo da análise.
         Requisito: Inicie o texto dizendo "De acordo com os gráficos acima...".
         
-        Quantidade de publicações pelo periodo do dia: {dict_df['periodos']}
-        
-        Quantidade de publicações pelo dia da semana: {dict_df['dias']}
-    """
+        {dados}
+"""
             
     analise = llm.invoke(prompt)            
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1027,25 +1175,38 @@ def analisarFigura7(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com sua resposta. 
         Formato: Responda apenas o parágrafo das respostas.
         Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-        Analises: {analise.content.replace('\n','')}
+        Analises: {_sem_quebras(analise.content)}
     """
             
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')])
 
-def analisarFigura8(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura8(llm, client_name, relatorio, dataframes, lote=None):
     
-    document.add_paragraph(f"Na análise que se segue, será possível perceber uma visão geral sobre a proporção de formatos pelo dia da semana, "
+    relatorio.adicionar_paragrafo(f"Na análise que se segue, será possível perceber uma visão geral sobre a proporção de formatos pelo dia da semana, "
                                 "com o objetivo de compreender em qual proporção os concorrentes publicam cada um dos tipos de conteúdos.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_3_Figura8(dataframes['dados_pivot_periodos'], dataframes['dados_pivot_dias'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Quantidade de posts por tipo e dias da semana: {serializar_tabela(dict_df['dias'])}
+    """
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_8",
+            pergunta_analise="Quais os tipos de conteúdo mais postados pelos concorrentes em cada dia da semana?",
+            pergunta_recomendacoes="Qual a proporção de tipos de conteúdo nos dias da semana que o cliente deveria ter no instagram? Justifique.",
+            inicio_analise="De acordo com o gráfico acima...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=dados,
+        )
+        return
                 
     prompt = f"""
             Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1054,12 +1215,12 @@ def analisarFigura8(llm, client_name, document, dataframes):
             Formato: Responda apenas o parágrafo da análise.
             Requisito: Inicie o texto dizendo 'De acordo com o gráfico acima...'.
     
-            Quantidade de posts por tipo e dias da semana: {dict_df['dias']}
+        {dados}
 
     """
             
     analise = safe_invoke(llm, prompt)        
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
                 Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1067,25 +1228,38 @@ def analisarFigura8(llm, client_name, document, dataframes):
                 Tarefa: Gere um texto detalhado de 1 parágrafo com suas recomendações. 
                 Formato: Responda apenas o parágrafo das recomendações.
                 Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-                Analises: {analise.content.replace('\n','')}
+                Analises: {_sem_quebras(analise.content)}
             """
             
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')]) 
 
-def analisarFigura9(llm, client_name, document, dataframes):
+@rastrear()
+def analisarFigura9(llm, client_name, relatorio, dataframes, lote=None):
             
-    document.add_paragraph(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
+    relatorio.adicionar_paragrafo(f"Na análise que se segue, será possível perceber uma visão geral sobre quais os formatos de conteúdo "
                                 "mais publicados por periodo, com o objetivo se se compreender esta relação.")
             
     # Adiciona Figura 1
-    paragrafo_da_imagem = document.add_paragraph()
-    paragrafo_da_imagem.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_da_imagem = paragrafo_da_imagem.add_run() 
     chart_buffer, dict_df = Secao_2_3_Figura9(dataframes['dados_pivot_periodos'], dataframes['dados_pivot_dias'])
-    run_da_imagem.add_picture(chart_buffer, width=Inches(6))
+    relatorio.adicionar_imagem(chart_buffer, LARGURA_FIGURA)
+
+    dados = f"""
+        Dados: {serializar_tabela(dict_df['periodos'])}
+    """
+
+    if lote is not None:
+        lote.adicionar(
+            relatorio, "figura_9",
+            pergunta_analise="Quais os tipos de conteúdo mais postados pelos concorrentes em cada período do dia?",
+            pergunta_recomendacoes="Qual a proporção de tipos de conteúdo nos períodos que o cliente deveria ter no instagram? Justifique.",
+            inicio_analise="Segundo o gráfico acima...",
+            inicio_recomendacoes="Com base nas análises acima...",
+            dados=dados,
+        )
+        return
                 
     prompt = f"""
             Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1094,11 +1268,11 @@ def analisarFigura9(llm, client_name, document, dataframes):
             Formato: Responda apenas o parágrafo da análise.
             Requisito: Inicie o texto dizendo "Segundo o gráfico acima...".
             
-            Dados: {dict_df['periodos']}
+        {dados}
     """
             
     analise = safe_invoke(llm, prompt)
-    document.add_paragraph(analise.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(analise.content.replace('\n',''))
 
     prompt = f"""
         Persona: Você é um estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
@@ -1106,180 +1280,207 @@ def analisarFigura9(llm, client_name, document, dataframes):
         Tarefa: Gere um texto detalhado de 1 parágrafo com suas recomendações. 
         Formato: Responda apenas o parágrafo das recomendações.
         Requisito: Inicie o texto dizendo "Com base nas análises acima..."
-        Analises: {analise.content.replace('\n','')}
+        Analises: {_sem_quebras(analise.content)}
     """
             
     recomendacoes = llm.invoke(prompt)
-    document.add_paragraph(recomendacoes.content.replace('\n',''))
+    relatorio.adicionar_paragrafo(recomendacoes.content.replace('\n',''))
 
     return '\n'.join([analise.content.replace('\n',''), recomendacoes.content.replace('\n','')]) 
 
-# --- Funções de Formatação ---
-
-def definir_estilos(document):
-    """
-    Centraliza todas as modificações de estilo do documento para garantir consistência.
-    """
-    # 1. ALTERAR A FONTE PADRÃO (ESTILO 'NORMAL')
-    estilo_normal = document.styles['Normal']
-    fonte_normal = estilo_normal.font
-    fonte_normal.name = 'Abadi'
-    fonte_normal.size = Pt(11)
-
-    # 2. ALTERAR ESTILO DO TÍTULO PRINCIPAL (NÍVEL 1)
-    # Usado pela função `gerarCapa` e outros títulos de nível 1
-    estilo_h1 = document.styles['Heading 1']
-    fonte_h1 = estilo_h1.font
-    fonte_h1.name = 'Abadi'
-    fonte_h1.size = Pt(22)
-    fonte_h1.bold = True
-    fonte_h1.color.rgb = RGBColor(0x0A, 0x25, 0x40)
-    paragrafo_h1 = estilo_h1.paragraph_format
-    paragrafo_h1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    paragrafo_h1.space_before = Pt(12)
-    paragrafo_h1.space_after = Pt(12)
-
-    # 3. ALTERAR ESTILO DOS SUBTÍTULOS (NÍVEL 2)
-    estilo_h2 = document.styles['Heading 2']
-    fonte_h2 = estilo_h2.font
-    fonte_h2.name = 'Abadi'
-    fonte_h2.size = Pt(14)
-    fonte_h2.bold = True
-    fonte_h2.color.rgb = RGBColor(0x0A, 0x25, 0x40)  # Azul corporativo
-    paragrafo_h2 = estilo_h2.paragraph_format
-    paragrafo_h2.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    paragrafo_h2.space_before = Pt(18)
-    paragrafo_h2.space_after = Pt(6)
-
-    # 4. ALTERAR ESTILO DOS TÍTULOS DE TÓPICOS (NÍVEL 3)
-    estilo_h3 = document.styles['Heading 3']
-    fonte_h3 = estilo_h3.font
-    fonte_h3.name = 'Abadi'
-    fonte_h3.size = Pt(12)
-    fonte_h3.bold = True
-    fonte_h3.color.rgb = RGBColor(0x0A, 0x25, 0x40)
-    paragrafo_h3 = estilo_h3.paragraph_format
-    paragrafo_h3.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    paragrafo_h3.space_before = Pt(10)
-    paragrafo_h3.space_after = Pt(4)
-
-def gerarCapa(document, titulo, cliente, autor, data):
+# --- Seções Regeneráveis ---
+
+ANALISES_FIGURAS = {
+    "figura_1": analisarFigura1,
+    "figura_3": analisarFigura3,
+    "figura_4": analisarFigura4,
+    "figura_5": analisarFigura5,
+    "figura_6": analisarFigura6,
+    "figura_7": analisarFigura7,
+    "figura_8": analisarFigura8,
+    "figura_9": analisarFigura9,
+}
+
+def _analisar_figura(chave, llm, relatorio, client_name, dataframes, lote=None):
+    """Executa a análise da figura dentro da seção `chave` e guarda o texto dela para a conclusão."""
+    funcao = ANALISES_FIGURAS[chave]
+    with relatorio.secao(chave):
+        if funcao is analisarFigura1:
+            texto = analisarFigura1(llm, relatorio, client_name, dataframes, lote)
+        else:
+            texto = funcao(llm, client_name, relatorio, dataframes, lote)
+    if texto is not None: # Em lote, o texto só existe depois do envio (LoteAnalises.textos)
+        relatorio.textos[chave] = texto
+
+@rastrear()
+def _gerar_conclusao(llm, relatorio, client_name):
+    # Cada seção recebe uma fatia igual do orçamento do prompt da conclusão
+    textos_secoes = [relatorio.textos[chave] for chave in ANALISES_FIGURAS if chave in relatorio.textos]
+    tokens_por_secao = settings.PROMPT_MAX_TOKENS_CONCLUSAO // max(1, len(textos_secoes))
+    analises = '\n'.join(limitar_texto(texto, tokens_por_secao) for texto in textos_secoes)
+
+    with relatorio.secao("conclusao"):
+        relatorio.adicionar_titulo("3.0 Conclusões\Recomendações Finais", 2)
+
+        prompt = f""" 
+            Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
+            Contexto: Com base em todas essas analises, gere um conclusão e resuma todas as recomendações dadas a empresa "{client_name}". 
+            Tarefa: Gere um texto detalhado de 1 parágrafo com suas conclusões e recomendações finais. 
+            Formato: Responda apenas o parágrafo da análise.
+            Requisito: Inicie o texto dizendo "Com base em todas as análises realizadas...".
+            
+            Análises: {analises}
+             
+        """ 
+
+        conclusao = llm.invoke(prompt)
+        relatorio.adicionar_paragrafo(conclusao.content.replace('\n',''))
+    relatorio.textos["conclusao"] = conclusao.content.replace('\n','')
+
+def _reaproveitar_secao(relatorio, retomada, chave) -> bool:
+    """Copia a seção `chave` do checkpoint `retomada`, se ela já tinha sido concluída (texto do LLM salvo)."""
+    if retomada is None or chave not in retomada.textos:
+        return False
+    relatorio.substituir_secao(chave, retomada.blocos_da_secao(chave))
+    relatorio.textos[chave] = retomada.textos[chave]
+    return True
+
+def _checkpoint(relatorio, lote=None):
+    """Grava o modelo com as seções concluídas até aqui (em lote, só as figuras de lotes já enviados)."""
+    if lote is not None:
+        relatorio.textos.update({figura: texto for figura, texto in lote.textos.items() if texto is not None})
+    with span("relatorio.checkpoint"):
+        return salvar_modelo(relatorio)
+
+@rastrear()
+def regenerar_secao(relatorio, secao, llm, dataframes=None, output_path=None):
     """
-    Gera a capa do documento Word. A formatação do título vem do estilo 'Heading 1'.
+    Refaz só uma seção de um relatório já gerado ("figura_7", ..., ou "conclusao") e, com `output_path`,
+    renderiza o documento de novo. As demais seções (textos do LLM e figuras) vêm do modelo salvo.
+    A conclusão não é refeita automaticamente quando uma figura muda: regenere "conclusao" em seguida se preciso.
     """
-    # 1. Adicionar a logo da empresa na capa
-    p_logo = document.add_paragraph()
-    p_logo.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    run_logo = p_logo.add_run()
-    # CORREÇÃO: Usando um valor sensato para a largura, como 6 cm.
-    run_logo.add_picture(str(settings.LOGO_PATH), width=Cm(6))
-
-    # 2. Título do Relatório (usa o estilo 'Heading 1' definido anteriormente)
-    document.add_heading(titulo, level=1)
-
-    # 3. Informações do Cliente e Autor
-    document.add_paragraph() # Espaçamento
-    p_info = document.add_paragraph()
-    p_info.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p_info.add_run(f'Preparado para:\n').bold = True
-    p_info.add_run(f'{cliente}\n\n')
-    p_info.add_run(f'Análise por:\n').bold = True
-    p_info.add_run(f'{autor}\n\n')
-
-    # 4. Data
-    p_data = document.add_paragraph()
-    p_data.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p_data.add_run(data)
-    document.add_page_break()
+    parcial = Relatorio(titulo=relatorio.titulo)
+    if secao == "conclusao":
+        parcial.textos = relatorio.textos
+        _gerar_conclusao(llm, parcial, relatorio.cliente)
+    else:
+        _analisar_figura(secao, llm, parcial, relatorio.cliente, dataframes)
+        relatorio.textos[secao] = parcial.textos[secao]
+    relatorio.substituir_secao(secao, parcial.blocos_da_secao(secao))
+
+    salvar_modelo(relatorio)
+    if output_path:
+        with span("document.save"):
+            salvar(relatorio, output_path)
+    return relatorio
 
 # --- Função Principal de Geração de Relatório ---
-def generate_full_report(llm, dataframes, client_name, output_path, template_path):
+@rastrear()
+def generate_full_report(llm, dataframes, client_name, output_path, template_path, llm_conclusao=None,
+                         figuras_por_lote=None, execucao=None):
     
-    """Gera o relatório completo em .docx."""
+    """
+    Gera o relatório completo em .docx (ou .html/.pdf, pela extensão de `output_path`) e devolve o `Relatorio`,
+    que também é salvo em settings.RELATORIOS_MODELOS_PATH para que uma seção possa ser refeita (`regenerar_secao`).
+    `llm` faz as análises de cada figura; `llm_conclusao` (padrão: o mesmo `llm`) escreve a conclusão final,
+    permitindo usar um modelo mais forte só nessa etapa.
+    Com `figuras_por_lote` > 1 (padrão: settings.RELATORIO_FIGURAS_POR_LOTE do provedor de `llm`), as análises
+    de várias figuras são pedidas numa única chamada estruturada (LoteAnalises).
+
+    O modelo é gravado a cada seção concluída (figuras e textos do LLM), com a chave `execucao`. Se a geração
+    falhar, chamar de novo com a mesma `execucao` retoma do checkpoint: as seções prontas são copiadas dele e só
+    as que faltam são refeitas antes da montagem final do documento.
+    """
    
-    # Criar Documento
-    document = Document(settings.TEMPLATE_PATH)
-
-    definir_estilos(document)
-
     # Definir Informações do Cliente
     titulo_analise = "Análise de Concorrentes no Instagram"
     nome_cliente = client_name
     nome_autor = "Equipe AI Social"
-    data_analise = f"{date.today().strftime("%A, %d de %B de %Y")}"
+    data_analise = date.today().strftime("%A, %d de %B de %Y")
+
+    if figuras_por_lote is None:
+        figuras_por_lote = figuras_por_lote_do_provedor(llm)
+    lote = LoteAnalises(llm, client_name, figuras_por_lote) if figuras_por_lote > 1 else None
+
+    # Criar Documento (os estilos do template são aplicados na renderização, src/reporting/documento.py)
+    relatorio = Relatorio(titulo=titulo_analise, nome="concorrentes", cliente=client_name,
+                          execucao=execucao or nova_execucao(), template=str(template_path or settings.TEMPLATE_PATH))
+    checkpoint = caminho_modelo(client_name, relatorio.nome, relatorio.execucao)
+    retomada = carregar_modelo(checkpoint) if os.path.exists(checkpoint) else None
+    if retomada is not None:
+        print(f"Retomando a execução {relatorio.execucao}; seções prontas: {', '.join(retomada.textos)}")
+    else:
+        print(f"Execução {relatorio.execucao} (checkpoints em {checkpoint})")
+
+    def analisar(chave):
+        if not _reaproveitar_secao(relatorio, retomada, chave):
+            _analisar_figura(chave, llm, relatorio, client_name, dataframes, lote)
+            _checkpoint(relatorio, lote)
 
     # Gerar Relatório:
     
     # Capa e Resumo
-    gerarCapa(document, titulo_analise, nome_cliente, nome_autor, data_analise) 
+    with relatorio.secao("capa"):
+        relatorio.adicionar_capa(titulo_analise, nome_cliente, nome_autor, data_analise)
     
     # 1. Introdução
-    document.add_heading("1.0 Introdução", level=2)
+    relatorio.adicionar_titulo("1.0 Introdução", 2)
     intro = ('Este relatório apresenta uma análise competitiva aprofundada do Instagram, '
          'utilizando uma metodologia baseada em dados para desvendar as táticas e o '
          'desempenho dos concorrentes. A pesquisa visa transformar dados brutos em '
          'inteligência acionável, aprofundando-se no que impulsiona o engajamento, '
          'quais formatos e temas de conteúdo geram maior interação, e quais os '
          'melhores horários para publicação. ')
-    document.add_paragraph(intro) 
+    relatorio.adicionar_paragrafo(intro) 
 
     # 2. Analise de Concorrentes
-    document.add_heading("2.0 Análise dos Concorrentes", level=2)
+    relatorio.adicionar_titulo("2.0 Análise dos Concorrentes", 2)
     texto_secao_2_1 = (f"Nesta seção será realizada uma análise comparativa entre os concorrentes do {nome_cliente}, "
             "a fim de traçar os seus perfis. Além de serem analisadas métricas de performance, frequência e recência, "
             "também serão analisados, qualitativamente, seus respectivos conteúdos, bem como o tom de voz, tópicos frequentes "
             "e posicionamento de marca. ")       
     
-    document.add_paragraph(texto_secao_2_1)
+    relatorio.adicionar_paragrafo(texto_secao_2_1)
     
     # 2.1 Análise de Perfil dos Concorrentes
-    document.add_heading("2.1 Análise de Perfil dos Concorrentes", level=3)
-    analises_figura_1 = analisarFigura1(llm, document, client_name, dataframes)
-    analises_figura_3 = analisarFigura3(llm, client_name, document, dataframes)
+    relatorio.adicionar_titulo("2.1 Análise de Perfil dos Concorrentes", 3)
+    analisar("figura_1")
+    analisar("figura_3")
     
     # 2.2 Análise de Engajamento por Postagem
     texto_secao_2_1 = (f"Nesta seção será realizada uma análise comparativa entre os as publicações dos concorrentes do {nome_cliente}, "
             "a fim de compreender suas respectivas estratégias de conteúdo. Além de serem analisadas métricas como curtidas e comentários "
             "também serão analisados, qualitativamente, seus respectivos conteúdos, bem como o tom de voz, tópicos frequentes "
             "e posicionamento de marca.")
-    document.add_heading("2.2 Análise de Engajamento por Postagem", level=3)
-    document.add_paragraph(texto_secao_2_1)  
-    analises_figura_4 = analisarFigura4(llm, client_name, document, dataframes)
-    analises_figura_5 = analisarFigura5(llm, client_name, document, dataframes)
-    analises_figura_6 = analisarFigura6(llm, client_name, document, dataframes)
-    time.sleep(60) 
+    relatorio.adicionar_titulo("2.2 Análise de Engajamento por Postagem", 3)
+    relatorio.adicionar_paragrafo(texto_secao_2_1)  
+    analisar("figura_4")
+    analisar("figura_5")
+    analisar("figura_6")
+    if lote is None:
+        time.sleep(settings.RELATORIO_PAUSA_SEGUNDOS) # Respiro para o limite de requisições por minuto do LLM
     
     # 2.3 Frequência e Consistência de Publicação
     texto_secao_2_1 = (f"Nesta seção será realizada uma análise temporal das publicações dos concorrentes do {nome_cliente}, "
                     "a fim de compreender suas respectivas estratégias de conteúdo, mais especificamente, quais os melhores horários, "
                     "periodos e dias para publicar no feed.")
-    document.add_heading("2.3 Frequência e Consistência de Publicação", level=3)
-    document.add_paragraph(texto_secao_2_1)
-    analises_figura_7 = analisarFigura7(llm, client_name, document, dataframes)
-    analises_figura_8 = analisarFigura8(llm, client_name, document, dataframes)
-    analises_figura_9 = analisarFigura9(llm, client_name, document, dataframes)
+    relatorio.adicionar_titulo("2.3 Frequência e Consistência de Publicação", 3)
+    relatorio.adicionar_paragrafo(texto_secao_2_1)
+    analisar("figura_7")
+    analisar("figura_8")
+    analisar("figura_9")
+
+    if lote is not None:
+        lote.enviar() # Figuras que ainda não completaram um lote
+        _checkpoint(relatorio, lote)
 
-    
-    analises = '\n'.join([analises_figura_1, analises_figura_3, analises_figura_4, 
-                          analises_figura_5, analises_figura_6, analises_figura_7,
-                          analises_figura_8, analises_figura_9])
-    
     # 3. Recomendações Gerais
-    document.add_heading("3.0 Conclusões\Recomendações Finais", level=2)
-    
-    prompt = f""" 
-            Persona: Você é um analista\estrategista de marketing de mídias sociais sênior, especialista em social metrics. 
-            Contexto: Com base em todas essas analises, gere um conclusão e resuma todas as recomendações dadas a empresa "{client_name}". 
-            Tarefa: Gere um texto detalhado de 1 parágrafo com suas conclusões e recomendações finais. 
-            Formato: Responda apenas o parágrafo da análise.
-            Requisito: Inicie o texto dizendo "Com base em todas as análises realizadas...".
-            
-            Análises: {analises}
-             
-    """ 
-    
-    conclusao = llm.invoke(prompt)
-    document.add_paragraph(conclusao.content.replace('\n',''))
+    if not _reaproveitar_secao(relatorio, retomada, "conclusao"):
+        _gerar_conclusao(llm_conclusao or llm, relatorio, client_name)
+    print(f"Modelo do relatório salvo em {_checkpoint(relatorio)}")
+
+    # Montagem final: salva o documento (.docx, ou .html/.pdf conforme a extensão de output_path)
+    with span("document.save"):
+        salvar(relatorio, output_path)
 
-    # Salva o documento
-    document.save(output_path)  
+    return relatorio  
@@ -175,7 +175,7 @@ def preencher_publicacoes_(llm, pilares, objetivos, publico, posicionamento):
     df_dados_stories = pd.DataFrame([p.dict() for p in todos_os_stories])
 
     # Nome do arquivo Excel que terá todas as abas
-    arquivo_saida = r"reports\publicações.xlsx"
+    arquivo_saida = settings.PUBLICACOES_PATH
 
     # Use o pd.ExcelWriter para criar e gerenciar o arquivo
     with pd.ExcelWriter(arquivo_saida, engine='openpyxl') as writer:
@@ -416,7 +416,7 @@ def preencher_publicacoes(llm, pilares, objetivos, publico, posicionamento):
     df_dados_stories = pd.DataFrame([p.dict() for p in todos_os_stories])
 
     # Nome do arquivo Excel que terá todas as abas
-    arquivo_saida = r"reports\publicações.xlsx"
+    arquivo_saida = settings.PUBLICACOES_PATH
 
     # Use o pd.ExcelWriter para criar e gerenciar o arquivo
     with pd.ExcelWriter(arquivo_saida, engine='openpyxl') as writer:
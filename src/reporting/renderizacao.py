@@ -0,0 +1,73 @@
+# src/reporting/renderizacao.py
+"""
+Perfis de renderização das figuras (matplotlib) embutidas nos relatórios.
+
+As figuras são desenhadas com 12 a 16 polegadas de largura e entram no documento com 6; salvar com dpi=300
+gerava imagens de até 4800 px para ocupar 6 polegadas (800 pontos por polegada no papel). Aqui o dpi do
+savefig é calculado a partir da largura final, para chegar à resolução efetiva do perfil:
+
+    print   300 ppi na página, PNG com paleta de até 256 cores (gráficos de barras têm poucas cores)
+    screen  150 ppi, PNG com paleta
+    draft    96 ppi, JPEG
+
+O perfil padrão vem de settings.RELATORIO_PERFIL_GRAFICOS. O formato "svg" também é aceito, mas o
+python-docx só embute PNG/JPEG: serve para saídas como HTML.
+"""
+import io
+from typing import NamedTuple, Optional
+
+import matplotlib.pyplot as plt
+
+from config import settings
+
+
+class PerfilRenderizacao(NamedTuple):
+    ppi: int # Pontos por polegada na página, já na largura em que a figura é exibida
+    formato: str # "png", "jpeg" ou "svg"
+    cores: int = 0 # PNG: quantiza para uma paleta com este número de cores (0 = RGB completo)
+    qualidade: int = 85 # JPEG
+
+
+PERFIS = {
+    "print": PerfilRenderizacao(ppi=300, formato="png", cores=256),
+    "screen": PerfilRenderizacao(ppi=150, formato="png", cores=256),
+    "draft": PerfilRenderizacao(ppi=96, formato="jpeg", qualidade=75),
+}
+
+
+def dpi_para_largura(fig, largura, ppi: int) -> float:
+    """dpi do savefig para que a figura, exibida com `largura` (docx.shared.Length), tenha `ppi` na página."""
+    return ppi * largura.inches / fig.get_figwidth()
+
+
+def salvar_figura(largura, perfil: Optional[str] = None, fig=None, formato: Optional[str] = None) -> io.BytesIO:
+    """
+    Salva a figura atual (ou `fig`) num buffer pronto para `add_picture(buffer, width=largura)`.
+    `formato` substitui o formato do perfil.
+    """
+    fig = fig or plt.gcf()
+    config = PERFIS[perfil or settings.RELATORIO_PERFIL_GRAFICOS]
+    formato = formato or config.formato
+    dpi = dpi_para_largura(fig, largura, config.ppi)
+    buffer = io.BytesIO()
+
+    if formato == "svg":
+        fig.savefig(buffer, format="svg")
+    elif formato == "jpeg":
+        fig.savefig(buffer, format="jpeg", dpi=dpi, pil_kwargs={"quality": config.qualidade, "optimize": True})
+    elif config.cores:
+        from PIL import Image
+
+        # PNG sem compressão só como intermediário; a paleta reduz o arquivo final em várias vezes
+        bruto = io.BytesIO()
+        fig.savefig(bruto, format="png", dpi=dpi, pil_kwargs={"compress_level": 0})
+        bruto.seek(0)
+        with Image.open(bruto) as imagem:
+            paleta = imagem.convert("RGB").quantize(colors=config.cores, method=Image.Quantize.MEDIANCUT,
+                                                    dither=Image.Dither.NONE)
+        paleta.save(buffer, format="PNG", optimize=True, dpi=(config.ppi, config.ppi))
+    else:
+        fig.savefig(buffer, format="png", dpi=dpi)
+
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,68 @@
+# src/reporting/serializacao_prompt.py
+
+import numpy as np
+import pandas as pd
+from config import settings
+
+
+def _celula(valor, casas_decimais: int, max_caracteres: int) -> str:
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        valor = ", ".join(str(item) for item in valor)
+    elif isinstance(valor, dict):
+        valor = str(valor)
+    elif pd.isna(valor):
+        return ""
+    elif isinstance(valor, float):
+        valor = round(valor, casas_decimais)
+        return str(int(valor)) if valor.is_integer() else f"{valor:.{casas_decimais}f}".rstrip("0")
+    elif isinstance(valor, pd.Timestamp):
+        return valor.strftime("%Y-%m-%d %H:%M")
+    texto = " ".join(str(valor).split()) # Quebras de linha e espaços repetidos viram um espaço
+    if len(texto) > max_caracteres:
+        texto = texto[:max_caracteres].rstrip() + "..."
+    return texto
+
+
+def serializar_tabela(dados, max_linhas: int = None, max_colunas: int = None, formato: str = None,
+                      casas_decimais: int = 2, max_caracteres_celula: int = None) -> str:
+    """
+    Serializa um DataFrame/Series para um prompt, em CSV ou markdown compacto.
+
+    Ao contrário do `repr` do pandas (alinhado com espaços e com "..." no meio quando a tabela é grande),
+    todas as linhas até `max_linhas` aparecem, sempre as primeiras (as tabelas chegam ordenadas);
+    as omitidas são informadas no fim. Índices nomeados viram colunas, colunas vazias são removidas,
+    números são arredondados (12.0 -> 12) e textos longos são cortados.
+    """
+    max_linhas = max_linhas or settings.PROMPT_MAX_LINHAS
+    max_colunas = max_colunas or settings.PROMPT_MAX_COLUNAS
+    formato = formato or settings.PROMPT_FORMATO_TABELA
+    max_caracteres_celula = max_caracteres_celula or settings.PROMPT_MAX_CARACTERES_CELULA
+
+    df = dados.to_frame() if isinstance(dados, pd.Series) else dados
+    # Índice com nome ou não numérico (ex.: usernames, períodos do dia) é informação; posições 0..N não
+    if any(nome is not None for nome in df.index.names) or not pd.api.types.is_integer_dtype(df.index):
+        df = df.reset_index()
+    df = df.dropna(axis=1, how="all")
+    total_linhas, total_colunas = df.shape
+    df = df.iloc[:max_linhas, :max_colunas]
+
+    cabecalho = [_celula(coluna, casas_decimais, max_caracteres_celula) for coluna in df.columns]
+    linhas = [[_celula(valor, casas_decimais, max_caracteres_celula) for valor in linha]
+              for linha in df.itertuples(index=False, name=None)]
+
+    if formato == "markdown":
+        saida = ["| " + " | ".join(cabecalho) + " |", "|" + "---|" * len(cabecalho)]
+        saida += ["| " + " | ".join(celula.replace("|", "/") for celula in linha) + " |" for linha in linhas]
+    else:
+        def csv(celulas):
+            return ",".join(f'"{c.replace(chr(34), chr(39))}"' if ("," in c or '"' in c) else c for c in celulas)
+        saida = [csv(cabecalho)] + [csv(linha) for linha in linhas]
+
+    omitidas = []
+    if total_linhas > max_linhas:
+        omitidas.append(f"{total_linhas - max_linhas} de {total_linhas} linhas")
+    if total_colunas > max_colunas:
+        omitidas.append(f"{total_colunas - max_colunas} de {total_colunas} colunas")
+    if omitidas:
+        saida.append(f"({' e '.join(omitidas)} omitidas)")
+    return "\n".join(saida)
@@ -0,0 +1,46 @@
+# src/utils/persistencia.py
+"""
+Gravação atômica dos arquivos de estado (arquivo temporário + os.replace) e o vocabulário incremental dos
+índices de src/analysis. numpy e pandas são importados sob demanda: quem só grava JSON não os carrega.
+"""
+import json
+import os
+from typing import Dict, List
+
+
+def gravar_json_atomico(caminho: str, dados) -> None:
+    """Grava um JSON em um arquivo temporário e o move por cima do destino (os.replace é atômico)."""
+    caminho_tmp = f"{caminho}.tmp"
+    with open(caminho_tmp, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(caminho_tmp, caminho)
+
+
+def gravar_npz_atomico(caminho: str, **arrays) -> None:
+    """Grava um .npz comprimido em um arquivo temporário e o move por cima do destino (os.replace é atômico)."""
+    import numpy as np
+
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    caminho_tmp = f"{caminho}.tmp"
+    with open(caminho_tmp, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(caminho_tmp, caminho)
+
+
+def codificar(valores, posicao: Dict[str, int], lista: List[str]):
+    """
+    Códigos inteiros (array int64) de `valores`, acrescentando a `lista`/`posicao` os ainda desconhecidos:
+    o vocabulário incremental dos índices persistidos com `gravar_npz_atomico`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    for valor in pd.unique(valores): # Laço só sobre os valores distintos ainda desconhecidos
+        if valor not in posicao:
+            posicao[valor] = len(lista)
+            lista.append(valor)
+    return pd.Series(valores, dtype=object).map(posicao).to_numpy(dtype=np.int64)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def gerar_posts():
+    """Fábrica de publicações sintéticas no formato do Apify; cada teste acrescenta só as colunas que usa."""
+    def gerar(n=600, perfis=6, dias=150, semente=0):
+        rng = np.random.default_rng(semente)
+        inicio = pd.Timestamp("2025-01-01", tz="UTC")
+        return pd.DataFrame({
+            "id": [f"p{i}" for i in range(n)],
+            "shortCode": [f"c{i}" for i in range(n)],
+            "ownerUsername": [f"perfil_{k}" for k in rng.integers(0, perfis, n)],
+            "timestamp": (inicio + pd.to_timedelta(rng.integers(0, dias * 24 * 60, n), unit="min")).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "type": rng.choice(["Image", "Video", "Sidecar"], n),
+            "likesCount": rng.integers(0, 500, n),
+            "commentsCount": rng.integers(0, 50, n),
+        })
+    return gerar
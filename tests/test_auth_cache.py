@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from auth.auth_cache import UsuarioAutenticado, cache_usuarios
+from database import criar_engine
+from models import Base, Usuario
+
+
+@pytest.fixture
+def sessao():
+    engine = criar_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    fabrica = sessionmaker(bind=engine, autoflush=False)
+    with fabrica() as db:
+        usuario = Usuario("Ana", "ana@exemplo.com", "hash")
+        db.add(usuario)
+        db.commit()
+        cache_usuarios.limpar()
+        cache_usuarios.guardar(usuario.email, UsuarioAutenticado.from_usuario(usuario))
+        yield db, usuario
+    cache_usuarios.limpar()
+
+
+def test_invalida_so_depois_do_commit(sessao):
+    db, usuario = sessao
+    usuario.ativo = False
+    db.flush()
+    # Entre o flush e o commit outras conexões ainda leem a linha antiga: a entrada fica
+    assert cache_usuarios.obter("ana@exemplo.com") is not None
+    db.commit()
+    assert cache_usuarios.obter("ana@exemplo.com") is None
+
+
+def test_troca_de_email_invalida_o_antigo(sessao):
+    db, usuario = sessao
+    usuario.email = "ana.nova@exemplo.com"
+    db.commit()
+    assert cache_usuarios.obter("ana@exemplo.com") is None
+
+
+def test_rollback_nao_invalida(sessao):
+    db, usuario = sessao
+    usuario.admin = True
+    db.flush()
+    db.rollback()
+    assert cache_usuarios.obter("ana@exemplo.com") is not None
+    assert not db.info.get("auth_cache_emails_alterados")
+
+
+def test_alteracao_em_massa_limpa_apos_commit(sessao):
+    db, _ = sessao
+    db.query(Usuario).update({Usuario.ativo: False})
+    assert cache_usuarios.obter("ana@exemplo.com") is not None
+    db.commit()
+    assert cache_usuarios.obter("ana@exemplo.com") is None
@@ -0,0 +1,66 @@
+import pytest
+
+from src.analysis import engine
+from src.chatbot.briefing_extractor import ExtratorIncrementalBriefing
+
+
+class _Modelo:
+    def __init__(self, **dados):
+        self.dados = dados
+
+    def dict(self):
+        return self.dados
+
+
+@pytest.fixture
+def parsers(monkeypatch):
+    """Substitui as chamadas ao LLM do engine; `falhas[nome]` = quantas chamadas iniciais levantam erro."""
+    falhas, chamadas = {}, {}
+
+    def parser(nome, resultado):
+        def chamar(*args, **kwargs):
+            chamadas[nome] = chamadas.get(nome, 0) + 1
+            if chamadas[nome] <= falhas.get(nome, 0):
+                raise RuntimeError(f"erro transitório em {nome}")
+            return resultado
+        return chamar
+
+    monkeypatch.setattr(engine, "parse_info_empresa", parser("infoempresa", _Modelo(nome="Acme")))
+    monkeypatch.setattr(engine, "parse_publicos", parser("publico", _Modelo(faixa="25-34")))
+    monkeypatch.setattr(engine, "parse_objetivos", parser("objetivos", _Modelo(objetivo_principal="vendas")))
+    monkeypatch.setattr(engine, "parse_posicionamento", parser("posicionamento", _Modelo(tom="leve")))
+    monkeypatch.setattr(engine, "parse_pilares", parser("pilares", _Modelo(pilares=["dicas"])))
+    monkeypatch.setattr(engine, "parse_calendario_editorial", parser("calendario", _Modelo(calendario=["seg"])))
+    return falhas, chamadas
+
+
+def _montar_texto(indice):
+    return f"respostas até a pergunta {indice}"
+
+
+@pytest.mark.parametrize("etapa", ["infoempresa", "publico", "objetivos"])
+def test_compilar_tenta_de_novo_apos_falha_transitoria(parsers, etapa):
+    falhas, chamadas = parsers
+    falhas[etapa] = 1
+    extrator = ExtratorIncrementalBriefing(llm=None)
+
+    compilado = extrator.compilar(_montar_texto)
+
+    assert chamadas[etapa] == 2
+    assert compilado["infoempresa"] == {"nome": "Acme"}
+    assert compilado["posicionamento"] == {"tom": "leve"}
+    assert compilado["calendario"] == ["seg"]
+
+
+def test_compilar_tenta_de_novo_falha_do_agendamento_antecipado(parsers):
+    falhas, chamadas = parsers
+    falhas["objetivos"] = 1
+    extrator = ExtratorIncrementalBriefing(llm=None)
+
+    extrator.agendar(_montar_texto, respondidas=23) # Posicionamento e pilares dependem dos objetivos que falham
+    compilado = extrator.compilar(_montar_texto)
+
+    assert compilado["objetivos"] == {"objetivo_principal": "vendas"}
+    assert compilado["posicionamento"] == {"tom": "leve"}
+    assert compilado["pilares"] == ["dicas"]
+    assert compilado["calendario"] == ["seg"]
@@ -0,0 +1,52 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from config import settings
+from src.chatbot.briefing_chat import ChatbotHandler
+
+
+@pytest.fixture
+def sessao(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROCESSED_DATA_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "CHAT_HISTORY_PATH", str(tmp_path))
+    return lambda: ChatbotHandler(llm=FakeListChatModel(responses=["ok"]), session_id="teste")
+
+
+def _conversar(handler, turnos):
+    for i in turnos:
+        handler.chat_history += [HumanMessage(content=f"resposta {i}"), AIMessage(content=f"pergunta {i + 1}")]
+        handler._save_chat_history()
+        handler.briefing_state.current_question_index = i + 1
+        handler._save_briefing_state()
+
+
+def test_replay_recupera_turnos_apos_queda(sessao):
+    handler = sessao()
+    _conversar(handler, range(3))
+    handler.journal.fechar() # Queda: os snapshots nunca foram gravados
+
+    recuperado = sessao()
+    assert [m.content for m in recuperado.chat_history] == [m.content for m in handler.chat_history]
+    assert recuperado.briefing_state.current_question_index == 3
+
+
+def test_queda_entre_snapshot_e_truncar_nao_duplica(sessao, monkeypatch):
+    handler = sessao()
+    _conversar(handler, range(3))
+
+    def queda():
+        raise RuntimeError("queda")
+
+    monkeypatch.setattr(handler.journal, "truncar", queda)
+    with pytest.raises(RuntimeError):
+        handler.compactar() # Snapshots gravados, diário intacto
+
+    recuperado = sessao()
+    assert [m.content for m in recuperado.chat_history] == [m.content for m in handler.chat_history]
+    assert recuperado.briefing_state.current_question_index == 3
+
+    # Os registros seguintes continuam a sequência e são reaplicados normalmente
+    _conversar(recuperado, [3])
+    recuperado.journal.fechar()
+    assert len(sessao().chat_history) == 8
@@ -0,0 +1,74 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.hashtags import IndiceHashtags, normalizar
+
+
+VOCABULARIO = ["Café", "cafe", "brunch", "doces", "padaria", "receita", "vegano", "promo"]
+
+
+def _posts(gerar_posts, n=300, semente=0):
+    """As publicações sintéticas de `conftest.py` com 0 a 3 hashtags cada, em grafias variadas."""
+    rng = np.random.default_rng(semente)
+    posts = gerar_posts(n, dias=60, semente=semente)
+    return posts.assign(hashtags=[list(rng.choice(VOCABULARIO, rng.integers(0, 4))) for _ in range(n)])
+
+
+def _coocorrencias_do_zero(posts):
+    contagem, engajamento = Counter(), Counter()
+    for tags, likes, comentarios in zip(posts["hashtags"], posts["likesCount"], posts["commentsCount"]):
+        distintas = sorted(set(normalizar(pd.Series(tags, dtype=object))) - {""}) if tags else []
+        for a, b in [(t, t) for t in distintas] + list(combinations(distintas, 2)):
+            contagem[a, b] += 1
+            engajamento[a, b] += likes + comentarios
+    return contagem, engajamento
+
+
+def _coocorrencias_do_indice(indice):
+    matriz, soma = indice.coocorrencias.tocoo(), indice.engajamento.tocsr()
+    contagem, engajamento = Counter(), Counter()
+    for i, j, valor in zip(matriz.row, matriz.col, matriz.data):
+        a, b = indice.hashtags[i], indice.hashtags[j]
+        if valor and a <= b:
+            contagem[a, b] = int(valor)
+            engajamento[a, b] = soma[i, j]
+    return contagem, engajamento
+
+
+def test_incremental_igual_ao_calculo_do_zero(gerar_posts):
+    posts = _posts(gerar_posts)
+    indice = IndiceHashtags(periodo="W")
+    assert indice.adicionar(posts.iloc[:120]) == 120
+    assert indice.adicionar(posts.iloc[80:]) == 180 # As já indexadas são ignoradas
+
+    contagem, engajamento = _coocorrencias_do_indice(indice)
+    esperado_contagem, esperado_engajamento = _coocorrencias_do_zero(posts)
+    assert contagem == esperado_contagem
+    assert engajamento == esperado_engajamento
+
+
+def test_frequencia_por_periodo_igual_ao_calculo_do_zero(gerar_posts):
+    posts = _posts(gerar_posts)
+    indice = IndiceHashtags(periodo="W")
+    indice.adicionar(posts.iloc[:150])
+    indice.adicionar(posts.iloc[150:])
+
+    explodida = posts.explode("hashtags").dropna(subset=["hashtags"])
+    explodida = explodida.assign(tag=normalizar(explodida["hashtags"]).to_numpy()).drop_duplicates(["id", "tag"])
+    semana = pd.to_datetime(explodida["timestamp"], utc=True).dt.tz_convert(None).dt.to_period("W").dt.start_time
+    esperado = explodida.groupby([semana.dt.strftime("%Y-%m-%d"), "tag"]).size().unstack(fill_value=0)
+
+    frequencia = indice.frequencia_por_periodo(["cafe", "brunch"])
+    for tag in ["cafe", "brunch"]:
+        np.testing.assert_array_equal(frequencia[tag].to_numpy(), esperado[tag].reindex(frequencia.index, fill_value=0).to_numpy())
+
+
+def test_salvar_e_carregar(gerar_posts, tmp_path):
+    indice = IndiceHashtags(periodo="W")
+    indice.adicionar(_posts(gerar_posts))
+    carregado = IndiceHashtags.carregar(indice.salvar(tmp_path / "indice.npz"))
+    pd.testing.assert_frame_equal(carregado.pares(5, min_posts=1), indice.pares(5, min_posts=1))
+    assert carregado.adicionar(_posts(gerar_posts).iloc[:10]) == 0
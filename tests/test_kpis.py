@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.kpis import MotorKPIs
+
+
+def _janela_pandas(posts, dias, ate):
+    """Os mesmos KPIs calculados do zero sobre as publicações (a última versão de cada id)."""
+    posts = posts.drop_duplicates("id", keep="last")
+    dia = pd.to_datetime(posts["timestamp"], utc=True).dt.tz_convert(None).dt.normalize()
+    na_janela = (dia > ate - pd.Timedelta(days=dias)) & (dia <= ate)
+    engajamento = (posts["likesCount"] + posts["commentsCount"]).astype(float)[na_janela]
+    grupos = engajamento.groupby(posts["ownerUsername"][na_janela])
+    return pd.DataFrame({"posts": grupos.size(), "media": grupos.mean(), "desvio": grupos.std(ddof=0)})
+
+
+@pytest.fixture
+def incremental(gerar_posts):
+    """Duas extrações: a segunda traz publicações novas e repete 80 antigas com mais curtidas."""
+    posts = gerar_posts().sample(frac=1, random_state=1).reset_index(drop=True)
+    primeira, segunda = posts.iloc[:300], posts.iloc[300:]
+    repetidas = primeira.iloc[:80].assign(likesCount=primeira["likesCount"].iloc[:80] + 40)
+    segunda = pd.concat([segunda, repetidas], ignore_index=True)
+
+    motor = MotorKPIs(horizonte_dias=120)
+    assert motor.adicionar(primeira) == 300
+    assert motor.adicionar(segunda) == 300 # As repetidas só atualizam o engajamento
+    return motor, pd.concat([primeira, segunda], ignore_index=True)
+
+
+@pytest.mark.parametrize("dias", [7, 30, 90])
+@pytest.mark.parametrize("recuo", [0, 25])
+def test_janelas_iguais_ao_calculo_do_zero(incremental, dias, recuo):
+    motor, todas = incremental
+    ultimo = pd.to_datetime(todas["timestamp"], utc=True).max().tz_convert(None).normalize()
+    ate = ultimo - pd.Timedelta(days=recuo)
+
+    kpis = motor.kpis([dias], ate)
+    kpis = kpis[kpis[f"posts_{dias}d"] > 0]
+    esperado = _janela_pandas(todas, dias, ate).loc[kpis.index]
+
+    assert sorted(kpis.index) == sorted(_janela_pandas(todas, dias, ate).index)
+    np.testing.assert_array_equal(kpis[f"posts_{dias}d"], esperado["posts"])
+    np.testing.assert_allclose(kpis[f"engajamento_medio_{dias}d"], esperado["media"])
+    np.testing.assert_allclose(kpis[f"desvio_engajamento_{dias}d"], esperado["desvio"], atol=1e-6)
+    np.testing.assert_allclose(kpis[f"posts_por_semana_{dias}d"], esperado["posts"] / dias * 7)
+
+
+def test_por_tipo_igual_ao_calculo_do_zero(incremental):
+    motor, todas = incremental
+    todas = todas.drop_duplicates("id", keep="last")
+    engajamento = (todas["likesCount"] + todas["commentsCount"]).astype(float)
+    esperado = engajamento.groupby([todas["ownerUsername"], todas["type"]]).agg(["size", "mean"])
+
+    por_tipo = motor.kpis_por_tipo().set_index(["username", "type"]).loc[esperado.index]
+    np.testing.assert_array_equal(por_tipo["posts"], esperado["size"])
+    np.testing.assert_allclose(por_tipo["engajamento_medio"], esperado["mean"])
+
+
+def test_incremental_igual_a_uma_carga_unica(incremental):
+    motor, todas = incremental
+    de_uma_vez = MotorKPIs(horizonte_dias=120)
+    de_uma_vez.adicionar(todas)
+    pd.testing.assert_frame_equal(motor.kpis().sort_index(), de_uma_vez.kpis().sort_index())
+
+
+def test_taxa_de_engajamento_usa_seguidores(incremental):
+    motor, _ = incremental
+    motor.atualizar_seguidores(pd.DataFrame({"username": ["perfil_0"], "followersCount": [2000]}))
+    kpis = motor.kpis_do_perfil("perfil_0", 30)
+    assert kpis["taxa_engajamento"] == pytest.approx(kpis["engajamento_medio"] / 2000 * 100)
+    assert np.isnan(motor.kpis_do_perfil("perfil_1", 30)["taxa_engajamento"])
+
+
+def test_ate_depois_da_ultima_publicacao_termina_no_ultimo_dia(incremental):
+    motor, _ = incremental
+    pd.testing.assert_frame_equal(motor.kpis(ate="2030-01-01"), motor.kpis())
+
+
+def test_janela_antes_do_horizonte(incremental):
+    motor, _ = incremental
+    with pytest.raises(ValueError):
+        motor.kpis([90], ate="2025-03-01")
+
+
+def test_salvar_e_carregar(incremental, tmp_path):
+    motor, _ = incremental
+    caminho = motor.salvar(tmp_path / "kpis.npz")
+    carregado = MotorKPIs.carregar(caminho)
+    pd.testing.assert_frame_equal(carregado.kpis(), motor.kpis())
+    pd.testing.assert_frame_equal(carregado.kpis_por_tipo(), motor.kpis_por_tipo())
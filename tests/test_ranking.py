@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.ranking import IndicePerfis, ranking
+
+
+def _posts(gerar_posts, n=500, semente=0):
+    """As publicações sintéticas de `conftest.py` com ~10% das curtidas ausentes (NaN)."""
+    posts = gerar_posts(n, perfis=8, semente=semente)
+    likes = posts["likesCount"].astype(float)
+    likes[np.random.default_rng(semente).random(n) < 0.1] = np.nan
+    return posts.assign(likesCount=likes)
+
+
+def test_top_igual_ao_groupby(gerar_posts):
+    posts = _posts(gerar_posts)
+    top = ranking(posts, "ownerUsername", ["likesCount", "commentsCount"]).top("likesCount", 5)
+    esperado = posts.groupby("ownerUsername")["likesCount"].sum().sort_values().dropna().tail(5).reset_index()
+    pd.testing.assert_frame_equal(top, esperado, check_dtype=False)
+
+
+def test_top_reflete_alteracao_no_lugar(gerar_posts):
+    posts = _posts(gerar_posts)
+    ranking(posts, "shortCode", ["likesCount"]).top("likesCount", 3)
+    posts["likesCount"] = posts["likesCount"].fillna(1000) # Mesmo objeto e mesmo formato
+    top = ranking(posts, "shortCode", ["likesCount"]).top("likesCount", 3)
+    assert (top["likesCount"] == 1000).all()
+
+
+def test_top_do_indice_de_perfis_igual_a_nlargest(gerar_posts):
+    posts = _posts(gerar_posts)
+    indice = IndicePerfis(posts)
+    for perfil in ["perfil_0", "perfil_3", "inexistente"]:
+        top = indice.top(perfil, "likesCount", 10)
+        esperado = posts[posts["ownerUsername"] == perfil].nlargest(10, "likesCount")
+        pd.testing.assert_frame_equal(top, esperado)